@@ -4,10 +4,21 @@ app.py
 Entry point for the Wind-Powered Desalination Dashboard.
 
 Responsibilities:
-  1. Load data.xlsx at module level (fail fast — never inside a callback).
+  1. Load data.xlsx at module level (fail fast — never inside a callback) and
+     publish it to the data registry (src/data/registry.py).  With
+     ASYNC_STARTUP=1 the parse runs in a background thread instead, and the
+     server serves a loading page and a /ready probe until it finishes.
   2. Create the Dash application with the FLATLY Bootstrap theme.
-  3. Conditionally set the layout: shell on success, error page on failure.
-  4. Auto-open a browser tab when run directly (python app.py).
+  3. Serve the layout per page load: shell while the registry holds data,
+     loading page while it is parsing, error page otherwise.  A watcher
+     thread hot-reloads data.xlsx.
+  4. Serve callback and data load metrics at /metrics and /metrics.json
+     (METRICS=1, off by default), and profile flagged callback requests on
+     demand (PROFILING + PROFILE_TOKEN, src/profiling.py).
+  5. Auto-open a browser tab when run directly (python app.py).
+
+Under gunicorn this module is imported once in the master (preload_app, see
+gunicorn.conf.py) and the workers are forked from it.
 
 Usage
 -----
@@ -19,10 +30,27 @@ import traceback
 
 import dash
 import dash_bootstrap_components as dbc
-
+import flask
+
+from src.config import (
+    ASYNC_STARTUP,
+    DATA_RELOAD_INTERVAL,
+    METRICS,
+    PROFILE_DIR,
+    PROFILE_KEEP,
+    PROFILE_TOKEN,
+    PROFILING,
+)
 from src.data.loader import load_data
+from src.data.registry import registry
 from src.layout.shell import create_layout
+# Imported before the first publish so its registry listener compiles the
+# CostModel and scenario grid at startup (in the master when preloading).
+import src.layout.charts  # noqa: F401
 from src.layout.error_page import create_error_page
+from src.layout.loading_page import create_loading_page
+from src.metrics import instrument_dash
+from src.profiling import ProfileStore, install_profiling
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 1. Load data at module level
@@ -32,17 +60,25 @@ DATA = None
 _error_msg = ""
 _detail_str = ""
 
-try:
-    DATA = load_data()
-    print("[OK] data.xlsx loaded — all sections parsed successfully")
-except FileNotFoundError as exc:
-    _error_msg = str(exc)
-    _detail_str = traceback.format_exc()
-    print(f"[ERROR] {exc}", file=sys.stderr)
-except ValueError as exc:
-    _error_msg = str(exc)
-    _detail_str = traceback.format_exc()
-    print(f"[ERROR] {exc}", file=sys.stderr)
+# Stat before parsing so an edit made during the parse is still detected.
+_startup_stamp = registry.stamp()
+
+if ASYNC_STARTUP:
+    # Parse in a background thread; the server answers with the loading page
+    # and /ready reports 503 until the registry holds data.
+    registry.load_async()
+else:
+    try:
+        DATA = load_data()
+        print("[OK] data.xlsx loaded — all sections parsed successfully")
+    except FileNotFoundError as exc:
+        _error_msg = str(exc)
+        _detail_str = traceback.format_exc()
+        print(f"[ERROR] {exc}", file=sys.stderr)
+    except ValueError as exc:
+        _error_msg = str(exc)
+        _detail_str = traceback.format_exc()
+        print(f"[ERROR] {exc}", file=sys.stderr)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 2. Create Dash app
@@ -62,22 +98,57 @@ server = app.server
 app.config.suppress_callback_exceptions = True
 
 # ──────────────────────────────────────────────────────────────────────────────
-# 3. Set layout conditionally
+# 3. Publish data, serve layout per page load, watch for workbook changes
 # ──────────────────────────────────────────────────────────────────────────────
 
 if DATA is not None:
-    app.layout = create_layout(DATA)
-    from src.layout.shell import set_data
-    set_data(DATA)
-    from src.layout.charts import set_data as set_charts_data
-    set_charts_data(DATA)
-    from src.layout.scorecard import set_data as set_scorecard_data
-    set_scorecard_data(DATA)
-else:
-    app.layout = create_error_page(error=_error_msg, details=_detail_str)
+    registry.publish(DATA, _startup_stamp)
+
+
+def serve_layout():
+    """Build the page for each visit from the current registry snapshot.
+
+    Evaluated per page load, so a workbook hot-reloaded by the registry
+    watcher (or fixed after a failed startup) is served without a restart.
+    """
+    snapshot = registry.current()
+    if snapshot is not None:
+        return create_layout(snapshot.data)
+    if registry.status() == "loading":
+        return create_loading_page()
+    error, details = registry.last_error or (_error_msg, _detail_str)
+    return create_error_page(error=error, details=details)
+
+
+app.layout = serve_layout
+
+
+@server.route("/ready")
+def ready():
+    """Readiness probe: 200 once data is loaded, 503 while loading or failed."""
+    status = registry.status()
+    body = {"status": status, "version": registry.version}
+    return flask.jsonify(body), 200 if status == "ready" else 503
+
+
+# Re-parse data.xlsx in the background when it changes (0 disables).
+registry.start_watching(DATA_RELOAD_INTERVAL)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 4. Metrics and on-demand profiling
+# ──────────────────────────────────────────────────────────────────────────────
+
+if METRICS:
+    instrument_dash(app)
+
+if PROFILING:
+    if PROFILE_TOKEN:
+        install_profiling(app, PROFILE_TOKEN, ProfileStore(PROFILE_DIR, PROFILE_KEEP))
+    else:
+        print("[WARN] PROFILING=1 needs PROFILE_TOKEN — profiling disabled", file=sys.stderr)
 
 # ──────────────────────────────────────────────────────────────────────────────
-# 4. Main block — run server with auto-open browser
+# 5. Main block — run server with auto-open browser
 # ──────────────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
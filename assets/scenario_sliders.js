@@ -0,0 +1,122 @@
+/*
+ * assets/scenario_sliders.js
+ * ==========================
+ * Clientside chart rebuilds for the CLIENTSIDE_SLIDERS mode.
+ *
+ * The server ships the scenario tables from build_scenario_tables()
+ * (src/data/processing.py) once in store-scenario-tables, and the figure
+ * skeletons from build_cost_chart() / build_energy_bar_chart() with the
+ * chart section.  These functions fill in the slider-dependent arrays the
+ * same way patch_cost_chart() / patch_energy_bar_chart() do on the server,
+ * so slider moves never leave the browser.
+ *
+ * Dash loads every file in assets/ automatically; the functions are
+ * referenced from src/layout/charts.py via ClientsideFunction("scenario", ...).
+ */
+
+(function() {
+    "use strict";
+
+    // numpy.interp: linear, clamped to the end values outside the table.
+    function interp(x, xs, ys) {
+        var n = xs.length;
+        if (x <= xs[0]) return ys[0];
+        if (x >= xs[n - 1]) return ys[n - 1];
+        var j = 0;
+        while (xs[j + 1] <= x) j++;
+        var slope = (ys[j + 1] - ys[j]) / (xs[j + 1] - xs[j]);
+        return slope * (x - xs[j]) + ys[j];
+    }
+
+    // interpolate_energy(): clamp below, extrapolate above with the last slope.
+    function interpExtrapolateUpper(x, curve) {
+        var xs = curve.x, ys = curve.y, n = xs.length;
+        if (x > xs[n - 1] && n >= 2) {
+            var slope = (ys[n - 1] - ys[n - 2]) / (xs[n - 1] - xs[n - 2]);
+            return ys[n - 1] + slope * (x - xs[n - 1]);
+        }
+        return interp(x, xs, ys);
+    }
+
+    // Python's round(): ties go to the even neighbour.
+    function roundHalfEven(x) {
+        var r = Math.round(x);
+        if (Math.abs(x % 1) === 0.5) r = 2 * Math.round(x / 2);
+        return r;
+    }
+
+    // battery_ratio_label()
+    function batteryRatioLabel(fraction) {
+        var pctBatt = roundHalfEven(fraction * 100);
+        return pctBatt + "% Battery / " + (100 - pctBatt) + "% Tank";
+    }
+
+    // Run-length encoded [[step, text], ...] lookup.
+    function runLengthLookup(entries, step) {
+        var text = entries[0][1];
+        for (var i = 1; i < entries.length && entries[i][0] <= step; i++) {
+            text = entries[i][1];
+        }
+        return text;
+    }
+
+    function copyFigure(figure) {
+        return JSON.parse(JSON.stringify(figure));
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        scenario: {
+            // -> [cost figure, years label, ratio label, electrical total label]
+            costChart: function(years, fraction, tables, figure) {
+                if (!tables || !figure) throw window.dash_clientside.PreventUpdate;
+                years = Math.min(Math.round(years), tables.horizon);
+
+                var x = [];
+                for (var t = 0; t <= years; t++) x.push(t);
+                var battery = interp(fraction, tables.battery_lookup.x, tables.battery_lookup.y);
+                var electrical = x.map(function(t) {
+                    return tables.cumulative.electrical[t] + battery * tables.battery_counts[t];
+                });
+                var series = [
+                    tables.cumulative.mechanical.slice(0, years + 1),
+                    electrical,
+                    tables.cumulative.hybrid.slice(0, years + 1),
+                ];
+
+                var fig = copyFigure(figure);
+                fig.data.forEach(function(trace, i) {
+                    trace.x = x;
+                    trace.y = series[i];
+                });
+                fig.layout.uirevision = "cost-" + years;
+
+                var step = roundHalfEven(fraction / tables.battery_step);
+                return [
+                    fig,
+                    years + " year" + (years !== 1 ? "s" : ""),
+                    batteryRatioLabel(fraction),
+                    "Electrical total: " + runLengthLookup(tables.elec_cost_labels, step),
+                ];
+            },
+
+            // -> [power figure, TDS label, depth label]
+            powerChart: function(tdsPpm, depthM, tables, figure) {
+                if (!tables || !figure) throw window.dash_clientside.PreventUpdate;
+                var offsets = {
+                    "RO Desalination": interpExtrapolateUpper(tdsPpm, tables.tds_lookup),
+                    "Groundwater Extraction": interpExtrapolateUpper(depthM, tables.depth_lookup),
+                };
+
+                var fig = copyFigure(figure);
+                fig.data.forEach(function(trace) {
+                    var kw = (tables.subsystem_power[trace.name] || 0) + (offsets[trace.name] || 0);
+                    var values = trace.meta.systems.map(function() { return kw; });
+                    trace.y = values;
+                    trace.meta.values = values;
+                });
+
+                return [fig, roundHalfEven(tdsPpm) + " PPM", roundHalfEven(depthM) + " m"];
+            },
+        },
+    });
+})();
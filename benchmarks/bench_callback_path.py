@@ -0,0 +1,76 @@
+"""
+benchmarks/bench_callback_path.py
+=================================
+Time the server-side work behind the dashboard callbacks on the real
+data.xlsx, with every cache bypassed:
+
+  render system view   create_system_view_layout() for each system
+                       (page-content callback: scorecard, equipment grid)
+  compile CostModel    CostModel(data) (runs on every data publish)
+  live chart data      compute_chart_data() at random off-grid slider values
+                       (slider callbacks on a cache and grid miss)
+  scorecard metrics    compute_scorecard_metrics() for the three systems
+
+Run it on two checkouts to compare before / after a change.
+
+Usage
+-----
+  python benchmarks/bench_callback_path.py [--runs N]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data.loader import load_data  # noqa: E402
+from src.data.processing import CostModel, compute_chart_data, compute_scorecard_metrics  # noqa: E402
+from src.layout.system_view import create_system_view_layout  # noqa: E402
+
+
+def _median_ms(fn, runs: int) -> float:
+    times = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = load_data()
+    model = CostModel(data)
+    rng = np.random.default_rng(0)
+    sliders = list(zip(rng.integers(1, 51, args.runs).tolist(), rng.random(args.runs).tolist(),
+                       (rng.random(args.runs) * 10_000).tolist(), (rng.random(args.runs) * 1_900).tolist()))
+    systems = ("mechanical", "electrical", "hybrid")
+
+    cases = {
+        "render system view": lambda i: create_system_view_layout(systems[i % 3], data),
+        "compile CostModel": lambda i: CostModel(data),
+        "live chart data": lambda i: compute_chart_data(
+            data, sliders[i][1], sliders[i][0], sliders[i][2], sliders[i][3], cost_model=model,
+        ),
+        "scorecard metrics": lambda i: compute_scorecard_metrics(
+            data["mechanical"], data["electrical"], data["hybrid"],
+        ),
+    }
+    for label, fn in cases.items():
+        print(f"{label:<20} {_median_ms(fn, args.runs):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
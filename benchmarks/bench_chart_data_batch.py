@@ -0,0 +1,63 @@
+"""
+benchmarks/bench_chart_data_batch.py
+====================================
+Compare a Python loop of compute_chart_data() calls with one
+compute_chart_data_batch() call over the same random scenario sweep.
+
+The loop is timed on a sample and extrapolated to the full sweep so the
+script finishes quickly even for 100k scenarios.
+
+Usage
+-----
+  python benchmarks/bench_chart_data_batch.py [--scenarios N] [--sample N]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data.loader import load_data  # noqa: E402
+from src.data.processing import CostModel, compute_chart_data, compute_chart_data_batch  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = load_data()
+    model = CostModel(data)
+
+    rng = np.random.default_rng(0)
+    years = rng.integers(1, 51, args.scenarios)
+    battery = rng.integers(0, 1001, args.scenarios) / 1000
+    tds = rng.integers(0, 101, args.scenarios) * 100.0
+    depth = rng.integers(0, 1901, args.scenarios).astype(float)
+
+    sample = min(args.sample, args.scenarios)
+    t0 = time.perf_counter()
+    for i in range(sample):
+        compute_chart_data(data, battery[i], int(years[i]), tds_ppm=tds[i], depth_m=depth[i], cost_model=model)
+    loop = (time.perf_counter() - t0) / sample * args.scenarios
+
+    t0 = time.perf_counter()
+    compute_chart_data_batch(data, years, battery, tds, depth, cost_model=model)
+    batch = time.perf_counter() - t0
+
+    print(f"{args.scenarios} scenarios")
+    print(f"  compute_chart_data loop  {loop:8.2f} s (extrapolated from {sample})")
+    print(f"  compute_chart_data_batch {batch:8.2f} s  speedup {loop / batch:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
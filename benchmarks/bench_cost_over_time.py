@@ -0,0 +1,94 @@
+"""
+benchmarks/bench_cost_over_time.py
+==================================
+Compare the original row-by-row cost-over-time loop with the vectorized
+replacement-event engine in compute_cost_over_time().
+
+Synthetic BOMs of increasing size are generated so the scaling is visible
+beyond the handful of rows in data.xlsx.
+
+Usage
+-----
+  python benchmarks/bench_cost_over_time.py [--years N] [--sizes 10 1000 100000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.config import LIFESPAN_DEFAULTS  # noqa: E402
+from src.data.processing import compute_cost_over_time  # noqa: E402
+
+
+def _reference(df: pd.DataFrame, years: int) -> np.ndarray:
+    """Original iterrows() implementation, kept here for timing only."""
+    annual = np.zeros(years + 1)
+    for _, row in df.iterrows():
+        cost = pd.to_numeric(row["cost_usd"], errors="coerce")
+        if pd.isna(cost):
+            continue
+        lifespan = row["lifespan_years"]
+        if lifespan is None:
+            lifespan = LIFESPAN_DEFAULTS.get(row["name"], "indefinite")
+        if isinstance(lifespan, str) and lifespan.strip().lower() == "indefinite":
+            annual[0] += cost
+            continue
+        try:
+            step = int(float(lifespan))
+        except (TypeError, ValueError):
+            annual[0] += cost
+            continue
+        for yr in range(0, years + 1, step):
+            annual[yr] += cost
+    return np.cumsum(annual)
+
+
+def _bom(n_rows: int) -> pd.DataFrame:
+    """Synthetic BOM with realistic lifespans and some indefinite items."""
+    rng = np.random.default_rng(0)
+    pool = np.array([5, 7, 10, 15, 20, 25, 30, "indefinite"], dtype=object)
+    return pd.DataFrame({
+        "name": [f"Item {i}" for i in range(n_rows)],
+        "quantity": 1,
+        "cost_usd": rng.integers(1_000, 5_000_000, n_rows).astype(float),
+        "lifespan_years": pool[rng.integers(len(pool), size=n_rows)],
+    })
+
+
+def _time(fn, repeat: int) -> float:
+    """Best wall time of *repeat* calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--years", type=int, default=50)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000])
+    args = parser.parse_args()
+
+    for n_rows in args.sizes:
+        df = _bom(n_rows)
+        repeat = 1 if n_rows >= 100_000 else 5
+        ref = _time(lambda: _reference(df, args.years), repeat)
+        vec = _time(lambda: compute_cost_over_time(df, args.years), max(repeat, 3))
+        np.testing.assert_allclose(compute_cost_over_time(df, args.years), _reference(df, args.years))
+        print(
+            f"{n_rows:>8} rows  loop {ref * 1000:9.2f} ms  "
+            f"vectorized {vec * 1000:8.2f} ms  speedup {ref / vec:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+benchmarks/bench_equipment_section.py
+=====================================
+Measure the equipment accordion with lazily loaded bodies against building
+every body up front (the previous eager behaviour), for growing BOMs.
+
+The workbook's equipment tables are repeated SCALE times per system (names
+kept, so every row still maps to its process stage) and for each size the
+script reports:
+  - lazy    make_equipment_section(): headers and placeholder bodies only
+  - eager   the same section plus make_equipment_body() for every item
+  - expand  one make_equipment_body() call, the work of expanding an item
+
+Bytes are the JSON size of the component tree as Dash sends it.
+
+Usage
+-----
+  python benchmarks/bench_equipment_section.py [--runs N] [--scales 1,5,20]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data.loader import load_data  # noqa: E402
+from src.layout.equipment_grid import make_equipment_body, make_equipment_section  # noqa: E402
+
+_SYSTEMS = ("mechanical", "electrical", "hybrid")
+
+
+def _scaled(data: dict, scale: int) -> dict:
+    out = dict(data)
+    for system in _SYSTEMS:
+        out[system] = pd.concat([data[system]] * scale, ignore_index=True)
+    return out
+
+
+def _median_time(fn, runs: int) -> tuple[float, object]:
+    times, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scales", default="1,5,20")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = load_data()
+
+    print(f"{'system':<11} {'rows':>5}  {'lazy ms':>8} {'lazy KB':>8}  "
+          f"{'eager ms':>9} {'eager KB':>9}  {'expand ms':>9}")
+    for scale in (int(s) for s in args.scales.split(",")):
+        data = _scaled(base, scale)
+        for system in _SYSTEMS:
+            df = data[system]
+
+            def lazy():
+                return make_equipment_section(df, system)
+
+            def eager():
+                section = make_equipment_section(df, system)
+                bodies = [make_equipment_body(row, system, data) for _, row in df.iterrows()]
+                return section, bodies
+
+            lazy_s, lazy_tree = _median_time(lazy, args.runs)
+            eager_s, (section, bodies) = _median_time(eager, args.runs)
+            expand_s, _ = _median_time(lambda: make_equipment_body(df.iloc[0], system, data), args.runs)
+            lazy_kb = len(to_json_plotly(lazy_tree)) / 1024
+            # Eager bytes: the section with every body in place of its placeholder.
+            eager_kb = lazy_kb + sum(len(to_json_plotly(b)) for b in bodies) / 1024
+            print(f"{system:<11} {len(df):>5}  {lazy_s * 1000:>8.1f} {lazy_kb:>8.1f}  "
+                  f"{eager_s * 1000:>9.1f} {eager_kb:>9.1f}  {expand_s * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+benchmarks/bench_figure_patch.py
+================================
+Measure response size and server time of the chart callbacks through the
+real Dash endpoint (/_dash-update-component) via Flask's test client.
+
+Two requests are compared per chart:
+  - initial render  (no changedPropIds)  → full figure skeleton
+  - slider move     (changedPropIds set, figure store populated)
+                                         → dash.Patch with the changed arrays
+
+The slider values are cycled so every request misses the chart data caches
+and the numbers include the computation, not just serialization.
+
+Usage
+-----
+  python benchmarks/bench_figure_patch.py [--runs N]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import app  # noqa: E402
+
+_CHARTS = {
+    "cost": {
+        "outputs": [("store-cost-figure", "data"), ("label-years", "children"),
+                    ("label-battery-ratio", "children"), ("label-elec-cost", "children")],
+        "inputs": [("slider-time-horizon", lambda i: 20 + i % 30), ("slider-battery", lambda i: (i % 1000) / 1000)],
+        "store": "store-cost-figure",
+    },
+    "power": {
+        "outputs": [("store-power-figure", "data"), ("label-tds", "children"), ("label-depth", "children")],
+        "inputs": [("slider-tds", lambda i: (i % 100) * 100), ("slider-depth", lambda i: i % 1900)],
+        "store": "store-power-figure",
+    },
+}
+
+
+def _payload(chart: dict, i: int, slider_move: bool) -> dict:
+    outputs = [{"id": cid, "property": prop} for cid, prop in chart["outputs"]]
+    inputs = [{"id": cid, "property": "value", "value": value(i)} for cid, value in chart["inputs"]]
+    return {
+        "output": "...".join(f"{cid}.{prop}" for cid, prop in chart["outputs"]).join(["..", ".."]),
+        "outputs": outputs,
+        "inputs": inputs,
+        "changedPropIds": [f"{chart['inputs'][0][0]}.value"] if slider_move else [],
+        # The callbacks only patch a populated store; the stand-in figure
+        # keeps the request small (the response is what is measured).
+        "state": [{"id": chart["store"], "property": "data",
+                   "value": {"data": [], "layout": {}} if slider_move else None}],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    client = app.server.test_client()
+    client.get("/")  # trigger Dash's first-request setup
+
+    for name, chart in _CHARTS.items():
+        for label, slider_move in [("initial render", False), ("slider move", True)]:
+            sizes, times = [], []
+            for i in range(args.runs):
+                body = json.dumps(_payload(chart, i, slider_move))
+                t0 = time.perf_counter()
+                resp = client.post("/_dash-update-component", data=body, content_type="application/json")
+                times.append(time.perf_counter() - t0)
+                assert resp.status_code == 200, resp.data[:200]
+                sizes.append(len(resp.data))
+            print(
+                f"{name:<5} {label:<14} response {statistics.median(sizes):8.0f} B  "
+                f"server time {statistics.median(times) * 1000:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+benchmarks/bench_loader.py
+==========================
+Compare a cold openpyxl parse of data.xlsx with a snapshot load.
+
+Each measurement runs in a fresh interpreter so import costs (openpyxl on the
+cold path) are included, just as a gunicorn worker would pay them.
+
+Usage
+-----
+  python benchmarks/bench_loader.py [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_SCRIPT = """
+import contextlib, io, sys, time
+t0 = time.perf_counter()
+from src.data.loader import load_data
+t1 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    load_data(use_snapshot={use_snapshot})
+t2 = time.perf_counter()
+print(t2 - t0, t2 - t1, "openpyxl" in sys.modules)
+"""
+
+
+def _run(use_snapshot: bool) -> tuple[float, float, bool]:
+    """Run one load in a subprocess.
+
+    Returns (total_seconds, load_data_seconds, openpyxl_imported), where the
+    total includes importing the loader (and therefore pandas).
+    """
+    out = subprocess.run(
+        [sys.executable, "-c", _SCRIPT.format(use_snapshot=use_snapshot)],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return float(out[0]), float(out[1]), out[2] == "True"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # Prime the snapshot so the warm runs hit it.
+    _run(use_snapshot=True)
+
+    for label, use_snapshot in [("cold xlsx parse", False), ("snapshot load", True)]:
+        results = [_run(use_snapshot) for _ in range(args.runs)]
+        totals = [total for total, _, _ in results]
+        loads = [load for _, load, _ in results]
+        imported = any(flag for _, _, flag in results)
+        print(
+            f"{label:<16} load_data() median {statistics.median(loads) * 1000:7.1f} ms  "
+            f"with imports {statistics.median(totals) * 1000:7.1f} ms  "
+            f"openpyxl imported: {imported}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+benchmarks/bench_scenario_grid.py
+=================================
+Compare live compute_cost_chart_data() / compute_energy_chart_data() calls
+with lookups in the memory-mapped scenario grid (src/data/grid.py) over
+random on-grid slider positions, and report the grid build time and size.
+
+The grid is written to a temporary directory, so data.xlsx.grid is left
+untouched.
+
+Usage
+-----
+  python benchmarks/bench_scenario_grid.py [--lookups N]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data.grid import build_grid, open_grid, write_grid  # noqa: E402
+from src.data.loader import load_data  # noqa: E402
+from src.data.processing import CostModel, compute_cost_chart_data, compute_energy_chart_data  # noqa: E402
+
+
+def _per_call_us(fn, args) -> float:
+    t0 = time.perf_counter()
+    for a in args:
+        fn(*a)
+    return (time.perf_counter() - t0) / len(args) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = load_data()
+    model = CostModel(data)
+
+    t0 = time.perf_counter()
+    grid = build_grid(data, model)
+    build = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.xlsx.grid"
+        t0 = time.perf_counter()
+        write_grid(path, grid)
+        write = time.perf_counter() - t0
+        size = path.stat().st_size
+        mapped = open_grid(path, grid.digest)
+
+        rng = np.random.default_rng(0)
+        cost_args = list(zip(rng.integers(1, 51, args.lookups).tolist(),
+                             (rng.integers(0, 1001, args.lookups) / 1000).tolist()))
+        energy_args = list(zip((rng.integers(0, 101, args.lookups) * 100.0).tolist(),
+                               rng.integers(0, 1901, args.lookups).astype(float).tolist()))
+
+        live_cost = _per_call_us(lambda y, f: compute_cost_chart_data(data, f, y, cost_model=model), cost_args)
+        grid_cost = _per_call_us(mapped.cost_chart_data, cost_args)
+        live_energy = _per_call_us(lambda t, d: compute_energy_chart_data(data, t, d), energy_args)
+        grid_energy = _per_call_us(mapped.energy_chart_data, energy_args)
+        del mapped
+
+    print(f"grid build {build * 1000:7.1f} ms  write {write * 1000:7.1f} ms  size {size / 1e6:5.1f} MB")
+    print(f"cost   live {live_cost:7.1f} us/call  grid {grid_cost:6.1f} us/call  "
+          f"speedup {live_cost / grid_cost:5.1f}x")
+    print(f"energy live {live_energy:7.1f} us/call  grid {grid_energy:6.1f} us/call  "
+          f"speedup {live_energy / grid_energy:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
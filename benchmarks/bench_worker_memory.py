@@ -0,0 +1,145 @@
+"""
+benchmarks/bench_worker_memory.py
+=================================
+Measure per-worker memory of the gunicorn deployment with and without
+preload_app (gunicorn.conf.py, PRELOAD_APP).
+
+For each worker count the server is started, one page load and a batch of
+slider callbacks are sent so the workers reach a steady state, and then
+/proc/<pid>/smaps_rollup is read for every worker:
+
+  RSS  resident set size — counts shared pages in full for every process
+  PSS  proportional set size — shared pages divided among the sharers;
+       the sum of PSS over all processes is the real memory footprint
+
+Linux only (needs /proc/<pid>/smaps_rollup).
+
+Usage
+-----
+  python benchmarks/bench_worker_memory.py [--workers 2 8 32]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CALLBACK = {
+    "output": "..store-power-figure.data...label-tds.children...label-depth.children..",
+    "outputs": [{"id": "store-power-figure", "property": "data"},
+                {"id": "label-tds", "property": "children"},
+                {"id": "label-depth", "property": "children"}],
+    "inputs": [{"id": "slider-tds", "property": "value", "value": 950},
+               {"id": "slider-depth", "property": "value", "value": 950}],
+    "changedPropIds": [],
+    "state": [],
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _smaps_kb(pid: int) -> dict[str, int]:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields
+
+
+def _children(pid: int) -> list[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as fh:
+        return [int(p) for p in fh.read().split()]
+
+
+def _request(url: str, body: dict | None = None) -> None:
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        resp.read()
+
+
+def measure(workers: int, preload: bool) -> dict:
+    """Start gunicorn, warm it up, and return memory figures in MiB."""
+    port = _free_port()
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), PRELOAD_APP="1" if preload else "0")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:server", "--config", "gunicorn.conf.py",
+         "--bind", f"127.0.0.1:{port}"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        # Wait until every worker is up and has finished importing the app
+        # (its RSS stops growing).
+        deadline = time.monotonic() + 60 + 10 * workers
+        previous = None
+        while time.monotonic() < deadline:
+            time.sleep(1.0)
+            pids = _children(proc.pid)
+            sizes = [_smaps_kb(pid)["Rss"] for pid in pids]
+            if len(pids) == workers and sizes == previous:
+                break
+            previous = sizes
+        _request(f"{base}/ready")
+        # Spread requests over the workers so most have served traffic.  Dash
+        # registers callbacks on a worker's first page load, so a callback
+        # routed to an untouched worker fails and is skipped.
+        for i in range(4 * workers):
+            _request(f"{base}/")
+            body = dict(_CALLBACK, inputs=[
+                {"id": "slider-tds", "property": "value", "value": (i % 100) * 100},
+                {"id": "slider-depth", "property": "value", "value": i % 1900},
+            ])
+            try:
+                _request(f"{base}/_dash-update-component", body)
+            except urllib.error.HTTPError:
+                pass  # landed on a worker that has not served "/" yet
+        time.sleep(1.0)
+
+        pids = _children(proc.pid)
+        rollups = [_smaps_kb(pid) for pid in pids]
+        master = _smaps_kb(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(30)
+
+    mib = 1024.0
+    rss = [r["Rss"] / mib for r in rollups]
+    pss = [r["Pss"] / mib for r in rollups]
+    return {
+        "workers": len(pids),
+        "rss": sum(rss) / len(rss),
+        "pss": sum(pss) / len(pss),
+        "total_pss": (sum(r["Pss"] for r in rollups) + master["Pss"]) / mib,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 8, 32])
+    args = parser.parse_args()
+
+    print(f"{'workers':>7}  {'preload':>7}  {'RSS/worker':>10}  {'PSS/worker':>10}  {'total PSS':>10}")
+    for workers in args.workers:
+        for preload in (False, True):
+            r = measure(workers, preload)
+            print(f"{r['workers']:>7}  {'yes' if preload else 'no':>7}  "
+                  f"{r['rss']:>7.1f} MiB  {r['pss']:>7.1f} MiB  {r['total_pss']:>7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+gunicorn.conf.py
+================
+gunicorn settings for the production server (see Procfile).
+
+With preload_app the master imports app.py — parsing data.xlsx, publishing
+it to the registry and compiling the CostModel — once, before forking the
+workers.  The workers inherit those objects copy-on-write instead of each
+loading its own copy.  Threads are not inherited across fork, so the master
+stops its data watcher before forking and every worker restarts its own
+(DataRegistry.after_fork()).  Module-level locks a master thread may hold at
+fork time (the chart state lock, the LRU caches, the metrics store) are
+replaced in each child by os.register_at_fork() hooks in their modules.
+
+Environment variables
+---------------------
+WEB_CONCURRENCY   number of workers (default 2)
+PRELOAD_APP       "0" to load the app separately in every worker (default "1")
+"""
+
+import gc
+import os
+
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+timeout = 120
+preload_app = os.environ.get("PRELOAD_APP", "1") == "1"
+
+
+def when_ready(server):
+    """Master, after the app is loaded and before the first fork."""
+    if not server.cfg.preload_app:
+        return
+    from src.data.registry import registry
+
+    registry.stop_watching()
+    # Move everything allocated so far out of the collector's reach: a GC
+    # pass in a worker would otherwise write to the header of every inherited
+    # object and un-share the pages holding them.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Worker, right after fork: restart the registry threads."""
+    if not server.cfg.preload_app:
+        return
+    from src.config import DATA_RELOAD_INTERVAL
+    from src.data.registry import registry
+
+    registry.after_fork(DATA_RELOAD_INTERVAL)
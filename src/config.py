@@ -2,11 +2,90 @@
 Project configuration: constants, color maps, and file paths.
 """
 
+import os
 from pathlib import Path
 
 # Path to the Excel data file, relative to the project root
 DATA_FILE = Path(__file__).parent.parent / "data.xlsx"
 
+# Compiled binary snapshot of the parsed workbook (see src/data/snapshot.py).
+# Written next to data.xlsx after the first successful parse and reused by
+# later process starts while the workbook is unchanged.
+SNAPSHOT_FILE = DATA_FILE.with_name(DATA_FILE.name + ".snapshot")
+
+# Memory-mapped scenario grid of precomputed chart data (see src/data/grid.py).
+# Built from the served data when missing or stale; slider callbacks index it
+# and every worker shares its pages through the OS page cache.  Disable with
+# SCENARIO_GRID=0 to always compute chart data live.
+GRID_FILE = DATA_FILE.with_name(DATA_FILE.name + ".grid")
+SCENARIO_GRID = os.environ.get("SCENARIO_GRID", "1") == "1"
+
+# Seconds between checks of data.xlsx for changes; a changed workbook is
+# re-parsed in a background thread and swapped in without a restart (see
+# src/data/registry.py).  Override with DATA_RELOAD_INTERVAL, 0 disables.
+DATA_RELOAD_INTERVAL = float(os.environ.get("DATA_RELOAD_INTERVAL", "5"))
+
+# Parse data.xlsx in a background thread at startup so gunicorn workers
+# answer health checks and serve a loading page immediately.  /ready returns
+# 503 until the data is available.  Enable with ASYNC_STARTUP=1.
+ASYNC_STARTUP = os.environ.get("ASYNC_STARTUP", "0") == "1"
+
+# Per-callback latency / payload metrics and data load stage timings, served
+# at /metrics (Prometheus) and /metrics.json (see src/metrics.py).  The routes
+# are unauthenticated, so they are off by default; enable with METRICS=1 only
+# where the port is not publicly reachable.
+METRICS = os.environ.get("METRICS", "0") == "1"
+
+# On-demand cProfile captures of single callback requests (see
+# src/profiling.py).  With PROFILING=1 and PROFILE_TOKEN set, a callback
+# request flagged with ?profile=<token> is profiled; the newest PROFILE_KEEP
+# captures are kept in PROFILE_DIR and listed at /_profiles?token=<token>.
+PROFILING = os.environ.get("PROFILING", "0") == "1"
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", Path(__file__).parent.parent / "profiles"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "20"))
+
+# Maximum number of compute_chart_data() results memoized per worker process
+# (see src/data/cache.py).  Each entry is a few KB of arrays; override with the
+# CHART_CACHE_SIZE environment variable, 0 disables the cache.
+CHART_CACHE_SIZE = int(os.environ.get("CHART_CACHE_SIZE", "512"))
+
+# Figure cache shared by every worker on the host (see
+# src/data/shared_cache.py): "disk:<directory>" or "sqlite:<file>".  The
+# server-side slider callbacks store their pre-serialized figures per data
+# digest and slider position, so a position computed by one worker is a hit
+# in all of them.  Bounded to FIGURE_CACHE_MAX_MB; empty (the default)
+# disables it.
+FIGURE_CACHE = os.environ.get("FIGURE_CACHE", "")
+FIGURE_CACHE_MAX_MB = float(os.environ.get("FIGURE_CACHE_MAX_MB", "64"))
+
+# Cache of the rendered system views (scorecard, comparison text, equipment
+# accordion and chart section) per (system, data version), built for all
+# three systems whenever data is published (see src/layout/shell.py).  Tab
+# switches then reuse the component tree.  Disable with LAYOUT_CACHE=0.
+LAYOUT_CACHE = os.environ.get("LAYOUT_CACHE", "1") == "1"
+
+# Slider step of the battery/tank fraction.  Cache keys quantize the fraction
+# to this grid so float noise from the browser cannot defeat a hit.
+BATTERY_SLIDER_STEP = 0.001
+
+# Domains of the TDS (PPM) and depth (m) sliders: 0 to max in fixed steps.
+# Must match the dcc.Slider definitions in src/layout/charts.py.
+TDS_SLIDER_STEP, TDS_SLIDER_MAX = 100, 10_000
+DEPTH_SLIDER_STEP, DEPTH_SLIDER_MAX = 1, 1_900
+
+# Dense lookup tables: the battery / TDS / depth interpolations are
+# materialized at load for every slider step (src/data/interpolation.py) and
+# stored in the data snapshot, so an on-step lookup is one array index.
+# Disable with DENSE_LOOKUPS=0 to always interpolate.
+DENSE_LOOKUPS = os.environ.get("DENSE_LOOKUPS", "1") == "1"
+
+# Fully clientside slider mode: precomputed scenario tables are shipped to the
+# browser once and clientside callbacks rebuild the charts locally, so slider
+# moves never reach the server and sliders update live while dragging.
+# Enable with CLIENTSIDE_SLIDERS=1.
+CLIENTSIDE_SLIDERS = os.environ.get("CLIENTSIDE_SLIDERS", "0") == "1"
+
 # Academic muted triad palette for the three system types.
 # Colors are desaturated (muted) for an academic paper aesthetic and are
 # distinguishable by most forms of colorblindness (blue / orange / green
@@ -0,0 +1,120 @@
+"""
+src/data/cache.py
+=================
+Bounded, thread-safe least-recently-used cache for memoizing pure
+computations (e.g. compute_chart_data results keyed by slider state).
+
+gunicorn workers may serve callbacks from several threads, so every access
+to the underlying OrderedDict is guarded by a lock.  The wrapped computation
+itself runs outside the lock: two threads missing on the same key may both
+compute it, but neither blocks unrelated lookups while doing so.
+
+A gunicorn worker forked from a preloading master inherits every cache, and
+with it any lock a master thread (e.g. the load_async() publish listeners)
+held at that moment.  Every cache's lock is therefore replaced in the child
+right after fork (os.register_at_fork).
+
+Exports
+-------
+LRUCache(maxsize)        — get / put / get_or_compute / clear / stats
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+_MISSING = object()
+
+# Live caches, for re-arming their locks after fork.
+_instances: "weakref.WeakSet[LRUCache]" = weakref.WeakSet()
+
+
+class LRUCache:
+    """Least-recently-used mapping holding at most *maxsize* entries.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries kept.  0 disables caching (every lookup is
+        a miss and nothing is stored).
+
+    Notes
+    -----
+    Cached values are returned by reference.  Callers must treat them as
+    read-only; mutating a cached array or dict would corrupt later hits.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be >= 0, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        _instances.add(self)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for *key* (marking it most recent), else *default*."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store *value* under *key*, evicting the least recent entry if full."""
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for *key*, calling *compute()* on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry.  Counters are kept so rates survive reloads."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return counters: {"hits", "misses", "evictions", "size", "maxsize"}."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+def _rearm_after_fork() -> None:
+    """Child side of fork(): replace locks possibly held by a lost thread."""
+    for cache in list(_instances):
+        cache._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_rearm_after_fork)
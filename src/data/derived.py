@@ -0,0 +1,123 @@
+"""
+src/data/derived.py
+===================
+Metrics derived from the BOM tables, computed once per data snapshot.
+
+The scorecard (aggregate metrics, RAG colors, best-overall verdict) and the
+hybrid comparison sentences depend only on the equipment DataFrames and a
+few config constants.  The loader computes them with
+build_derived_metrics() after parsing and stores the result under
+data["derived_metrics"] — and therefore in the data snapshot — so the system
+view reads them instead of recomputing on every render.  New snapshot-level
+metrics belong here as well.
+
+The stored dict records the config constants it was computed with; when
+they change while the workbook (and so the snapshot) does not,
+derived_metrics() recomputes instead of serving stale colors or ratios.
+
+Exports
+-------
+SCORECARD_METRICS                      — metric keys shown in the scorecard
+scorecard_summary(mechanical_df, electrical_df, hybrid_df=None) -> dict
+build_derived_metrics(data) -> dict
+derived_metrics(data) -> dict          — stored metrics, or computed when absent / stale
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from src.config import DRIVETRAIN_EFFICIENCY, LCOW_DENOMINATOR_KGAL, RAG_COLORS
+from src.data.processing import compute_scorecard_metrics, generate_comparison_text, rag_color
+
+# Scorecard rows, in display order; each is colored with rag_color().
+SCORECARD_METRICS = ("cost", "drivetrain_efficiency", "lcow")
+
+
+def _config_key() -> tuple:
+    """Config constants the derived metrics depend on."""
+    return (
+        tuple(sorted(DRIVETRAIN_EFFICIENCY.items())),
+        LCOW_DENOMINATOR_KGAL,
+        tuple(sorted(RAG_COLORS.items())),
+    )
+
+
+def scorecard_summary(
+    mechanical_df: pd.DataFrame,
+    electrical_df: pd.DataFrame,
+    hybrid_df: pd.DataFrame | None = None,
+) -> dict:
+    """Compute the scorecard: metrics, RAG colors and the best-overall verdict.
+
+    Parameters
+    ----------
+    mechanical_df, electrical_df : pd.DataFrame
+        Equipment DataFrames for the two preset systems.
+    hybrid_df : pd.DataFrame or None, optional
+        Equipment DataFrame for the hybrid system; when given, the hybrid
+        is ranked alongside the presets.
+
+    Returns
+    -------
+    dict with keys:
+        "metrics"      – compute_scorecard_metrics() result
+        "colors"       – {metric: {system: hex color}} for SCORECARD_METRICS
+        "best_overall" – "Mechanical" / "Electrical" / "Hybrid" (most green
+                         dots) or "Tied"
+    """
+    metrics = compute_scorecard_metrics(mechanical_df, electrical_df, hybrid_df)
+    systems = [s for s in ("mechanical", "electrical", "hybrid") if s in metrics]
+
+    colors = {
+        metric: rag_color({s: metrics[s][metric] for s in systems}, metric=metric)
+        for metric in SCORECARD_METRICS
+    }
+
+    green_hex = RAG_COLORS["green"]
+    greens = {
+        s.capitalize(): sum(1 for metric in SCORECARD_METRICS if colors[metric].get(s) == green_hex)
+        for s in systems
+    }
+    most = max(greens.values())
+    tied = [name for name, count in greens.items() if count == most]
+    best_overall = tied[0] if len(tied) == 1 else "Tied"
+
+    return {"metrics": metrics, "colors": colors, "best_overall": best_overall}
+
+
+def build_derived_metrics(data: dict) -> dict:
+    """Compute every snapshot-level derived metric of a load_data() dict.
+
+    Returns
+    -------
+    dict with keys:
+        "config"          – config constants used (see derived_metrics())
+        "scorecard"       – scorecard_summary() of the three systems
+        "comparison_text" – generate_comparison_text() sentences for the
+                            hybrid vs the presets, None without a hybrid
+    """
+    scorecard = scorecard_summary(data["mechanical"], data["electrical"], data.get("hybrid"))
+    metrics = scorecard["metrics"]
+    comparison_text = None
+    if "hybrid" in metrics:
+        comparison_text = generate_comparison_text(
+            metrics["hybrid"], metrics["mechanical"], metrics["electrical"]
+        )
+    return {
+        "config": _config_key(),
+        "scorecard": scorecard,
+        "comparison_text": comparison_text,
+    }
+
+
+def derived_metrics(data: dict) -> dict:
+    """The derived metrics stored with *data*, or freshly computed.
+
+    Computes them when *data* carries none (e.g. a hand-built dict) or they
+    were computed with different config constants.
+    """
+    stored = data.get("derived_metrics")
+    if stored is not None and stored.get("config") == _config_key():
+        return stored
+    return build_derived_metrics(data)
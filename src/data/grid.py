@@ -0,0 +1,321 @@
+"""
+src/data/grid.py
+================
+Precomputed scenario grid for the comparison chart callbacks, stored in a
+memory-mapped file next to data.xlsx.
+
+Every chart input lives on a small discrete slider grid:
+
+  cost    battery fraction 0–1 in BATTERY_SLIDER_STEP steps (1,001 values);
+          any time horizon up to DEFAULT_HORIZON_YEARS is a prefix of the
+          full-horizon curve
+  energy  TDS 0–10,000 ppm in 100 ppm steps (101 values) ×
+          depth 0–1,900 m in 1 m steps (1,901 values)
+
+build_grid() evaluates compute_cost_chart_data() / compute_energy_chart_data()
+for the whole grid in one vectorized pass.  write_grid() stores the result
+as raw float64 arrays behind a small header; open_grid() maps the file
+read-only, so a slider callback is an array index and every gunicorn worker
+reads the same pages from the OS page cache.  Values off the grid (e.g. the
+950 ppm TDS default) return None and the caller computes them live.
+
+A grid file is only trusted when its header matches GRID_FORMAT_VERSION and
+grid_digest() of the data being served, so a grid left over from an older
+workbook is rebuilt instead of misread.
+
+Exports
+-------
+ScenarioGrid                         — cost_chart_data / energy_chart_data lookups
+grid_digest(data, cost_model) -> str — fingerprint of the grid inputs
+build_grid(data, cost_model) -> ScenarioGrid
+write_grid(path, grid) -> bool       — atomic write; False if not writable
+open_grid(path, digest) -> ScenarioGrid | None
+load_grid(path, data, cost_model) -> ScenarioGrid
+    Open the grid file, or build and (re)write it on a miss
+
+Usage
+-----
+  python -m src.data.grid      # build data.xlsx.grid ahead of deployment
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from src.config import (
+    BATTERY_SLIDER_STEP,
+    DEPTH_SLIDER_MAX,
+    DEPTH_SLIDER_STEP,
+    SUBSYSTEM_POWER,
+    TDS_SLIDER_MAX,
+    TDS_SLIDER_STEP,
+)
+from src.data.interpolation import build_interpolators, slider_index
+from src.data.normalize import float_column
+from src.data.processing import DEFAULT_HORIZON_YEARS, CostModel
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Constants
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Bump whenever the file layout or the meaning of an array changes.
+GRID_FORMAT_VERSION = 1
+
+_MAGIC = b"DESALGRID"
+_ALIGN = 64  # payload offset alignment (bytes)
+
+_SYSTEMS = ("mechanical", "electrical", "hybrid")
+_STAGES = tuple(SUBSYSTEM_POWER)
+
+# Slider grids (src/config.py).
+BATTERY_STEPS = int(round(1 / BATTERY_SLIDER_STEP)) + 1
+TDS_STEP, TDS_MAX = TDS_SLIDER_STEP, TDS_SLIDER_MAX
+DEPTH_STEP, DEPTH_MAX = DEPTH_SLIDER_STEP, DEPTH_SLIDER_MAX
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Grid
+# ──────────────────────────────────────────────────────────────────────────────
+
+class ScenarioGrid:
+    """Chart data for every on-grid slider position.
+
+    Parameters
+    ----------
+    cost : np.ndarray, shape (BATTERY_STEPS, 3, horizon+1)
+        Cumulative cost curve per battery step and system.
+    elec_total : np.ndarray, shape (BATTERY_STEPS,)
+        Live electrical total cost per battery step.
+    energy : np.ndarray, shape (n_tds, n_depth, 3, n_stages)
+        Subsystem power (kW) per TDS step, depth step and system.
+    digest : str
+        grid_digest() of the data the arrays were computed from.
+
+    Arrays may be read-only memory maps; results returned by the lookups
+    share their memory and must not be mutated.
+    """
+
+    def __init__(self, cost: np.ndarray, elec_total: np.ndarray, energy: np.ndarray, digest: str):
+        self.cost = cost
+        self.elec_total = elec_total
+        self.energy = energy
+        self.digest = digest
+
+    @property
+    def horizon(self) -> int:
+        """Longest time horizon (years) covered by the cost grid."""
+        return self.cost.shape[2] - 1
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """Name → array mapping, in file order."""
+        return {"cost": self.cost, "elec_total": self.elec_total, "energy": self.energy}
+
+    def cost_chart_data(self, years: int, battery_fraction: float) -> dict | None:
+        """compute_cost_chart_data() result from the grid, or None if off-grid."""
+        step = slider_index(battery_fraction, BATTERY_SLIDER_STEP, self.cost.shape[0])
+        if step is None or not 0 <= years <= self.horizon or years != int(years):
+            return None
+        curves = self.cost[step, :, :int(years) + 1]
+        return {
+            "cost_over_time": dict(zip(_SYSTEMS, curves)),
+            "electrical_total_cost": float(self.elec_total[step]),
+        }
+
+    def energy_chart_data(self, tds_ppm: float, depth_m: float) -> dict | None:
+        """compute_energy_chart_data() result from the grid, or None if off-grid."""
+        i = slider_index(tds_ppm, TDS_STEP, self.energy.shape[0])
+        j = slider_index(depth_m, DEPTH_STEP, self.energy.shape[1])
+        if i is None or j is None:
+            return None
+        rows = self.energy[i, j].tolist()
+        return {
+            "energy_breakdown": {
+                sys_key: dict(zip(_STAGES, row)) for sys_key, row in zip(_SYSTEMS, rows)
+            }
+        }
+
+
+def grid_digest(data: dict, cost_model: CostModel) -> str:
+    """SHA-256 over everything the grid is computed from.
+
+    Covers the compiled CostModel arrays, the energy lookup tables, the base
+    subsystem powers and the grid layout, so any change to the data or to
+    the slider grids produces a different digest.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps({
+        "format": GRID_FORMAT_VERSION,
+        "battery_steps": BATTERY_STEPS,
+        "tds": [TDS_STEP, TDS_MAX],
+        "depth": [DEPTH_STEP, DEPTH_MAX],
+        "horizon": cost_model.horizon,
+        "subsystem_power": SUBSYSTEM_POWER,
+        "elec_base_cost": cost_model.elec_base_cost,
+    }, sort_keys=True).encode())
+    h.update(cost_model.buffer.tobytes())
+    for key, cols in (("tds_lookup", ("tds_ppm", "ro_energy_kw")),
+                      ("depth_lookup", ("depth_m", "pump_energy_kw"))):
+        for col in cols:
+            h.update(float_column(data[key], col).tobytes())
+    return h.hexdigest()
+
+
+def build_grid(data: dict, cost_model: CostModel | None = None) -> ScenarioGrid:
+    """Evaluate the chart data over the full slider grid.
+
+    Parameters
+    ----------
+    data : dict
+        Full data dict from load_data().
+    cost_model : CostModel, optional
+        Model compiled for *data*; built here when omitted.
+
+    Returns
+    -------
+    ScenarioGrid
+        In-memory grid whose lookups equal compute_cost_chart_data() and
+        compute_energy_chart_data() at every on-grid slider position.
+    """
+    if cost_model is None or cost_model.horizon < DEFAULT_HORIZON_YEARS:
+        cost_model = CostModel(data)
+
+    fractions = np.arange(BATTERY_STEPS) * BATTERY_SLIDER_STEP
+    years = np.full(BATTERY_STEPS, cost_model.horizon)
+    tensors = cost_model.cost_over_time_batch(years, fractions)
+    cost = np.stack([tensors[sys_key] for sys_key in _SYSTEMS], axis=1)
+    elec_total = cost_model.elec_base_cost + cost_model.battery_costs(fractions)
+
+    tds = np.arange(0, TDS_MAX + TDS_STEP, TDS_STEP, dtype=float)
+    depth = np.arange(0, DEPTH_MAX + DEPTH_STEP, DEPTH_STEP, dtype=float)
+    interpolators = build_interpolators(data)
+    ro_kw = interpolators.tds(tds)
+    pump_kw = interpolators.depth(depth)
+
+    # Same additions as compute_energy_chart_data(), broadcast over the grid.
+    energy = np.empty((len(tds), len(depth), len(_SYSTEMS), len(_STAGES)))
+    for k, stage in enumerate(_STAGES):
+        values = np.full((len(tds), len(depth)), float(SUBSYSTEM_POWER[stage]))
+        if stage == "RO Desalination":
+            values += ro_kw[:, None]
+        elif stage == "Groundwater Extraction":
+            values += pump_kw[None, :]
+        energy[:, :, :, k] = values[:, :, None]
+
+    return ScenarioGrid(cost, elec_total, energy, grid_digest(data, cost_model))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# File I/O
+# ──────────────────────────────────────────────────────────────────────────────
+#
+# Layout: _MAGIC, uint32 header length, JSON header, zero padding up to a
+# multiple of _ALIGN, then each array as C-ordered little-endian float64 at
+# the offset recorded in the header.
+
+def write_grid(path: Path, grid: ScenarioGrid) -> bool:
+    """Atomically write *grid* to *path* (temporary file + os.replace()).
+
+    Workers that still map a previous grid keep reading the old file, which
+    the OS frees once the last mapping is closed.
+
+    Returns
+    -------
+    bool
+        True if the file was written; False if the directory is not writable.
+        Failure is never fatal.
+    """
+    arrays = grid.arrays()
+    entries, offset = {}, 0
+    for name, array in arrays.items():
+        entries[name] = {"offset": offset, "shape": list(array.shape)}
+        offset += array.size * 8
+    header = json.dumps({"format": GRID_FORMAT_VERSION, "digest": grid.digest, "arrays": entries}).encode()
+    prefix = len(_MAGIC) + 4 + len(header)
+    padding = -prefix % _ALIGN
+
+    try:
+        fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_MAGIC + struct.pack("<I", len(header)) + header + b"\0" * padding)
+            for array in arrays.values():
+                fh.write(np.ascontiguousarray(array, dtype="<f8").tobytes())
+        os.replace(tmp_name, path)
+        return True
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        return False
+
+
+def open_grid(path: Path, digest: str) -> ScenarioGrid | None:
+    """Map the grid at *path* read-only if it was built for *digest*.
+
+    Returns None on any miss: file absent, different format version or
+    digest, or a truncated / corrupt file.
+    """
+    try:
+        with open(path, "rb") as fh:
+            if fh.read(len(_MAGIC)) != _MAGIC:
+                return None
+            (length,) = struct.unpack("<I", fh.read(4))
+            header = json.loads(fh.read(length))
+        if header.get("format") != GRID_FORMAT_VERSION or header.get("digest") != digest:
+            return None
+        base = len(_MAGIC) + 4 + length
+        base += -base % _ALIGN
+        size = os.path.getsize(path)
+        arrays = {}
+        for name, entry in header["arrays"].items():
+            shape = tuple(entry["shape"])
+            offset = base + entry["offset"]
+            if offset + 8 * int(np.prod(shape)) > size:
+                return None
+            # Plain ndarray views of the map: slicing an np.memmap subclass
+            # costs more than the lookup itself.
+            arrays[name] = np.memmap(
+                path, dtype="<f8", mode="r", offset=offset, shape=shape,
+            ).view(np.ndarray)
+        return ScenarioGrid(arrays["cost"], arrays["elec_total"], arrays["energy"], digest)
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+
+
+def load_grid(path: Path, data: dict, cost_model: CostModel) -> ScenarioGrid:
+    """Return the mapped grid for *data*, building and writing it on a miss.
+
+    When the file cannot be written (read-only deploy) the freshly built
+    in-memory grid is returned instead, so lookups still skip computation.
+    """
+    digest = grid_digest(data, cost_model)
+    grid = open_grid(path, digest)
+    if grid is not None:
+        return grid
+    built = build_grid(data, cost_model)
+    if write_grid(path, built):
+        return open_grid(path, digest) or built
+    return built
+
+
+if __name__ == "__main__":
+    from src.config import GRID_FILE
+    from src.data.loader import load_data
+
+    data = load_data()
+    model = CostModel(data)
+    grid = build_grid(data, model)
+    if not write_grid(GRID_FILE, grid):
+        raise SystemExit(f"Could not write {GRID_FILE}")
+    print(f"[OK] {GRID_FILE.name} written ({GRID_FILE.stat().st_size / 1e6:.1f} MB, "
+          f"digest {grid.digest[:12]})")
@@ -0,0 +1,284 @@
+"""
+src/data/interpolation.py
+=========================
+Prebuilt linear interpolators for the Part 2 lookup tables.
+
+An Interpolator holds contiguous read-only float64 x / y arrays and the
+slope of its last segment, so a call is one np.interp plus, above the table,
+one multiply-add — no DataFrame access and no coercion.  Calls accept a
+scalar (returns float) or an array of any shape (returns an array of the
+same shape), so batch sweeps interpolate millions of points in one numpy
+call.
+
+Semantics match the module-level helpers in src.data.processing:
+
+  battery   clamped at both ends (interpolate_battery_cost())
+  tds/depth clamped below the table, linearly extrapolated above it with
+            the slope of the last two rows (interpolate_energy())
+
+build_interpolators() builds all three from a load_data() dict; callers
+build them once per data version (see src.layout.charts._current()).
+
+The sliders only produce discrete values (battery in BATTERY_SLIDER_STEP,
+TDS in 100-PPM and depth in 1-m steps), so the loader also materializes
+each interpolation over its slider domain (build_dense_tables()) and stores
+the tables in the data dict — and therefore in the data snapshot.  With
+DENSE_LOOKUPS on, build_interpolators() wraps them in DenseLookup: an
+on-step value is a single array index, anything else falls back to the
+Interpolator.
+
+Exports
+-------
+Interpolator                          — callable x → y lookup
+DenseLookup                           — Interpolator materialized per slider step
+LookupInterpolators                   — (battery, tds, depth) interpolators
+DENSE_DOMAINS                         — lookup name → (slider step, step count)
+slider_index(value, step, count) -> int | None
+build_dense_tables(data) -> dict[str, dict]
+dense_table(data, name, dense=DENSE_LOOKUPS) -> np.ndarray | None
+build_interpolators(data, dense=DENSE_LOOKUPS) -> LookupInterpolators
+"""
+
+from __future__ import annotations
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    BATTERY_SLIDER_STEP,
+    DENSE_LOOKUPS,
+    DEPTH_SLIDER_MAX,
+    DEPTH_SLIDER_STEP,
+    TDS_SLIDER_MAX,
+    TDS_SLIDER_STEP,
+)
+from src.data.normalize import float_column
+
+# Lookup name → (slider step, number of steps from 0) of its dense table.
+DENSE_DOMAINS: dict[str, tuple[float, int]] = {
+    "battery": (BATTERY_SLIDER_STEP, int(round(1 / BATTERY_SLIDER_STEP)) + 1),
+    "tds":     (TDS_SLIDER_STEP, TDS_SLIDER_MAX // TDS_SLIDER_STEP + 1),
+    "depth":   (DEPTH_SLIDER_STEP, DEPTH_SLIDER_MAX // DEPTH_SLIDER_STEP + 1),
+}
+
+# Largest distance (in steps) from a slider step still treated as on it.
+_STEP_TOLERANCE = 1e-6
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Interpolator
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _frozen(values) -> np.ndarray:
+    """Contiguous float64 read-only view of *values* (no copy when possible)."""
+    view = np.ascontiguousarray(values, dtype=float).view()
+    view.flags.writeable = False
+    return view
+
+
+class Interpolator:
+    """Piecewise-linear lookup y(x) over a sorted table.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Table rows; *x* must be increasing.
+    extrapolate : bool, optional
+        True (default) extends the last segment above the table; False
+        clamps there as well.  Below the table values are always clamped.
+
+    Attributes
+    ----------
+    x, y : np.ndarray
+        Contiguous read-only float64 table columns.
+    slope : float
+        Slope used above the table (0.0 when clamping or with < 2 rows).
+    """
+
+    __slots__ = ("x", "y", "slope", "extrapolate", "_x_max", "_y_max")
+
+    def __init__(self, x, y, extrapolate: bool = True):
+        self.x = _frozen(x)
+        self.y = _frozen(y)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError(f"x and y must be 1-D and equal length, got {self.x.shape} and {self.y.shape}")
+        self.extrapolate = bool(extrapolate) and len(self.x) >= 2
+        self.slope = (
+            float((self.y[-1] - self.y[-2]) / (self.x[-1] - self.x[-2])) if self.extrapolate else 0.0
+        )
+        self._x_max = float(self.x[-1]) if len(self.x) else 0.0
+        self._y_max = float(self.y[-1]) if len(self.y) else 0.0
+
+    @classmethod
+    def from_lookup(cls, df: pd.DataFrame, col_x: str, col_y: str, extrapolate: bool = True) -> "Interpolator":
+        """Build from two columns of a lookup DataFrame."""
+        return cls(float_column(df, col_x), float_column(df, col_y), extrapolate)
+
+    def __call__(self, values):
+        """Interpolate *values*: float for a scalar, ndarray for an array."""
+        if np.ndim(values) == 0:
+            value = float(values)
+            if self.extrapolate and value > self._x_max:
+                return self._y_max + self.slope * (value - self._x_max)
+            return float(np.interp(value, self.x, self.y))
+        values = np.asarray(values, dtype=float)
+        result = np.interp(values, self.x, self.y)
+        if self.extrapolate:
+            above = values > self._x_max
+            if above.any():
+                result = np.where(above, self._y_max + self.slope * (values - self._x_max), result)
+        return result
+
+    def __repr__(self) -> str:
+        return f"Interpolator(n={len(self.x)}, extrapolate={self.extrapolate})"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dense slider-step tables
+# ──────────────────────────────────────────────────────────────────────────────
+
+def slider_index(value: float, step: float, count: int) -> int | None:
+    """Index of *value* on the grid 0, step, … (count points), or None if off-grid."""
+    position = value / step
+    if not math.isfinite(position):
+        return None
+    index = int(round(position))
+    if abs(position - index) > _STEP_TOLERANCE or not 0 <= index < count:
+        return None
+    return index
+
+
+class DenseLookup:
+    """An Interpolator evaluated once at every slider step.
+
+    Parameters
+    ----------
+    interpolator : Interpolator
+        Exact lookup, used for values that are not on a slider step.
+    step : float
+        Slider step; entry i of *values* is interpolator(i * step).
+    values : array-like
+        The materialized table (see build_dense_tables()).
+
+    Calls take a scalar or an array, like Interpolator.
+    """
+
+    __slots__ = ("interpolator", "step", "values", "_entries")
+
+    def __init__(self, interpolator: Interpolator, step: float, values):
+        self.interpolator = interpolator
+        self.step = float(step)
+        self.values = _frozen(values)
+        # Python floats for the scalar path: indexing a list avoids creating
+        # a numpy scalar per call.
+        self._entries = self.values.tolist()
+
+    @classmethod
+    def build(cls, interpolator: Interpolator, step: float, count: int) -> "DenseLookup":
+        """Materialize *interpolator* at 0, step, …, (count - 1) * step."""
+        return cls(interpolator, step, interpolator(np.arange(count) * step))
+
+    def __call__(self, values):
+        """Table entry for on-step values, interpolation for the rest."""
+        count = len(self._entries)
+        if isinstance(values, (int, float)) or np.ndim(values) == 0:
+            index = slider_index(float(values), self.step, count)
+            if index is not None:
+                return self._entries[index]
+            return self.interpolator(values)
+        values = np.asarray(values, dtype=float)
+        position = values / self.step
+        index = np.rint(position)
+        hit = (np.abs(position - index) <= _STEP_TOLERANCE) & (index >= 0) & (index < count)
+        if hit.all():
+            return self.values[index.astype(np.intp)]
+        result = np.empty(values.shape)
+        result[hit] = self.values[index[hit].astype(np.intp)]
+        result[~hit] = self.interpolator(values[~hit])
+        return result
+
+    def __repr__(self) -> str:
+        return f"DenseLookup(step={self.step}, n={len(self.values)}, {self.interpolator!r})"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Lookup tables of a data version
+# ──────────────────────────────────────────────────────────────────────────────
+
+class LookupInterpolators(NamedTuple):
+    """Interpolators (or DenseLookups) for the three Part 2 lookup tables."""
+
+    battery: Interpolator   # battery_fraction → total_cost (USD), clamped
+    tds: Interpolator       # tds_ppm → ro_energy_kw, extrapolated above
+    depth: Interpolator     # depth_m → pump_energy_kw, extrapolated above
+
+
+def _exact_interpolators(data: dict) -> LookupInterpolators:
+    return LookupInterpolators(
+        battery=Interpolator.from_lookup(
+            data["battery_lookup"], "battery_fraction", "total_cost", extrapolate=False,
+        ),
+        tds=Interpolator.from_lookup(data["tds_lookup"], "tds_ppm", "ro_energy_kw"),
+        depth=Interpolator.from_lookup(data["depth_lookup"], "depth_m", "pump_energy_kw"),
+    )
+
+
+def build_dense_tables(data: dict) -> dict[str, dict]:
+    """Materialize every lookup over its slider domain (DENSE_DOMAINS).
+
+    Called by the loader so the tables are stored under
+    data["dense_lookups"] and in the data snapshot.  Each table carries the
+    (step, count) it was built for, so dense_table() can reject one built
+    under a different slider configuration.
+
+    Returns
+    -------
+    dict[str, dict]
+        {"battery", "tds", "depth"} → {"domain": (step, count),
+        "values": float64 array, one entry per step}.
+    """
+    exact = _exact_interpolators(data)._asdict()
+    return {
+        name: {
+            "domain": (step, count),
+            "values": DenseLookup.build(exact[name], step, count).values,
+        }
+        for name, (step, count) in DENSE_DOMAINS.items()
+    }
+
+
+def dense_table(data: dict, name: str, dense: bool = DENSE_LOOKUPS) -> np.ndarray | None:
+    """The stored dense table of lookup *name*, or None.
+
+    None when *dense* is off, the data carries no tables (e.g. a hand-built
+    dict) or the table was built for another (step, count) than
+    DENSE_DOMAINS — e.g. a snapshot written before a slider step changed.
+    """
+    if not dense:
+        return None
+    entry = (data.get("dense_lookups") or {}).get(name)
+    if not isinstance(entry, dict) or tuple(entry.get("domain", ())) != DENSE_DOMAINS[name]:
+        return None
+    table = entry.get("values")
+    if table is None or len(table) != DENSE_DOMAINS[name][1]:
+        return None
+    return table
+
+
+def build_interpolators(data: dict, dense: bool = DENSE_LOOKUPS) -> LookupInterpolators:
+    """Build the battery / TDS / depth interpolators for a load_data() dict.
+
+    With *dense* (DENSE_LOOKUPS by default) each interpolator with a stored
+    table (dense_table()) is wrapped in a DenseLookup; the rest stay plain
+    Interpolators.
+    """
+    wrapped = {}
+    for name, interpolator in _exact_interpolators(data)._asdict().items():
+        table = dense_table(data, name, dense)
+        if table is not None:
+            interpolator = DenseLookup(interpolator, DENSE_DOMAINS[name][0], table)
+        wrapped[name] = interpolator
+    return LookupInterpolators(**wrapped)
@@ -18,15 +18,39 @@ An "Energy" sheet provides per-subsystem shaft power, drive type, drivetrain
 efficiency, and selected turbine size for all three systems.
 
 Non-numeric values ("indefinite", "~15 tons", "$ 2500 per ton", etc.) are
-stored as-is.  No coercion is performed here; downstream modules handle it.
+read as-is; normalize_data() (src/data/normalize.py) then converts the
+numeric columns to typed arrays once and keeps the original values in *_raw
+display columns.  The lookup interpolations are materialized per slider
+step at the same time (build_dense_tables(), src/data/interpolation.py),
+and the scorecard metrics and comparison text are derived from the BOM
+tables (build_derived_metrics(), src/data/derived.py).
+
+The workbook is opened in openpyxl read-only mode and each sheet is read in
+a single ``iter_rows(values_only=True)`` pass; rows are dispatched to the
+section, battery, Part 2 and Energy parsers by a small state machine.
+
+Parsed results are cached in a versioned binary snapshot (src/data/snapshot.py)
+so later process starts skip openpyxl entirely while data.xlsx is unchanged.
+openpyxl is therefore imported lazily, only when the workbook must be parsed.
+
+Every load stage is timed into data_load_stage_seconds and table sizes are
+reported as data_load_rows gauges (src/metrics.py, served at /metrics with
+METRICS=1) — energy counts Energy sheet subsystem rows, 0 when the sheet is
+absent.  The only line printed per load is the snapshot hit / write summary.
 """
 
+import itertools
+from collections.abc import Iterable
 from pathlib import Path
 
-import openpyxl
 import pandas as pd
 
-from src.config import DATA_FILE
+from src.config import DATA_FILE, SNAPSHOT_FILE
+from src.data.derived import build_derived_metrics
+from src.data.interpolation import build_dense_tables
+from src.data.normalize import normalize_data
+from src.data.snapshot import read_snapshot, workbook_key, write_snapshot
+from src.metrics import metrics, stage
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Constants
@@ -63,86 +87,128 @@ BATTERY_COLUMNS = [
 TDS_LOOKUP_COLUMNS = ["tds_ppm", "ro_energy_kw"]
 DEPTH_LOOKUP_COLUMNS = ["depth_m", "pump_energy_kw"]
 
+# Part 1 columns (1-based) for the equipment sections.  The electrical section
+# uses col E (total cost); mechanical and hybrid use col D (cost).  Lifespan
+# is always the column immediately after the cost column.
+SECTION_COST_COLS: dict[str, int] = {
+    "electrical": 5,
+    "mechanical": 4,
+    "hybrid":     4,
+}
+
+# Fixed location of the battery/tank lookup table in Part 1 (L4:R14).
+_BATTERY_ROWS = range(4, 15)       # rows 4–14 inclusive (11 data rows)
+_BATTERY_FIRST_COL = 12            # col L
+
+# Fixed location of the Part 2 lookup tables (rows 2–21, 20 data rows).
+_PART2_FIRST_ROW = 2
+_PART2_LAST_ROW = 21
+
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Private helpers
+# Private helpers — row parsers
+#
+# Every parser consumes an iterable of values-only row tuples, exactly as
+# produced by ``ws.iter_rows(values_only=True)`` on a read-only worksheet.
+# Each sheet is read in a single forward pass; rows are dispatched to the
+# section / battery / Part 2 / Energy logic by a small state machine instead
+# of random-access ``ws.cell(r, c)`` lookups, so memory stays flat and the
+# cost grows linearly with the number of rows.
 # ──────────────────────────────────────────────────────────────────────────────
 
-def _parse_section(ws, header_row: int, stop_rows: set, cost_col: int = 4) -> list[dict]:
+def _cell(row: tuple, col: int):
+    """Return the value in 1-based column *col* of a values-only row tuple.
+
+    Read-only worksheets trim trailing empty cells, so columns past the end
+    of the tuple are treated as blank (None).
     """
-    Parse equipment rows starting immediately after *header_row*.
+    return row[col - 1] if col <= len(row) else None
+
 
-    Iteration stops when:
-      - The current row number is in *stop_rows* (start of next section), OR
-      - Column B value is ``None`` (blank cell, including merged-cell spillover).
+def _rows_parsed(table: str, rows: int) -> None:
+    """Report the size of a parsed table as the data_load_rows{table} gauge."""
+    metrics.set("data_load_rows", rows, {"table": table})
 
-    Rows where column B value is ``"Total"`` are silently skipped (they are
-    section summary rows, not equipment data).
+
+def _parse_part1(rows: Iterable[tuple]) -> tuple[dict[str, list[dict]], pd.DataFrame]:
+    """
+    Parse the equipment sections and battery lookup from 'Part 1' in one pass.
+
+    State machine over the rows of column B:
+
+      - A row whose column B value is a SECTION_HEADERS key switches the
+        current section (this also ends the previous one).
+      - Inside a section, a blank column B (None, including merged-cell
+        spillover) ends the section; rows stay unassigned until the next
+        header.
+      - ``"Total"`` rows are section summary rows and are skipped.
+      - Any other row inside a section is an equipment row.
+
+    Independently of the section state, rows 4–14 contribute their L:R cells
+    to the battery/tank lookup table.
 
     Parameters
     ----------
-    ws : openpyxl.worksheet.worksheet.Worksheet
-    header_row : int
-        1-based row number of the section header ("Electrical Components", etc.)
-    stop_rows : set[int]
-        Row numbers that mark the start of the *next* section (or end boundary).
-    cost_col : int
-        1-based column index for the cost_usd value.
-        Electrical section uses col 5 (E = total cost).
-        Mechanical and hybrid sections use col 4 (D = cost).
-        Lifespan is always the column immediately after cost_col.
+    rows : Iterable[tuple]
+        Values-only rows of 'Part 1', starting at row 1.
 
     Returns
     -------
-    list[dict]
-        One dict per equipment row, keys matching EQUIPMENT_COLUMNS.
+    tuple[dict[str, list[dict]], pd.DataFrame]
+        (sections, battery_df)
+        sections maps each canonical key found ("electrical", "mechanical",
+        "hybrid") to its list of equipment row dicts (keys matching
+        EQUIPMENT_COLUMNS).  battery_df has columns matching BATTERY_COLUMNS.
     """
-    rows = []
-    for r in range(header_row + 1, ws.max_row + 1):
-        if r in stop_rows:
-            break
-        name = ws.cell(r, 2).value
-        # None means blank (or merged-cell note row) — stop scanning.
+    sections: dict[str, list[dict]] = {}
+    battery_rows: dict[int, dict] = {}
+    current: str | None = None
+    cost_col = 4
+
+    for r, row in enumerate(rows, start=1):
+        # ── Battery lookup (fixed cell range, independent of sections) ─────
+        if r in _BATTERY_ROWS:
+            battery_rows[r] = {
+                column: _cell(row, _BATTERY_FIRST_COL + offset)
+                for offset, column in enumerate(BATTERY_COLUMNS)
+            }
+
+        name = _cell(row, 2)
+
+        # ── Section header row ─────────────────────────────────────────────
+        if name in SECTION_HEADERS:
+            current = SECTION_HEADERS[name]
+            cost_col = SECTION_COST_COLS[current]
+            sections[current] = []
+            continue
+
+        if current is None:
+            continue
+
+        # None means blank (or merged-cell note row) — end of this section.
         if name is None:
-            break
+            current = None
+            continue
         # Skip section-total summary rows.
         if name == "Total":
             continue
-        rows.append({
+        sections[current].append({
             "name":           name,
-            "quantity":       ws.cell(r, 3).value,
-            "cost_usd":       ws.cell(r, cost_col).value,
-            "lifespan_years": ws.cell(r, cost_col + 1).value,
+            "quantity":       _cell(row, 3),
+            "cost_usd":       _cell(row, cost_col),
+            "lifespan_years": _cell(row, cost_col + 1),
         })
-    return rows
 
+    # Sheets shorter than row 14 leave the missing lookup rows blank.
+    empty = dict.fromkeys(BATTERY_COLUMNS)
+    battery_df = pd.DataFrame(
+        [battery_rows.get(r, empty) for r in _BATTERY_ROWS],
+        columns=BATTERY_COLUMNS,
+    )
+    return sections, battery_df
 
-def _parse_battery_lookup(ws) -> pd.DataFrame:
-    """
-    Parse the battery/tank lookup table from the fixed range L3:R14.
 
-    Header labels are at row 3 (cols L-R); data occupies rows 4-14
-    (11 rows: battery_fraction 0.0 to 1.0 in 0.1 steps).
-
-    Returns
-    -------
-    pd.DataFrame  with columns matching BATTERY_COLUMNS
-    """
-    rows = []
-    for r in range(4, 15):   # rows 4–14 inclusive
-        rows.append({
-            "battery_fraction": ws.cell(r, 12).value,
-            "tank_fraction":    ws.cell(r, 13).value,
-            "battery_kwh":      ws.cell(r, 14).value,
-            "tank_gal":         ws.cell(r, 15).value,
-            "battery_cost":     ws.cell(r, 16).value,
-            "tank_cost":        ws.cell(r, 17).value,
-            "total_cost":       ws.cell(r, 18).value,
-        })
-    return pd.DataFrame(rows, columns=BATTERY_COLUMNS)
-
-
-def _parse_part2_lookups(wb) -> tuple[pd.DataFrame, pd.DataFrame]:
+def _parse_part2_lookups(rows: Iterable[tuple]) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Parse both lookup tables from the 'Part 2' sheet.
 
@@ -151,6 +217,12 @@ def _parse_part2_lookups(wb) -> tuple[pd.DataFrame, pd.DataFrame]:
                        col D="Depth", col E="kW required (pump energy)"
       Rows 2-21: 20 data rows for each table (values 0-1900 in 100-unit steps)
 
+    Parameters
+    ----------
+    rows : Iterable[tuple]
+        Values-only rows 2-21 of 'Part 2'.  Missing trailing rows are
+        treated as blank.
+
     Returns
     -------
     tuple[pd.DataFrame, pd.DataFrame]
@@ -158,34 +230,28 @@ def _parse_part2_lookups(wb) -> tuple[pd.DataFrame, pd.DataFrame]:
         tds_df columns:   ["tds_ppm", "ro_energy_kw"]
         depth_df columns: ["depth_m", "pump_energy_kw"]
     """
-    if "Part 2" not in wb.sheetnames:
-        raise ValueError(
-            f"Expected sheet 'Part 2' not found. "
-            f"Available sheets: {wb.sheetnames}"
-        )
-    ws2 = wb["Part 2"]
-
+    n_rows = _PART2_LAST_ROW - _PART2_FIRST_ROW + 1
     tds_rows = []
     depth_rows = []
-    for r in range(2, 22):   # rows 2-21 inclusive (20 data rows)
+    for row in itertools.islice(itertools.chain(rows, itertools.repeat(())), n_rows):
         tds_rows.append({
-            "tds_ppm":      ws2.cell(r, 1).value,   # col A
-            "ro_energy_kw": ws2.cell(r, 2).value,   # col B
+            "tds_ppm":      _cell(row, 1),   # col A
+            "ro_energy_kw": _cell(row, 2),   # col B
         })
         depth_rows.append({
-            "depth_m":        ws2.cell(r, 4).value, # col D
-            "pump_energy_kw": ws2.cell(r, 5).value, # col E
+            "depth_m":        _cell(row, 4), # col D
+            "pump_energy_kw": _cell(row, 5), # col E
         })
 
     tds_df   = pd.DataFrame(tds_rows,   columns=TDS_LOOKUP_COLUMNS)
     depth_df = pd.DataFrame(depth_rows, columns=DEPTH_LOOKUP_COLUMNS)
 
-    print(f"  [loader] TDS lookup:   {len(tds_df)} rows parsed")
-    print(f"  [loader] Depth lookup: {len(depth_df)} rows parsed")
+    _rows_parsed("tds_lookup", len(tds_df))
+    _rows_parsed("depth_lookup", len(depth_df))
     return tds_df, depth_df
 
 
-def _parse_energy_sheet(wb) -> dict | None:
+def _parse_energy_sheet(rows: Iterable[tuple]) -> dict:
     """
     Parse the Energy sheet into a structured dict grouped by system.
 
@@ -203,6 +269,11 @@ def _parse_energy_sheet(wb) -> dict | None:
       E (5) = turbine_input_kw
       F (6) = notes
 
+    Parameters
+    ----------
+    rows : Iterable[tuple]
+        Values-only rows of the Energy sheet, starting at row 1.
+
     Returns
     -------
     dict with keys "mechanical", "electrical", "hybrid", each containing:
@@ -210,15 +281,7 @@ def _parse_energy_sheet(wb) -> dict | None:
         "total_shaft_power"   – float
         "total_turbine_input" – float  (total at turbine shaft before margin)
         "selected_turbine_kw" – float
-    Returns None if the Energy sheet is absent (power data falls back to
-    SUBSYSTEM_POWER constants in config.py).
     """
-    if "Energy" not in wb.sheetnames:
-        print("  [loader] Energy sheet not found — using config constants for power data")
-        return None
-
-    ws = wb["Energy"]
-
     # Canonical system header strings → internal keys
     SYSTEM_HEADER_MAP = {
         "Mechanical System": "mechanical",
@@ -246,8 +309,8 @@ def _parse_energy_sheet(wb) -> dict | None:
             "selected_turbine_kw": current_selected,
         }
 
-    for r in range(1, ws.max_row + 1):
-        label = ws.cell(r, 1).value
+    for row in rows:
+        label = _cell(row, 1)
         if label is None:
             continue
 
@@ -269,19 +332,19 @@ def _parse_energy_sheet(wb) -> dict | None:
 
         # ── Summary rows ───────────────────────────────────────────────────
         if label_str.startswith(SUMMARY_TOTAL_SHAFT):
-            val = ws.cell(r, 2).value
+            val = _cell(row, 2)
             if val is not None:
                 current_total_shaft = float(val)
             continue
 
         if label_str.startswith(SUMMARY_TOTAL_TURBINE):
-            val = ws.cell(r, 5).value
+            val = _cell(row, 5)
             if val is not None:
                 current_total_turbine = float(val)
             continue
 
         if label_str.startswith(SUMMARY_SELECTED):
-            val = ws.cell(r, 5).value
+            val = _cell(row, 5)
             if val is not None:
                 current_selected = float(val)
             continue
@@ -291,36 +354,136 @@ def _parse_energy_sheet(wb) -> dict | None:
             continue
 
         # ── Subsystem data row ─────────────────────────────────────────────
-        shaft_val   = ws.cell(r, 2).value
-        turbine_val = ws.cell(r, 5).value
+        shaft_val   = _cell(row, 2)
+        turbine_val = _cell(row, 5)
         current_subsystems.append({
             "name":                  label_str,
             "shaft_power_kw":        float(shaft_val)   if shaft_val   is not None else None,
-            "drive_type":            ws.cell(r, 3).value,
-            "drivetrain_efficiency": ws.cell(r, 4).value,
+            "drive_type":            _cell(row, 3),
+            "drivetrain_efficiency": _cell(row, 4),
             "turbine_input_kw":      float(turbine_val) if turbine_val is not None else None,
-            "notes":                 ws.cell(r, 6).value,
+            "notes":                 _cell(row, 6),
         })
 
     # Flush the last system
     if current_system is not None:
         _flush(current_system)
 
-    print(f"  [loader] Energy sheet: {list(result.keys())} systems parsed")
+    _rows_parsed("energy", sum(len(system["subsystems"]) for system in result.values()))
     return result
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Workbook parser
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _parse_workbook(path: Path) -> dict:
+    """
+    Parse data.xlsx at *path* into the data dict returned by load_data().
+
+    This is the cold path: it imports openpyxl and opens the workbook in
+    read-only streaming mode, making exactly one ``iter_rows(values_only=True)``
+    pass over each sheet.  See load_data() for the structure of the returned
+    dict and the exceptions raised.
+    """
+    import openpyxl
+
+    # ── 1. Open workbook (streaming, cached values only) ─────────────────────
+    with stage("open_workbook"):
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        # ── 1b. Parse Part 2 lookup tables ───────────────────────────────────
+        if "Part 2" not in wb.sheetnames:
+            raise ValueError(
+                f"Expected sheet 'Part 2' not found. "
+                f"Available sheets: {wb.sheetnames}"
+            )
+        with stage("part2_lookups"):
+            tds_df, depth_df = _parse_part2_lookups(
+                wb["Part 2"].iter_rows(
+                    min_row=_PART2_FIRST_ROW, max_row=_PART2_LAST_ROW, values_only=True
+                )
+            )
+
+        if "Part 1" not in wb.sheetnames:
+            raise ValueError(
+                f"Expected sheet 'Part 1' not found. "
+                f"Available sheets: {wb.sheetnames}"
+            )
+
+        # ── 2. Parse equipment sections and battery lookup (single pass) ─────
+        with stage("part1_sections"):
+            sections, battery_df = _parse_part1(wb["Part 1"].iter_rows(values_only=True))
+
+        # ── 3. Validate all sections present ─────────────────────────────────
+        required = {"electrical", "mechanical", "hybrid"}
+        missing = required - set(sections.keys())
+        if missing:
+            raise ValueError(
+                f"Missing section(s) in 'Part 1': {sorted(missing)}. "
+                f"Found: {sorted(sections.keys())}. "
+                "Check that data.xlsx has not been modified."
+            )
+
+        for system in ("electrical", "mechanical", "hybrid"):
+            _rows_parsed(system, len(sections[system]))
+        _rows_parsed("battery_lookup", len(battery_df))
+
+        # ── 4. Parse Energy sheet ────────────────────────────────────────────
+        if "Energy" in wb.sheetnames:
+            with stage("energy_sheet"):
+                energy_data = _parse_energy_sheet(wb["Energy"].iter_rows(values_only=True))
+        else:
+            # Callers fall back to the config constants for power data.
+            _rows_parsed("energy", 0)
+            energy_data = None
+    finally:
+        # Read-only workbooks keep the underlying zip file open until closed.
+        wb.close()
+
+    with stage("normalize"):
+        data = normalize_data({
+            "electrical":    pd.DataFrame(sections["electrical"], columns=EQUIPMENT_COLUMNS),
+            "mechanical":    pd.DataFrame(sections["mechanical"], columns=EQUIPMENT_COLUMNS),
+            "hybrid":        pd.DataFrame(sections["hybrid"],     columns=EQUIPMENT_COLUMNS),
+            "battery_lookup": battery_df,
+            "tds_lookup":    tds_df,
+            "depth_lookup":  depth_df,
+            "energy":        energy_data,
+        })
+    with stage("dense_lookups"):
+        data["dense_lookups"] = build_dense_tables(data)
+    with stage("derived_metrics"):
+        data["derived_metrics"] = build_derived_metrics(data)
+    return data
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Public API
 # ──────────────────────────────────────────────────────────────────────────────
 
-def load_data() -> dict:
+def load_data(use_snapshot: bool = True) -> dict:
     """
     Load and parse data.xlsx, returning BOM DataFrames plus energy data.
 
     Sections are located by scanning column B of Part 1 for known header
-    strings.  Values are stored as-is from the Excel cells — no numeric
-    coercion is applied.
+    strings.  Numeric columns are normalized once (normalize_data()):
+    annotated cells such as "~15 tons" or "$ 2500 per ton" are parsed into
+    magnitude, unit and qualifier; quantity / cost_usd are float64 (per-unit
+    prices become line costs), lifespan_years is int64 with 0 for
+    "indefinite", and the original cell values are kept in quantity_raw,
+    cost_usd_raw and lifespan_years_raw for display.  Lookup tables are
+    float64.
+
+    When *use_snapshot* is True (the default) the binary snapshot at
+    SNAPSHOT_FILE is tried first.  It is used only if it was written from a
+    workbook with the same size, mtime and content hash; otherwise the
+    workbook is parsed and the snapshot is (re)written for the next start.
+
+    Parameters
+    ----------
+    use_snapshot : bool, optional
+        Set False to force a cold parse of data.xlsx and skip writing the
+        snapshot (used by the loader benchmark).
 
     Returns
     -------
@@ -336,6 +499,12 @@ def load_data() -> dict:
                            total_turbine_input, and selected_turbine_kw.
                            May be None if the Energy sheet is absent from data.xlsx;
                            callers should fall back to SUBSYSTEM_POWER from config.py.
+        "dense_lookups"  – dict {"battery", "tds", "depth"} → {"domain": (step,
+                           count), "values": float64 array of the lookup
+                           interpolated at every slider step}
+                           (build_dense_tables(), src/data/interpolation.py).
+        "derived_metrics" – scorecard metrics, RAG colors and comparison text
+                           (build_derived_metrics(), src/data/derived.py).
 
     Raises
     ------
@@ -352,64 +521,23 @@ def load_data() -> dict:
             "Ensure the file is in the project root directory."
         )
 
-    # ── 2. Open workbook ─────────────────────────────────────────────────────
-    wb = openpyxl.load_workbook(DATA_FILE, data_only=True)
-
-    # ── 2b. Parse Part 2 lookup tables ──────────────────────────────────────
-    tds_df, depth_df = _parse_part2_lookups(wb)
-
-    if "Part 1" not in wb.sheetnames:
-        raise ValueError(
-            f"Expected sheet 'Part 1' not found. "
-            f"Available sheets: {wb.sheetnames}"
-        )
-    ws = wb["Part 1"]
-
-    # ── 3. Scan for section header rows ──────────────────────────────────────
-    section_row_map: dict[str, int] = {}
-    for row in ws.iter_rows(min_col=2, max_col=2):
-        cell = row[0]
-        if cell.value in SECTION_HEADERS:
-            canonical_key = SECTION_HEADERS[cell.value]
-            section_row_map[canonical_key] = cell.row
-            print(f"  [loader] Found section '{cell.value}' at row {cell.row}")
-
-    # ── 4. Validate all sections present ─────────────────────────────────────
-    required = {"electrical", "mechanical", "hybrid"}
-    missing = required - set(section_row_map.keys())
-    if missing:
-        raise ValueError(
-            f"Missing section(s) in 'Part 1': {sorted(missing)}. "
-            f"Found: {sorted(section_row_map.keys())}. "
-            "Check that data.xlsx has not been modified."
-        )
-
-    # ── 5. Parse equipment sections ──────────────────────────────────────────
-    elec_start   = section_row_map["electrical"]
-    mech_start   = section_row_map["mechanical"]
-    hybrid_start = section_row_map["hybrid"]
-
-    electrical_rows = _parse_section(ws, elec_start,   stop_rows={mech_start},   cost_col=5)
-    mechanical_rows = _parse_section(ws, mech_start,   stop_rows={hybrid_start}, cost_col=4)
-    hybrid_rows     = _parse_section(ws, hybrid_start, stop_rows=set(),           cost_col=4)
-
-    print(f"  [loader] Electrical: {len(electrical_rows)} equipment rows parsed")
-    print(f"  [loader] Mechanical: {len(mechanical_rows)} equipment rows parsed")
-    print(f"  [loader] Hybrid:     {len(hybrid_rows)} equipment rows parsed")
-
-    # ── 6. Parse battery/tank lookup ─────────────────────────────────────────
-    battery_df = _parse_battery_lookup(ws)
-    print(f"  [loader] Battery lookup: {len(battery_df)} rows parsed")
-
-    # ── 7. Parse Energy sheet ─────────────────────────────────────────────────
-    energy_data = _parse_energy_sheet(wb)
-
-    return {
-        "electrical":    pd.DataFrame(electrical_rows, columns=EQUIPMENT_COLUMNS),
-        "mechanical":    pd.DataFrame(mechanical_rows, columns=EQUIPMENT_COLUMNS),
-        "hybrid":        pd.DataFrame(hybrid_rows,     columns=EQUIPMENT_COLUMNS),
-        "battery_lookup": battery_df,
-        "tds_lookup":    tds_df,
-        "depth_lookup":  depth_df,
-        "energy":        energy_data,
-    }
+    if not use_snapshot:
+        with stage("parse_workbook"):
+            return _parse_workbook(DATA_FILE)
+
+    # ── 2. Try the compiled snapshot ─────────────────────────────────────────
+    with stage("snapshot_read"):
+        key = workbook_key(DATA_FILE)
+        cached = read_snapshot(SNAPSHOT_FILE, key)
+    if cached is not None:
+        print(f"  [loader] Snapshot hit: {SNAPSHOT_FILE.name} (sha256 {key['sha256'][:12]})")
+        return cached
+
+    # ── 3. Cold parse, then write the snapshot for the next start ────────────
+    with stage("parse_workbook"):
+        data = _parse_workbook(DATA_FILE)
+    with stage("snapshot_write"):
+        written = write_snapshot(SNAPSHOT_FILE, key, data)
+    if written:
+        print(f"  [loader] Snapshot written: {SNAPSHOT_FILE.name}")
+    return data
@@ -0,0 +1,191 @@
+"""
+src/data/normalize.py
+=====================
+Typed columnar normalization of the parsed workbook tables.
+
+The parser stores cell values as-is, so equipment columns mix numbers with
+strings such as "~15 tons", "$ 2500 per ton" and "indefinite".  Parsing
+them on every call is the dominant cost of the numeric helpers, so
+load_data() runs normalize_data() once and the snapshot stores the typed
+result.  Cells are read with the unit-aware parser in src.data.units:
+
+  quantity             float64 magnitude ("~15 tons" → 15.0); NaN if none
+  cost_usd             float64 line cost in USD; a price per unit
+                       ("$ 2500 per ton") is multiplied by the quantity
+                       when the quantity is in that unit (or unitless),
+                       otherwise NaN; an amount in a non-currency unit
+                       ("5 kW", "12 years") is NaN
+  lifespan_years       int64 whole years, missing cells filled from
+                       LIFESPAN_DEFAULTS; LIFESPAN_INDEFINITE (0) for
+                       "indefinite", unparseable and non-positive values
+  quantity_unit, quantity_qualifier, cost_unit, cost_qualifier
+                       categorical parse results (PARSED_COLUMNS)
+  *_raw                the original cell values, kept for display
+
+Lookup tables become all-float64.  Both normalizers are idempotent, so
+processing code calls normalize_equipment() on whatever it is given —
+loaded data passes straight through and hand-built DataFrames (tests,
+notebooks) are normalized on the fly.
+
+Exports
+-------
+LIFESPAN_INDEFINITE                — lifespan sentinel: bought once, never replaced
+RAW_COLUMNS                        — typed column → raw display column
+PARSED_COLUMNS                     — categorical unit / qualifier columns
+normalize_equipment(df) -> DataFrame
+normalize_lookup(df) -> DataFrame
+normalize_data(data) -> dict       — apply both to a load_data() dict
+line_costs(cost, cost_unit, quantity, quantity_unit) -> np.ndarray
+is_normalized(df) -> bool
+float_column(df, col) -> np.ndarray
+raw_value(row, col)                — original cell value of a typed column
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.config import LIFESPAN_DEFAULTS
+from src.data.units import is_rate, parse_column
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Constants
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Lifespan value for items purchased once at year 0 and never replaced.
+LIFESPAN_INDEFINITE = 0
+
+# Typed column → column holding the original cell values.
+RAW_COLUMNS: dict[str, str] = {
+    "quantity":       "quantity_raw",
+    "cost_usd":       "cost_usd_raw",
+    "lifespan_years": "lifespan_years_raw",
+}
+
+# Unit / qualifier columns added by normalize_equipment().
+PARSED_COLUMNS = ("quantity_unit", "quantity_qualifier", "cost_unit", "cost_qualifier")
+
+_EQUIPMENT_SECTIONS = ("electrical", "mechanical", "hybrid")
+_LOOKUP_SECTIONS = ("battery_lookup", "tds_lookup", "depth_lookup")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────────────────
+
+def is_normalized(df: pd.DataFrame) -> bool:
+    """True when *df* already went through normalize_equipment()."""
+    columns = df.columns
+    return (all(raw in columns for raw in RAW_COLUMNS.values())
+            and all(col in columns for col in PARSED_COLUMNS))
+
+
+def float_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Column *col* as a float64 array; non-numeric values become NaN.
+
+    Numeric columns (the normalized case) are returned without coercion.
+    """
+    series = df[col]
+    if series.dtype.kind in "fiu":
+        return series.to_numpy(dtype=float)
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+
+
+def parse_lifespans(names: pd.Series, raw: pd.Series) -> np.ndarray:
+    """Parse raw lifespan cells into whole years.
+
+    Rules:
+    - Missing values (None / NaN) fall back to LIFESPAN_DEFAULTS by name.
+    - "indefinite", unparseable strings, and non-positive values become
+      LIFESPAN_INDEFINITE.
+    - Numbers, including annotated ones such as "~20 years", are truncated
+      to whole years (int(float(x))).
+
+    Returns
+    -------
+    np.ndarray
+        int64 array, shape (len(raw),).
+    """
+    filled = raw.where(raw.notna(), names.map(LIFESPAN_DEFAULTS))
+    magnitude, _, _ = parse_column(filled)
+    years = np.trunc(magnitude)
+    return np.where(np.isfinite(years) & (years > 0), years, LIFESPAN_INDEFINITE).astype(np.int64)
+
+
+def line_costs(cost: np.ndarray, cost_unit: pd.Categorical,
+               quantity: np.ndarray, quantity_unit: pd.Categorical) -> np.ndarray:
+    """Line costs in USD from parsed cost and quantity columns.
+
+    Plain amounts (no unit) pass through.  A price per unit ("/ton") is
+    multiplied by the quantity when the quantity is in that unit or has no
+    unit; any other combination cannot be priced and gives NaN.  A cost in
+    any other unit ("5 kW", "12 years") is not a dollar amount and is NaN.
+
+    Returns
+    -------
+    np.ndarray
+        float64 array, shape (len(cost),).
+    """
+    cost_units = np.asarray(cost_unit, dtype=object)
+    quantity_units = np.asarray(quantity_unit, dtype=object)
+    out = cost.astype(float, copy=True)
+    for i in np.flatnonzero(cost_units != ""):
+        unit = cost_units[i]
+        if is_rate(unit) and quantity_units[i] in ("", unit[1:]):
+            out[i] = cost[i] * quantity[i]
+        else:
+            out[i] = np.nan
+    return out
+
+
+def normalize_equipment(df: pd.DataFrame) -> pd.DataFrame:
+    """Return *df* with typed quantity / cost_usd / lifespan_years columns.
+
+    The original values move to the RAW_COLUMNS display columns and the
+    parsed units / qualifiers to PARSED_COLUMNS; any other columns are kept
+    unchanged.  Already-normalized frames are returned as-is (no copy).
+    """
+    if is_normalized(df):
+        return df
+    out = df.copy()
+    for col, raw_col in RAW_COLUMNS.items():
+        out[raw_col] = df[col]
+    quantity, quantity_unit, quantity_qualifier = parse_column(df["quantity"])
+    cost, cost_unit, cost_qualifier = parse_column(df["cost_usd"])
+    out["quantity"] = quantity
+    out["cost_usd"] = line_costs(cost, cost_unit, quantity, quantity_unit)
+    out["quantity_unit"] = quantity_unit
+    out["quantity_qualifier"] = quantity_qualifier
+    out["cost_unit"] = cost_unit
+    out["cost_qualifier"] = cost_qualifier
+    out["lifespan_years"] = parse_lifespans(df["name"], df["lifespan_years"])
+    return out
+
+
+def normalize_lookup(df: pd.DataFrame) -> pd.DataFrame:
+    """Return *df* with every column as float64 (non-numeric cells → NaN)."""
+    if all(dtype == np.float64 for dtype in df.dtypes):
+        return df
+    return pd.DataFrame({col: float_column(df, col) for col in df.columns}, index=df.index)
+
+
+def normalize_data(data: dict) -> dict:
+    """Apply normalize_equipment() / normalize_lookup() to a load_data() dict."""
+    out = dict(data)
+    for key in _EQUIPMENT_SECTIONS:
+        out[key] = normalize_equipment(data[key])
+    for key in _LOOKUP_SECTIONS:
+        out[key] = normalize_lookup(data[key])
+    return out
+
+
+def raw_value(row: pd.Series, col: str):
+    """Original cell value of *col* in an equipment row (for display).
+
+    Falls back to the column itself for rows of un-normalized frames.
+    """
+    raw_col = RAW_COLUMNS.get(col)
+    if raw_col is not None and raw_col in row.index:
+        return row[raw_col]
+    return row.get(col)
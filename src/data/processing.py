@@ -8,13 +8,24 @@ Provides:
   - RAG (Red / Amber / Green) color assignment logic (rag_color)
   - Scorecard metric aggregation from raw DataFrames (compute_scorecard_metrics)
   - Process-stage lookup for equipment items (get_equipment_stage)
-  - Energy interpolation against Part 2 lookup tables (interpolate_energy)
+  - Energy interpolation against Part 2 lookup tables (interpolate_energy);
+    callers that interpolate repeatedly pass prebuilt LookupInterpolators
+    (src/data/interpolation.py)
+  - Precompiled replacement-schedule cost model (CostModel) built once from
+    load_data() output so slider queries are array slices, not DataFrame scans
   - Aggregate chart data computation (compute_chart_data(data, battery_fraction,
     years, tds_ppm, depth_m)) — applies TDS and depth energy offsets from Part 2
-    lookup tables; hybrid data read directly from data["hybrid"] BOM
+    lookup tables; hybrid data read directly from data["hybrid"] BOM.  Split into
+    compute_cost_chart_data() and compute_energy_chart_data() for callbacks that
+    only need one half
+  - Vectorized scenario sweeps over arrays of slider values
+    (compute_chart_data_batch)
+  - JSON scenario tables for the clientside slider mode (build_scenario_tables)
 
 This module is a pure data/logic layer. It does NOT import from any layout
-or UI module. All formatting uses pandas for safe numeric coercion.
+or UI module.  Numeric code reads the typed columns from normalize_equipment()
+(src/data/normalize.py); formatters only fall back to pandas coercion for
+values that are not already numbers.
 """
 
 from __future__ import annotations
@@ -22,12 +33,41 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
-from src.config import PROCESS_STAGES, RAG_COLORS, SUBSYSTEM_POWER, LIFESPAN_DEFAULTS, DRIVETRAIN_EFFICIENCY, LCOW_DENOMINATOR_KGAL
+from src.config import (
+    RAG_COLORS, SUBSYSTEM_POWER, DRIVETRAIN_EFFICIENCY, LCOW_DENOMINATOR_KGAL,
+    BATTERY_SLIDER_STEP,
+)
+from src.data.interpolation import (
+    DenseLookup, Interpolator, LookupInterpolators, build_interpolators, dense_table,
+)
+from src.data.normalize import float_column, normalize_equipment
+from src.data.stages import OTHER_STAGE, STAGE_BY_NAME
+
+# Electrical BOM row whose cost is replaced by the battery/tank slider value.
+# Research Pitfall 1: the spreadsheet battery row != lookup table values — the
+# slider-interpolated cost replaces it rather than being added on top.
+BATTERY_ITEM_NAME = "Battery (Tesla Megapack 3.9MWh unit)"
+
+# Default projection horizon (years) for the precompiled CostModel; matches
+# the maximum of the time horizon slider.
+DEFAULT_HORIZON_YEARS = 50
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Formatting helpers
 # ──────────────────────────────────────────────────────────────────────────────
 
+def _to_float(value) -> float:
+    """*value* as a float, NaN when it is not numeric.
+
+    Plain numbers (the normalized-column case) skip pd.to_numeric; other
+    values are coerced exactly as pd.to_numeric(errors="coerce") does.
+    """
+    if isinstance(value, (float, int, np.floating, np.integer)) and not isinstance(value, bool):
+        return float(value)
+    numeric = pd.to_numeric(value, errors="coerce")
+    return float("nan") if pd.isna(numeric) else float(numeric)
+
+
 def fmt_sig2(value) -> str:
     """Format a numeric value to 2 significant figures.
 
@@ -59,10 +99,9 @@ def fmt_sig2(value) -> str:
     """
     if value is None:
         return "N/A"
-    numeric = pd.to_numeric(value, errors="coerce")
-    if pd.isna(numeric):
+    v = _to_float(value)
+    if np.isnan(v):
         return str(value)
-    v = float(numeric)
     if v == 0:
         return "0"
     # Python's f-string with .2g gives 2 significant figures
@@ -83,7 +122,8 @@ def fmt_cost(value) -> str:
       - < 1,000       →  "$XXX"    (2 significant figures)
       - Non-numeric or None → "N/A"
 
-    Uses pd.to_numeric with errors='coerce' for safe conversion.
+    Numbers are used directly; anything else is coerced as pd.to_numeric
+    with errors='coerce' would.
 
     Parameters
     ----------
@@ -94,10 +134,9 @@ def fmt_cost(value) -> str:
     -------
     str
     """
-    numeric = pd.to_numeric(value, errors="coerce")
-    if pd.isna(numeric):
+    v = _to_float(value)
+    if np.isnan(v):
         return "N/A"
-    v = float(numeric)
     if v >= 1_000_000:
         return f"${fmt_sig2(v / 1_000_000)}M"
     if v >= 1_000:
@@ -121,10 +160,10 @@ def fmt_num(value) -> str:
     """
     if value is None:
         return "N/A"
-    numeric = pd.to_numeric(value, errors="coerce")
-    if pd.isna(numeric):
+    v = _to_float(value)
+    if np.isnan(v):
         return str(value)
-    return f"{float(numeric):,.1f}"
+    return f"{v:,.1f}"
 
 
 def fmt(value) -> str:
@@ -145,9 +184,9 @@ def fmt(value) -> str:
     """
     if value is None:
         return "N/A"
-    numeric = pd.to_numeric(value, errors="coerce")
-    if not pd.isna(numeric):
-        return f"{float(numeric):,.0f}"
+    v = _to_float(value)
+    if not np.isnan(v):
+        return f"{v:,.0f}"
     return str(value)
 
 
@@ -224,9 +263,10 @@ def compute_scorecard_metrics(
 ) -> dict[str, dict[str, float]]:
     """Compute aggregate scorecard metrics for each system.
 
-    Numeric aggregation uses pd.to_numeric with errors='coerce' so that
-    non-numeric strings (e.g. "$ 2500 per ton", "indefinite") are safely
-    treated as NaN and excluded from the sum.
+    Costs are summed from the typed cost_usd column (see
+    src/data/normalize.py), where per-unit prices (e.g. "$ 2500 per ton")
+    are already line costs and unparseable cells are NaN and excluded from
+    the sum.
 
     Parameters
     ----------
@@ -247,7 +287,7 @@ def compute_scorecard_metrics(
         }
     """
     def _aggregate(df: pd.DataFrame, system_key: str) -> dict[str, float]:
-        cost = float(pd.to_numeric(df["cost_usd"], errors="coerce").sum())
+        cost = float(np.nansum(normalize_equipment(df)["cost_usd"].to_numpy()))
         return {
             "cost":                  cost,
             "drivetrain_efficiency": DRIVETRAIN_EFFICIENCY.get(system_key, float("nan")),
@@ -297,12 +337,10 @@ def generate_comparison_text(
 
     def _pct_diff(hybrid_val, other_val, metric_key: str) -> str | None:
         """Return a sentence comparing hybrid to other, or None if undetermined."""
-        h = pd.to_numeric(hybrid_val, errors="coerce")
-        o = pd.to_numeric(other_val, errors="coerce")
-        if pd.isna(h) or pd.isna(o) or o == 0:
+        h_f = _to_float(hybrid_val)
+        o_f = _to_float(other_val)
+        if np.isnan(h_f) or np.isnan(o_f) or o_f == 0:
             return None
-        h_f = float(h)
-        o_f = float(o)
         label = metric_labels[metric_key]
         pct = abs((h_f - o_f) / o_f) * 100
         if abs(h_f - o_f) < 0.001 * o_f:
@@ -331,9 +369,9 @@ def generate_comparison_text(
 def get_equipment_stage(equipment_name: str, system: str) -> str:
     """Look up the process stage for an equipment item.
 
-    Iterates over the PROCESS_STAGES mapping for the given system and returns
-    the stage name that contains *equipment_name*. Returns "Other" if the item
-    is not found in any stage for the specified system.
+    Looks *equipment_name* up in the PROCESS_STAGES mapping for the given
+    system (indexed by name in src.data.stages.STAGE_BY_NAME). Returns "Other"
+    if the item is not found in any stage for the specified system.
 
     Parameters
     ----------
@@ -347,11 +385,7 @@ def get_equipment_stage(equipment_name: str, system: str) -> str:
     str
         Stage name (e.g. "Pre-Treatment") or "Other" if not found.
     """
-    system_stages = PROCESS_STAGES.get(system, {})
-    for stage_name, items in system_stages.items():
-        if equipment_name in items:
-            return stage_name
-    return "Other"
+    return STAGE_BY_NAME.get(system, {}).get(equipment_name, OTHER_STAGE)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -377,9 +411,10 @@ def interpolate_battery_cost(battery_fraction: float, battery_lookup_df: pd.Data
     float
         Interpolated total_cost (battery_cost + tank_cost) in USD.
     """
-    fractions = pd.to_numeric(battery_lookup_df["battery_fraction"], errors="coerce").values
-    costs = pd.to_numeric(battery_lookup_df["total_cost"], errors="coerce").values
-    return float(np.interp(battery_fraction, fractions, costs))
+    interpolator = Interpolator.from_lookup(
+        battery_lookup_df, "battery_fraction", "total_cost", extrapolate=False,
+    )
+    return float(interpolator(battery_fraction))
 
 
 def interpolate_energy(value: float, lookup_df: pd.DataFrame, col_x: str, col_y: str) -> float:
@@ -407,12 +442,7 @@ def interpolate_energy(value: float, lookup_df: pd.DataFrame, col_x: str, col_y:
     float
         Interpolated or extrapolated energy in kW.
     """
-    x_vals = pd.to_numeric(lookup_df[col_x], errors="coerce").values
-    y_vals = pd.to_numeric(lookup_df[col_y], errors="coerce").values
-    if value > x_vals[-1] and len(x_vals) >= 2:
-        slope = (y_vals[-1] - y_vals[-2]) / (x_vals[-1] - x_vals[-2])
-        return float(y_vals[-1] + slope * (value - x_vals[-1]))
-    return float(np.interp(value, x_vals, y_vals))
+    return float(Interpolator.from_lookup(lookup_df, col_x, col_y)(value))
 
 
 def battery_ratio_label(battery_fraction: float) -> str:
@@ -433,11 +463,79 @@ def battery_ratio_label(battery_fraction: float) -> str:
     return f"{pct_batt}% Battery / {pct_tank}% Tank"
 
 
+def _parse_lifespans(df: pd.DataFrame) -> np.ndarray:
+    """Integer lifespans of an equipment DataFrame (0 = never replaced).
+
+    Reads the typed lifespan_years column produced by normalize_equipment()
+    (shared by compute_cost_over_time and CostModel); un-normalized frames
+    are normalized first.  See src.data.normalize.parse_lifespans() for the
+    rules.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Equipment DataFrame with columns: name, lifespan_years.
+
+    Returns
+    -------
+    np.ndarray
+        Integer lifespans in years, shape (len(df),). 0 means never replaced.
+    """
+    return normalize_equipment(df)["lifespan_years"].to_numpy(dtype=np.int64)
+
+
+def _purchase_events(lifespan_steps: np.ndarray, n_steps: int) -> np.ndarray:
+    """Build the (items × n_steps+1) purchase-event matrix by broadcasting.
+
+    Entry [i, t] is True when item i is bought at step t: every step that is a
+    multiple of its lifespan, or only step 0 when the lifespan is 0.
+
+    Parameters
+    ----------
+    lifespan_steps : np.ndarray
+        Integer lifespans expressed in steps, shape (n_items,). 0 = bought once.
+    n_steps : int
+        Last step covered; the matrix has n_steps+1 columns.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of shape (n_items, n_steps+1).
+    """
+    t = np.arange(n_steps + 1)
+    period = np.where(lifespan_steps > 0, lifespan_steps, n_steps + 1)[:, None]
+    return (t[None, :] % period) == 0
+
+
+def _replacement_counts(lifespans: np.ndarray, horizon: int) -> np.ndarray:
+    """Cumulative purchase-count matrix for a set of item lifespans.
+
+    Entry [i, t] is the number of times item i has been bought from year 0
+    through year t — the event matrix from _purchase_events() summed along
+    the time axis.
+
+    Parameters
+    ----------
+    lifespans : np.ndarray
+        Integer lifespans in years, shape (n_items,). 0 means never replaced.
+    horizon : int
+        Last year covered; the matrix has horizon+1 columns.
+
+    Returns
+    -------
+    np.ndarray
+        Float array of shape (n_items, horizon+1).
+    """
+    return np.cumsum(_purchase_events(lifespans, horizon), axis=1, dtype=float)
+
+
 def compute_cost_over_time(
     df: pd.DataFrame,
     years: int = 50,
     override_costs: dict | None = None,
-) -> np.ndarray:
+    steps_per_year: int = 1,
+    per_item: bool = False,
+) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
     """Compute a cumulative cost array over a time horizon for a system DataFrame.
 
     For each equipment row:
@@ -447,52 +545,271 @@ def compute_cost_over_time(
     - override_costs replaces the cost for named equipment (used for battery
       slider interpolation).
 
+    Vectorized: costs and lifespans are parsed once per call (see
+    _parse_lifespans()), and no Python loop runs over rows or years.  The total
+    is accumulated from a sparse event list — one strided add per distinct
+    lifespan — so long horizons at fine resolution stay cheap.  When
+    *per_item* is requested, the full (items × steps+1) purchase-event matrix
+    is built by broadcasting and cumulatively summed along the time axis.
+
     Parameters
     ----------
     df : pd.DataFrame
         Equipment DataFrame with columns: name, cost_usd, lifespan_years.
     years : int
-        Number of years to project (inclusive). Resulting array has length years+1.
+        Number of years to project (inclusive). Resulting array has length
+        years * steps_per_year + 1.
     override_costs : dict | None
         Dict of {equipment_name: cost_usd} overrides. None means no overrides.
+        Rows with a non-numeric cost are skipped even when overridden.
+    steps_per_year : int, optional
+        Time resolution: 1 (default) for yearly steps, 12 for monthly.
+    per_item : bool, optional
+        When True, also return the per-item cumulative series.
 
     Returns
     -------
     np.ndarray
-        Cumulative cost array of shape (years+1,). Index i is the total cost
-        incurred from year 0 through year i.
+        Cumulative cost array of shape (years*steps_per_year+1,). Index i is
+        the total cost incurred from step 0 through step i.
+    tuple[np.ndarray, np.ndarray]
+        When per_item=True: (total, items), where items has shape
+        (len(df), years*steps_per_year+1) in DataFrame row order (rows with a
+        non-numeric cost are all zeros).
     """
-    annual = np.zeros(years + 1)
+    n_steps = int(years) * int(steps_per_year)
+
+    df = normalize_equipment(df)
+    costs = df["cost_usd"].to_numpy(dtype=float)
+    valid = ~np.isnan(costs)
+    if override_costs:
+        override = df["name"].map(override_costs).to_numpy(dtype=float)
+        costs = np.where(valid & ~np.isnan(override), override, costs)
+    costs = np.where(valid, costs, 0.0)
+
+    lifespan_steps = _parse_lifespans(df) * int(steps_per_year)
+
+    if per_item:
+        events = _purchase_events(lifespan_steps, n_steps)
+        items = np.cumsum(events * costs[:, None], axis=1)
+        return items.sum(axis=0), items
+
+    # Sparse event list: items sharing a lifespan share a purchase schedule,
+    # so each distinct lifespan contributes one strided add of its cost sum.
+    purchases = np.zeros(n_steps + 1)
+    unique_steps, group = np.unique(lifespan_steps, return_inverse=True)
+    group_costs = np.bincount(group.ravel(), weights=costs, minlength=len(unique_steps))
+    for step, group_cost in zip(unique_steps, group_costs):
+        if step > 0:
+            purchases[::step] += group_cost
+        else:
+            purchases[0] += group_cost
+    return np.cumsum(purchases)
 
-    for _, row in df.iterrows():
-        cost = pd.to_numeric(row["cost_usd"], errors="coerce")
-        if pd.isna(cost):
-            continue
 
-        # Apply override if provided (e.g. battery slider replacement cost)
-        if override_costs is not None and row["name"] in override_costs:
-            cost = override_costs[row["name"]]
+# ──────────────────────────────────────────────────────────────────────────────
+# Precompiled cost model
+# ──────────────────────────────────────────────────────────────────────────────
+
+class CostModel:
+    """Replacement-schedule cost model compiled once from load_data() output.
 
-        lifespan = row["lifespan_years"]
+    Each system's BOM is reduced to a per-item cost vector and a
+    lifespan-derived replacement-count matrix (see _replacement_counts()).
+    Their product — the cumulative cost curve out to *horizon* years — is
+    precomputed, so a (years, battery_fraction) query is a slice plus one
+    scaled vector for the electrical battery row.  No DataFrame is touched
+    after construction.
 
-        # Fallback: if xlsx has no lifespan data, use config defaults
-        if lifespan is None:
-            lifespan = LIFESPAN_DEFAULTS.get(row["name"], "indefinite")
+    Attributes
+    ----------
+    horizon : int
+        Longest time horizon (years) the model can answer.
+    costs : dict[str, np.ndarray]
+        Per-item cost vector for each system (rows with non-numeric cost are
+        dropped, as in compute_cost_over_time()).
+    counts : dict[str, np.ndarray]
+        Replacement-count matrix for each system, shape (n_items, horizon+1).
+    buffer : np.ndarray
+        Flat read-only float64 block backing every array above (see _pack()).
+    battery_interpolator : Interpolator or DenseLookup
+        Clamped battery_fraction → storage cost lookup over views of *buffer*;
+        a DenseLookup over the stored per-step table (data["dense_lookups"])
+        when DENSE_LOOKUPS is on.
+    """
 
-        # "indefinite" items are bought once at year 0 — no replacements
-        if isinstance(lifespan, str) and lifespan.strip().lower() == "indefinite":
-            annual[0] += cost
-        else:
-            try:
-                lifespan_int = int(float(lifespan))
-            except (TypeError, ValueError):
-                # Unparseable lifespan — treat as indefinite (year 0 only)
-                annual[0] += cost
-                continue
-            for yr in range(0, years + 1, lifespan_int):
-                annual[yr] += cost
+    def __init__(self, data: dict, horizon: int = DEFAULT_HORIZON_YEARS):
+        self.horizon = int(horizon)
+        self.costs: dict[str, np.ndarray] = {}
+        self.counts: dict[str, np.ndarray] = {}
+        self._cumulative: dict[str, np.ndarray] = {}
+
+        for sys_key in ("mechanical", "electrical", "hybrid"):
+            df = normalize_equipment(data[sys_key])
+            costs = df["cost_usd"].to_numpy(dtype=float)
+            keep = ~np.isnan(costs)
+            self.costs[sys_key] = costs[keep]
+            self.counts[sys_key] = _replacement_counts(_parse_lifespans(df)[keep], self.horizon)
+
+            if sys_key == "electrical":
+                # The battery row is excluded from the base curve; its counts
+                # are kept separately and scaled by the slider cost per query.
+                is_battery = (df["name"] == BATTERY_ITEM_NAME).to_numpy()[keep]
+                base_costs = np.where(is_battery, 0.0, self.costs[sys_key])
+                self._battery_counts = (
+                    self.counts[sys_key][is_battery].sum(axis=0)
+                    if is_battery.any() else np.zeros(self.horizon + 1)
+                )
+                self._cumulative[sys_key] = base_costs @ self.counts[sys_key]
+            else:
+                self._cumulative[sys_key] = self.costs[sys_key] @ self.counts[sys_key]
+
+        # Electrical base cost for the live readout: every row except the
+        # battery (non-numeric costs count as 0, matching a skipna sum).
+        elec_df = normalize_equipment(data["electrical"])
+        elec_costs = elec_df["cost_usd"].to_numpy(dtype=float)
+        self.elec_base_cost = float(
+            np.nansum(elec_costs[(elec_df["name"] != BATTERY_ITEM_NAME).to_numpy()])
+        )
+
+        battery_lookup = data["battery_lookup"]
+        self._battery_fractions = float_column(battery_lookup, "battery_fraction")
+        self._battery_costs = float_column(battery_lookup, "total_cost")
+        dense = dense_table(data, "battery")
+        self._battery_dense = np.asarray(dense if dense is not None else (), dtype=float)
+        self._pack()
+        self.battery_interpolator = Interpolator(
+            self._battery_fractions, self._battery_costs, extrapolate=False,
+        )
+        if self._battery_dense.size:
+            self.battery_interpolator = DenseLookup(
+                self.battery_interpolator, BATTERY_SLIDER_STEP, self._battery_dense,
+            )
+
+    def _pack(self) -> None:
+        """Move every numeric array into one flat, read-only float64 buffer.
+
+        The attributes become views into ``self.buffer``.  A CostModel built
+        in the gunicorn master before fork (preload_app) then occupies one
+        contiguous block that workers share copy-on-write; making it
+        read-only guarantees no worker dirties those pages by accident.
+        """
+        arrays = [
+            *self.costs.values(), *self.counts.values(), *self._cumulative.values(),
+            self._battery_counts, self._battery_fractions, self._battery_costs,
+            self._battery_dense,
+        ]
+        self.buffer = np.empty(sum(a.size for a in arrays), dtype=float)
+        offset = 0
+
+        def _view(array: np.ndarray) -> np.ndarray:
+            nonlocal offset
+            view = self.buffer[offset:offset + array.size].reshape(array.shape)
+            view[...] = array
+            view.flags.writeable = False
+            offset += array.size
+            return view
+
+        for table in (self.costs, self.counts, self._cumulative):
+            for key in table:
+                table[key] = _view(table[key])
+        self._battery_counts = _view(self._battery_counts)
+        self._battery_fractions = _view(self._battery_fractions)
+        self._battery_costs = _view(self._battery_costs)
+        self._battery_dense = _view(self._battery_dense)
+        self.buffer.flags.writeable = False
+
+    def battery_cost(self, battery_fraction: float) -> float:
+        """Interpolated storage cost (USD) — same result as interpolate_battery_cost()."""
+        return float(self.battery_interpolator(battery_fraction))
+
+    def battery_costs(self, battery_fraction: np.ndarray) -> np.ndarray:
+        """Array form of battery_cost() for many slider values."""
+        return self.battery_interpolator(np.asarray(battery_fraction, dtype=float))
+
+    def cost_over_time(self, years: int, battery_fraction: float) -> dict[str, np.ndarray]:
+        """Cumulative cost arrays for all three systems.
+
+        Parameters
+        ----------
+        years : int
+            Time horizon; must not exceed self.horizon.
+        battery_fraction : float
+            Battery/tank slider value used to price the electrical battery row.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            {"mechanical", "electrical", "hybrid"} → arrays of length years+1,
+            matching compute_cost_over_time() for the same inputs.
+        """
+        if years > self.horizon:
+            raise ValueError(f"years={years} exceeds CostModel horizon {self.horizon}")
+        end = years + 1
+        battery = self.battery_cost(battery_fraction)
+        return {
+            "mechanical": self._cumulative["mechanical"][:end],
+            "electrical": self._cumulative["electrical"][:end] + battery * self._battery_counts[:end],
+            "hybrid":     self._cumulative["hybrid"][:end],
+        }
+
+    def electrical_total_cost(self, battery_fraction: float) -> float:
+        """Electrical BOM total with the battery row priced from the slider."""
+        return self.elec_base_cost + self.battery_cost(battery_fraction)
 
-    return np.cumsum(annual)
+    def to_tables(self) -> dict:
+        """JSON-ready arrays that reproduce cost_over_time() without numpy.
+
+        electrical(t) = cumulative["electrical"][t]
+                        + battery_cost(f) * battery_counts[t]
+        where battery_cost(f) is a clamped linear interpolation of
+        battery_lookup["y"] over battery_lookup["x"].
+        """
+        return {
+            "horizon": self.horizon,
+            "cumulative": {k: v.tolist() for k, v in self._cumulative.items()},
+            "battery_counts": self._battery_counts.tolist(),
+            "battery_lookup": {
+                "x": self._battery_fractions.tolist(),
+                "y": self._battery_costs.tolist(),
+            },
+            "elec_base_cost": self.elec_base_cost,
+        }
+
+    def cost_over_time_batch(
+        self, years: np.ndarray, battery_fraction: np.ndarray
+    ) -> dict[str, np.ndarray]:
+        """Cumulative cost tensors for many (years, battery_fraction) scenarios.
+
+        Parameters
+        ----------
+        years : np.ndarray of int, shape (n,)
+            Time horizon per scenario; the maximum must not exceed self.horizon.
+        battery_fraction : np.ndarray of float, shape (n,)
+            Battery/tank slider value per scenario.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            {"mechanical", "electrical", "hybrid"} → arrays of shape
+            (n, years.max()+1).  Row i matches cost_over_time(years[i],
+            battery_fraction[i]) and is NaN past years[i].
+        """
+        max_years = int(years.max()) if years.size else 0
+        if max_years > self.horizon:
+            raise ValueError(f"years={max_years} exceeds CostModel horizon {self.horizon}")
+        end = max_years + 1
+        battery = self.battery_costs(battery_fraction)
+        beyond = np.arange(end)[None, :] > years[:, None]
+
+        out = {}
+        for sys_key in ("mechanical", "electrical", "hybrid"):
+            tensor = np.broadcast_to(self._cumulative[sys_key][:end], (len(years), end)).copy()
+            if sys_key == "electrical":
+                tensor += battery[:, None] * self._battery_counts[None, :end]
+            tensor[beyond] = np.nan
+            out[sys_key] = tensor
+        return out
 
 
 def compute_chart_data(
@@ -501,12 +818,18 @@ def compute_chart_data(
     years: int = 50,
     tds_ppm: float = 950,
     depth_m: float = 950,
+    cost_model: CostModel | None = None,
+    interpolators: LookupInterpolators | None = None,
 ) -> dict:
     """Aggregate all chart data for the comparison charts section.
 
     This is the primary aggregation function called by the chart callback.
     It returns pre-computed arrays and scalars so that callbacks remain fast
-    (no DataFrame iteration inside callbacks).
+    (no DataFrame iteration inside callbacks).  Callbacks pass a CostModel
+    compiled once per data load (and LookupInterpolators built alongside it);
+    without them, both are built on the fly.
+    The cost and energy halves are independent (compute_cost_chart_data()
+    and compute_energy_chart_data()) so callbacks can compute them separately.
 
     Hybrid data is read directly from data["hybrid"] — a pre-defined BOM
     loaded from data.xlsx (not user-assembled via slot dropdowns).
@@ -529,6 +852,11 @@ def compute_chart_data(
         Water source depth in metres from the depth slider (default 950).
         Used to interpolate pump_energy_kw from data["depth_lookup"] and add it
         to the "Water Extraction" stage in both mech_energy and elec_energy.
+    cost_model : CostModel or None, optional
+        Precompiled model for *data*.  Rebuilt here when None or when its
+        horizon is shorter than *years*.
+    interpolators : LookupInterpolators or None, optional
+        Prebuilt lookup interpolators for *data*; built here when None.
 
     Returns
     -------
@@ -543,36 +871,62 @@ def compute_chart_data(
         electrical_total_cost : float
             Live electrical total cost at current battery_fraction (USD).
     """
-    mechanical_df = data["mechanical"]
-    electrical_df = data["electrical"]
-    hybrid_df = data["hybrid"]
-    battery_lookup = data["battery_lookup"]
-
-    # ── Battery interpolation ─────────────────────────────────────────────────
-    interpolated_cost = interpolate_battery_cost(battery_fraction, battery_lookup)
-
-    # ── Cost over time ────────────────────────────────────────────────────────
-    # Mechanical: straightforward cumulative replacement model
-    mech_cumulative = compute_cost_over_time(mechanical_df, years)
-
-    # Electrical: exclude the spreadsheet battery row and replace with the
-    # slider-interpolated cost so all replacement cycles use the current slider
-    # value (year 0, 12, 24, 36, 48).
-    # Research Pitfall 1: the $1.8M battery row != lookup table values — don't add both.
-    elec_cumulative = compute_cost_over_time(
-        electrical_df,
-        years,
-        override_costs={"Battery (Tesla Megapack 3.9MWh unit)": interpolated_cost},
-    )
+    return {
+        **compute_cost_chart_data(data, battery_fraction, years, cost_model=cost_model),
+        **compute_energy_chart_data(data, tds_ppm, depth_m, interpolators=interpolators),
+    }
+
+
+def compute_cost_chart_data(
+    data: dict,
+    battery_fraction: float = 0.5,
+    years: int = 50,
+    cost_model: CostModel | None = None,
+) -> dict:
+    """Cost half of compute_chart_data(): depends only on years and battery_fraction.
+
+    Returns
+    -------
+    dict with keys:
+        cost_over_time : dict[str, np.ndarray]
+            {"mechanical": array, "electrical": array, "hybrid": array}
+            Each array has length years+1 (cumulative cost per year).
+        electrical_total_cost : float
+            Live electrical total cost at current battery_fraction (USD).
+    """
+    if cost_model is None or years > cost_model.horizon:
+        cost_model = CostModel(data, horizon=max(years, DEFAULT_HORIZON_YEARS))
+
+    # The electrical battery row is priced from the slider-interpolated cost for
+    # every replacement cycle; mechanical and hybrid read directly from the BOM.
+    return {
+        "cost_over_time": cost_model.cost_over_time(years, battery_fraction),
+        "electrical_total_cost": cost_model.electrical_total_cost(battery_fraction),
+    }
+
+
+def compute_energy_chart_data(
+    data: dict,
+    tds_ppm: float = 950,
+    depth_m: float = 950,
+    interpolators: LookupInterpolators | None = None,
+) -> dict:
+    """Energy half of compute_chart_data(): depends only on tds_ppm and depth_m.
 
-    # Hybrid: read directly from data["hybrid"] BOM
-    hybrid_cumulative = compute_cost_over_time(hybrid_df, years)
+    *interpolators* are the prebuilt lookups for *data*; built here when None.
 
-    # ── Energy breakdown: 3-subsystem model from config constants ────────────
+    Returns
+    -------
+    dict with key:
+        energy_breakdown : dict[str, dict[str, float]]
+            {"mechanical": {subsystem: kw, ...}, "electrical": {...}, "hybrid": {...}}
+    """
     # All three systems share the same shaft power demands. Slider offsets
     # modify "RO Desalination" (TDS) and "Groundwater Extraction" (depth).
-    ro_kw = interpolate_energy(tds_ppm, data["tds_lookup"], "tds_ppm", "ro_energy_kw")
-    pump_kw = interpolate_energy(depth_m, data["depth_lookup"], "depth_m", "pump_energy_kw")
+    if interpolators is None:
+        interpolators = build_interpolators(data)
+    ro_kw = float(interpolators.tds(tds_ppm))
+    pump_kw = float(interpolators.depth(depth_m))
 
     energy_breakdown = {}
     for sys_key in ["mechanical", "electrical", "hybrid"]:
@@ -581,22 +935,161 @@ def compute_chart_data(
         energy["Groundwater Extraction"] += pump_kw
         energy_breakdown[sys_key] = energy
 
-    # ── Electrical total cost (live readout for slider label) ─────────────────
-    # Sum all electrical costs EXCLUDING the battery row, then add interpolated cost.
-    elec_base_cost = float(
-        pd.to_numeric(
-            electrical_df[electrical_df["name"] != "Battery (Tesla Megapack 3.9MWh unit)"]["cost_usd"],
-            errors="coerce",
-        ).sum()
+    return {"energy_breakdown": energy_breakdown}
+
+
+def compute_chart_data_batch(
+    data: dict,
+    years=50,
+    battery_fraction=0.5,
+    tds_ppm=950,
+    depth_m=950,
+    cost_model: CostModel | None = None,
+    interpolators: LookupInterpolators | None = None,
+) -> dict:
+    """Vectorized compute_chart_data() over arrays of slider parameters.
+
+    Intended for offline scenario sweeps: the four parameters are broadcast
+    against each other (scalars are allowed) and every scenario is evaluated
+    in one numpy pass instead of one compute_chart_data() call each.
+
+    Parameters
+    ----------
+    data : dict
+        Full data dict from load_data().
+    years : int or array-like of int
+        Time horizon per scenario (>= 0).
+    battery_fraction : float or array-like
+        Battery/tank slider value per scenario, 0.0-1.0.
+    tds_ppm : float or array-like
+        Source water salinity (PPM) per scenario.
+    depth_m : float or array-like
+        Water source depth (m) per scenario.
+    cost_model : CostModel or None, optional
+        Precompiled model for *data*; rebuilt when None or too short.
+    interpolators : LookupInterpolators or None, optional
+        Prebuilt lookup interpolators for *data*; built here when None.
+
+    Returns
+    -------
+    dict with keys:
+        years, battery_fraction, tds_ppm, depth_m : np.ndarray, shape (n,)
+            The broadcast, flattened scenario parameters.
+        cost_over_time : dict[str, np.ndarray]
+            {"mechanical", "electrical", "hybrid"} → shape (n, max(years)+1);
+            row i is the cumulative cost curve of scenario i, NaN past years[i].
+        energy_breakdown : dict[str, dict[str, np.ndarray]]
+            {system: {subsystem: kW array of shape (n,)}}.
+        electrical_total_cost : np.ndarray, shape (n,)
+
+    Raises
+    ------
+    ValueError
+        If the parameters cannot be broadcast together or a horizon is negative.
+    """
+    years, battery_fraction, tds_ppm, depth_m = (
+        np.ravel(a) for a in np.broadcast_arrays(
+            np.asarray(years), np.asarray(battery_fraction, dtype=float),
+            np.asarray(tds_ppm, dtype=float), np.asarray(depth_m, dtype=float),
+        )
     )
-    electrical_total_cost = elec_base_cost + interpolated_cost
+    years = years.astype(int)
+    if (years < 0).any():
+        raise ValueError("years must be >= 0")
+
+    max_years = int(years.max()) if years.size else 0
+    if cost_model is None or max_years > cost_model.horizon:
+        cost_model = CostModel(data, horizon=max(max_years, DEFAULT_HORIZON_YEARS))
+
+    cost_over_time = cost_model.cost_over_time_batch(years, battery_fraction)
+
+    if interpolators is None:
+        interpolators = build_interpolators(data)
+    ro_kw = interpolators.tds(tds_ppm)
+    pump_kw = interpolators.depth(depth_m)
+    energy_breakdown = {}
+    for sys_key in ["mechanical", "electrical", "hybrid"]:
+        energy = {name: np.full(len(years), kw) for name, kw in SUBSYSTEM_POWER.items()}
+        energy["RO Desalination"] += ro_kw
+        energy["Groundwater Extraction"] += pump_kw
+        energy_breakdown[sys_key] = energy
 
     return {
-        "cost_over_time": {
-            "mechanical": mech_cumulative,
-            "electrical": elec_cumulative,
-            "hybrid": hybrid_cumulative,
-        },
+        "years": years,
+        "battery_fraction": battery_fraction,
+        "tds_ppm": tds_ppm,
+        "depth_m": depth_m,
+        "cost_over_time": cost_over_time,
         "energy_breakdown": energy_breakdown,
-        "electrical_total_cost": electrical_total_cost,
+        "electrical_total_cost": cost_model.elec_base_cost + cost_model.battery_costs(battery_fraction),
+    }
+
+
+def build_scenario_tables(
+    data: dict,
+    battery_step: float = 0.001,
+    cost_model: CostModel | None = None,
+) -> dict:
+    """Compact, JSON-serializable tables for rebuilding chart data in the browser.
+
+    Cost and energy are separable, so the whole slider domain is covered by:
+    the per-system cumulative cost at the maximum horizon, the electrical
+    battery replacement-count vector (scaled by the interpolated storage cost),
+    the battery/TDS/depth lookup curves and the base subsystem power.  The
+    electrical total is pre-formatted for every battery slider step so the
+    browser does not need to reproduce fmt_cost().
+
+    Parameters
+    ----------
+    data : dict
+        Full data dict from load_data().
+    battery_step : float, optional
+        Battery slider step; one label is produced per step on [0, 1].
+    cost_model : CostModel or None, optional
+        Precompiled model for *data*; built here when None.
+
+    Returns
+    -------
+    dict with keys:
+        horizon, cumulative, battery_counts, battery_lookup, elec_base_cost
+            See CostModel.to_tables().
+        tds_lookup, depth_lookup : dict
+            {"x": [...], "y": [...]} energy curves; interpolate as
+            interpolate_energy() does (clamp below, extrapolate above).
+        subsystem_power : dict[str, float]
+            Base shaft power per subsystem (SUBSYSTEM_POWER).
+        battery_step : float
+        elec_cost_labels : list[[int, str]]
+            Run-length encoded fmt_cost() of the electrical total: each
+            [step, text] applies from battery fraction step * battery_step
+            up to the next entry.
+    """
+    if cost_model is None:
+        cost_model = CostModel(data)
+
+    def _curve(df: pd.DataFrame, col_x: str, col_y: str) -> dict:
+        return {
+            "x": float_column(df, col_x).tolist(),
+            "y": float_column(df, col_y).tolist(),
+        }
+
+    n_steps = int(round(1 / battery_step))
+    elec_totals = cost_model.elec_base_cost + cost_model.battery_costs(
+        np.arange(n_steps + 1) * battery_step
+    )
+
+    # Run-length encode: the formatted label only changes at a few steps.
+    labels = []
+    for step, total in enumerate(elec_totals):
+        text = fmt_cost(total)
+        if not labels or labels[-1][1] != text:
+            labels.append([step, text])
+
+    return {
+        **cost_model.to_tables(),
+        "tds_lookup": _curve(data["tds_lookup"], "tds_ppm", "ro_energy_kw"),
+        "depth_lookup": _curve(data["depth_lookup"], "depth_m", "pump_energy_kw"),
+        "subsystem_power": dict(SUBSYSTEM_POWER),
+        "battery_step": battery_step,
+        "elec_cost_labels": labels,
     }
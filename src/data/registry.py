@@ -0,0 +1,280 @@
+"""
+src/data/registry.py
+====================
+Central, versioned holder of the loaded workbook data.
+
+Every consumer (layout factories, callbacks, derived caches) reads the
+current DataSnapshot from the module-level ``registry`` instead of keeping
+its own copy.  A new load is validated first and then swapped in with one
+reference assignment under a lock, so a callback sees either the old or the
+new snapshot — never a mix.  Derived state (CostModel, chart caches) is
+keyed by DataSnapshot.version and rebuilt lazily when it changes.
+
+load_async() parses the workbook in a background thread so the web server
+can answer requests (loading page, readiness probe) before data is ready.
+
+An optional watcher thread polls data.xlsx (size + mtime) and re-parses it
+in the background when it changes, so cost updates go live without a worker
+restart.  A failed parse or validation keeps the previous snapshot.
+
+Under gunicorn with preload_app (gunicorn.conf.py) the startup snapshot is
+published once in the master; after_fork() restarts the threads in each
+worker, which inherits the snapshot copy-on-write.
+
+Exports
+-------
+DataSnapshot             — immutable (version, data, stamp, loaded_at) tuple
+validate_data(data)      — raise ValueError unless data looks like load_data() output
+DataRegistry             — publish / reload / load_async / current / status /
+                           start_watching / after_fork
+registry                 — process-wide DataRegistry instance
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import traceback
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Mapping, NamedTuple
+
+from src.config import DATA_FILE
+
+# Keys every published data dict must carry (see load_data()).
+_REQUIRED_KEYS = (
+    "electrical", "mechanical", "hybrid",
+    "battery_lookup", "tds_lookup", "depth_lookup",
+)
+_EQUIPMENT_COLUMNS = ("name", "quantity", "cost_usd", "lifespan_years")
+
+
+class DataSnapshot(NamedTuple):
+    """One immutable published version of the data.
+
+    ``data`` is a read-only mapping over the load_data() dict; the DataFrames
+    inside it are shared by all readers and must not be mutated.
+    """
+
+    version: int
+    data: Mapping
+    stamp: tuple[int, int] | None
+    loaded_at: float
+
+
+def _stat_stamp(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of *path*, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def validate_data(data: Mapping) -> None:
+    """Raise ValueError unless *data* has the shape load_data() produces."""
+    missing = [key for key in _REQUIRED_KEYS if key not in data]
+    if missing:
+        raise ValueError(f"Data is missing sections: {', '.join(missing)}")
+    for key in ("electrical", "mechanical", "hybrid"):
+        absent = [col for col in _EQUIPMENT_COLUMNS if col not in data[key].columns]
+        if absent:
+            raise ValueError(f"Section '{key}' is missing columns: {', '.join(absent)}")
+    for key in ("battery_lookup", "tds_lookup", "depth_lookup"):
+        if data[key].empty:
+            raise ValueError(f"Lookup table '{key}' is empty")
+
+
+class DataRegistry:
+    """Versioned, thread-safe holder of the current DataSnapshot.
+
+    Parameters
+    ----------
+    path : Path
+        Workbook watched by start_watching().
+    loader : callable, optional
+        Zero-argument function returning a fresh data dict; defaults to
+        src.data.loader.load_data (imported lazily).
+    """
+
+    def __init__(self, path: Path = DATA_FILE, loader: Callable[[], dict] | None = None):
+        self.path = Path(path)
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._snapshot: DataSnapshot | None = None
+        self._listeners: list[Callable[[DataSnapshot], None]] = []
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+        # (message, traceback) of the most recent failed reload, else None
+        self.last_error: tuple[str, str] | None = None
+        # Stamp of the last workbook that failed to load, so a broken file is
+        # not re-parsed on every poll.
+        self._failed_stamp: tuple[int, int] | None = None
+        # Set while load_async() is parsing the initial workbook.
+        self._loading = threading.Event()
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+
+    def current(self) -> DataSnapshot | None:
+        """Return the current snapshot, or None if nothing was published yet."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot (0 before the first publish)."""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else 0
+
+    def status(self) -> str:
+        """Return one of "ready", "loading", "error" or "empty".
+
+        "ready" once data is published; "loading" while load_async() runs;
+        "error" after a failed load with no data; "empty" before any load.
+        """
+        if self._snapshot is not None:
+            return "ready"
+        if self._loading.is_set():
+            return "loading"
+        return "error" if self.last_error is not None else "empty"
+
+    # ── Publishing ───────────────────────────────────────────────────────────
+
+    def add_listener(self, listener: Callable[[DataSnapshot], None]) -> None:
+        """Call *listener(snapshot)* after every successful publish.
+
+        Listeners only prepare derived state that is otherwise built lazily,
+        so one that raises is logged and skipped: the snapshot is already
+        live and the remaining listeners still run.
+        """
+        self._listeners.append(listener)
+
+    def publish(self, data: Mapping, stamp: tuple[int, int] | None = None) -> DataSnapshot:
+        """Validate *data* and atomically make it the current snapshot.
+
+        Raises
+        ------
+        ValueError
+            If validate_data() rejects *data*; the current snapshot is kept.
+        """
+        validate_data(data)
+        frozen = MappingProxyType(dict(data))
+        with self._lock:
+            snapshot = DataSnapshot(self.version + 1, frozen, stamp, time.time())
+            self._snapshot = snapshot
+        self.last_error = None
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception as exc:  # noqa: BLE001 — the new version is already live
+                name = getattr(listener, "__qualname__", repr(listener))
+                print(f"[registry] Listener {name} failed for data version "
+                      f"{snapshot.version}: {exc}")
+                traceback.print_exc()
+        return snapshot
+
+    def reload(self) -> bool:
+        """Re-parse the workbook and publish it; keep the old snapshot on failure.
+
+        Returns True when a new snapshot was published.
+        """
+        with self._reload_lock:
+            stamp = self.stamp()
+            try:
+                data = self._load()
+                self.publish(data, stamp)
+            except Exception as exc:  # noqa: BLE001 — any failure keeps serving old data
+                self.last_error = (str(exc), traceback.format_exc())
+                self._failed_stamp = stamp
+                print(f"[registry] Reload of {self.path.name} failed, keeping version "
+                      f"{self.version}: {exc}")
+                return False
+        print(f"[registry] Loaded {self.path.name} as data version {self.version}")
+        return True
+
+    def load_async(self) -> threading.Thread:
+        """Run reload() in a daemon thread; status() is "loading" until it ends."""
+        self._loading.set()
+
+        def _run() -> None:
+            try:
+                self.reload()
+            finally:
+                self._loading.clear()
+
+        thread = threading.Thread(target=_run, name="data-registry-load", daemon=True)
+        thread.start()
+        return thread
+
+    def _load(self) -> dict:
+        if self._loader is not None:
+            return self._loader()
+        from src.data.loader import load_data
+        return load_data()
+
+    # ── Watching ─────────────────────────────────────────────────────────────
+
+    def stamp(self) -> tuple[int, int] | None:
+        """Current (mtime_ns, size) of the watched workbook, None if missing."""
+        return _stat_stamp(self.path)
+
+    def _changed(self) -> bool:
+        """True when the workbook stamp differs from the published/failed one."""
+        stamp = self.stamp()
+        if stamp is None or self._loading.is_set():
+            return False
+        snapshot = self._snapshot
+        known = snapshot.stamp if snapshot is not None else None
+        return stamp != known and stamp != self._failed_stamp
+
+    def start_watching(self, interval: float) -> None:
+        """Poll the workbook every *interval* seconds in a daemon thread.
+
+        A non-positive interval disables watching.  Calling this twice is a
+        no-op while the first watcher is alive.
+        """
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+
+        def _watch() -> None:
+            while not self._stop.wait(interval):
+                if self._changed():
+                    self.reload()
+
+        self._watcher = threading.Thread(target=_watch, name="data-registry-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the watcher thread (if any) and wait for it to exit."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    # ── Forking ──────────────────────────────────────────────────────────────
+
+    def after_fork(self, interval: float) -> None:
+        """Re-arm the registry in a worker forked from a preloaded master.
+
+        Threads do not survive fork() and a lock held by one of them at fork
+        time would never be released in the child, so the locks and events
+        are replaced and the watcher is restarted.  If the fork interrupted
+        load_async(), the worker parses the workbook itself.  The published
+        snapshot is inherited as-is and shared copy-on-write with the master.
+        """
+        was_loading = self._loading.is_set()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._loading = threading.Event()
+        self._stop = threading.Event()
+        self._watcher = None
+        if was_loading and self._snapshot is None:
+            self.load_async()
+        self.start_watching(interval)
+
+
+# Process-wide registry.  app.py publishes the startup load (in the gunicorn
+# master when preloading); each gunicorn worker runs its own watcher.
+registry = DataRegistry()
@@ -0,0 +1,304 @@
+"""
+src/data/shared_cache.py
+========================
+Result cache shared by every worker process on a host, stored on local disk
+or in SQLite so it needs no external service.
+
+The per-process LRU caches (src/data/cache.py) leave each gunicorn worker
+cold: a slider position computed by one worker is recomputed by the next
+worker the request is routed to.  SharedCache stores pre-serialized results
+(bytes, typically JSON) under a hashed key in a backend every worker opens,
+so the first worker's result is a hit for all of them.
+
+Backends implement CacheBackend (get / put / clear) and are chosen with a
+"scheme:location" spec:
+
+  disk:<directory>    one file per entry, written atomically (temporary file
+                      + os.replace()); readers never see a partial entry
+  sqlite:<file>       one row per entry in a WAL-mode database; each write
+                      is a single transaction
+
+Both are bounded to max_bytes of stored values: once a write takes the total
+above it, the oldest-written entries are deleted down to EVICT_TO of the
+bound.  Keys include the data digest, so entries of replaced data are the
+first to go.  Errors (unwritable directory, locked database, corrupt entry)
+are counted and treated as misses — the cache can never fail a request.
+
+A networked store is added by implementing CacheBackend and registering its
+factory in BACKENDS under a new scheme.
+
+Exports
+-------
+EVICT_TO                                — fraction of max_bytes kept after an eviction
+CacheBackend                            — abstract get / put / clear interface
+DiskBackend(directory, max_bytes)       — one file per entry
+SQLiteBackend(path, max_bytes)          — one row per entry
+BACKENDS                                — scheme → backend factory(location, max_bytes)
+SharedCache(backend)                    — hashed keys, error handling, counters
+open_shared_cache(spec, max_bytes) -> SharedCache
+"""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+# Eviction deletes the oldest entries until the total is at most this
+# fraction of max_bytes, so a full cache does not evict on every write.
+EVICT_TO = 0.9
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Backends
+# ──────────────────────────────────────────────────────────────────────────────
+
+class CacheBackend(abc.ABC):
+    """Storage of byte values under string keys, shared between processes.
+
+    Implementations may raise OSError or sqlite3.Error; SharedCache counts
+    those as errors and carries on.  A subclass missing any of the methods
+    cannot be instantiated.
+    """
+
+    name = "none"
+
+    @abc.abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Stored value of *key*, or None."""
+
+    @abc.abstractmethod
+    def put(self, key: str, value: bytes) -> int:
+        """Store *value* under *key*; return the number of entries evicted."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Delete every entry."""
+
+
+class DiskBackend(CacheBackend):
+    """One file per entry in *directory*.
+
+    Each process scans the directory for eviction on its first write and
+    after every max_bytes / 8 bytes it has written since; between scans the
+    total may overshoot the bound by that much per process.
+    """
+
+    name = "disk"
+    _SUFFIX = ".json"
+
+    def __init__(self, directory: Path | str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._written = self.max_bytes  # scan on the first write
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (key + self._SUFFIX)
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, value: bytes) -> int:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=key[:16] + ".", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(value)
+            os.replace(tmp_name, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._written += len(value)
+            if self._written < self.max_bytes // 8:
+                return 0
+            self._written = 0
+        return self._evict()
+
+    def _evict(self) -> int:
+        entries, total = [], 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(self._SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+        evicted, target = 0, self.max_bytes * EVICT_TO
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                evicted += 1
+            except FileNotFoundError:
+                pass  # evicted by another worker
+            total -= size
+        return evicted
+
+    def clear(self) -> None:
+        if not self.directory.is_dir():
+            return
+        for path in self.directory.glob("*" + self._SUFFIX):
+            path.unlink(missing_ok=True)
+
+
+class SQLiteBackend(CacheBackend):
+    """One row per entry in a SQLite database at *path*.
+
+    Connections are opened per thread and per process (never inherited
+    across a gunicorn fork).  Eviction runs inside the writing transaction.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path | str, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = int(max_bytes)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, stored REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_stored ON entries (stored)")
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def get(self, key: str) -> bytes | None:
+        row = self._connection().execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def put(self, key: str, value: bytes) -> int:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, stored) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            evict = []
+            if total > self.max_bytes:
+                target = self.max_bytes * EVICT_TO
+                for old_key, size in conn.execute(
+                    "SELECT key, size FROM entries ORDER BY stored, rowid"
+                ):
+                    if total <= target:
+                        break
+                    evict.append((old_key,))
+                    total -= size
+                conn.executemany("DELETE FROM entries WHERE key = ?", evict)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(evict)
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM entries")
+
+
+BACKENDS: dict[str, Callable[[str, int], CacheBackend]] = {
+    "disk": DiskBackend,
+    "sqlite": SQLiteBackend,
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Front end
+# ──────────────────────────────────────────────────────────────────────────────
+
+class SharedCache:
+    """Hashed keys, error handling and per-process counters over a backend.
+
+    Keys are any JSON-serializable value (e.g. a tuple of data digest and
+    normalized inputs); the backend sees their SHA-256 hex digest.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(("hits", "misses", "writes", "evictions", "errors"), 0)
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += n
+
+    @staticmethod
+    def key(parts) -> str:
+        """SHA-256 hex digest of the JSON encoding of *parts*."""
+        return hashlib.sha256(json.dumps(parts, separators=(",", ":")).encode()).hexdigest()
+
+    def get(self, parts) -> bytes | None:
+        """Stored value for *parts*, or None on a miss or backend error."""
+        try:
+            value = self.backend.get(self.key(parts))
+        except (OSError, sqlite3.Error):
+            self._count("errors")
+            value = None
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def put(self, parts, value: bytes) -> bool:
+        """Store *value* for *parts*; False if the backend failed."""
+        try:
+            evicted = self.backend.put(self.key(parts), value)
+        except (OSError, sqlite3.Error):
+            self._count("errors")
+            return False
+        self._count("writes")
+        self._count("evictions", evicted)
+        return True
+
+    def stats(self) -> dict:
+        """Return {"backend", "hits", "misses", "writes", "evictions", "errors"} of this process."""
+        with self._lock:
+            return {"backend": self.backend.name, **self._counts}
+
+
+def open_shared_cache(spec: str, max_bytes: int) -> SharedCache:
+    """Open the backend named by *spec* ("disk:<directory>" / "sqlite:<file>").
+
+    Raises
+    ------
+    ValueError
+        For a spec without a location or with an unknown scheme.
+    """
+    scheme, _, location = spec.partition(":")
+    factory = BACKENDS.get(scheme)
+    if factory is None or not location:
+        raise ValueError(
+            f"Invalid shared cache spec {spec!r}: expected <scheme>:<location> "
+            f"with scheme one of {', '.join(sorted(BACKENDS))}"
+        )
+    return SharedCache(factory(location, max_bytes))
@@ -0,0 +1,143 @@
+"""
+src/data/snapshot.py
+====================
+Versioned binary snapshot cache for the parsed data.xlsx payload.
+
+Parsing the workbook with openpyxl dominates process start-up, and gunicorn
+pays that cost once per worker.  After the first successful parse, the
+loader writes the resulting data dict to a pickle snapshot next to
+data.xlsx.  Later loads rebuild the dict straight from the snapshot — the
+snapshot only references pandas / numpy objects, so openpyxl is never
+imported on that path.
+
+A snapshot is only trusted when its header matches:
+  - SNAPSHOT_FORMAT_VERSION (bumped whenever the data dict layout changes)
+  - the workbook's size in bytes
+  - the workbook's modification time (ns)
+  - the SHA-256 of the workbook's contents
+
+Any mismatch, truncation, or unpickling error is treated as a cache miss;
+the loader then falls back to parsing data.xlsx and rewrites the snapshot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Constants
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Bump whenever the structure of the dict returned by load_data() changes, or
+# the parsing of its values does, so stale snapshots written by older code are
+# ignored rather than misread.
+SNAPSHOT_FORMAT_VERSION = 7
+
+# Magic prefix written before the pickled payload — cheap sanity check that
+# the file really is one of our snapshots.
+_MAGIC = b"DESALSNAP"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────────────────
+
+def workbook_key(path: Path) -> dict:
+    """Return the cache key identifying the current contents of *path*.
+
+    Parameters
+    ----------
+    path : Path
+        Path to data.xlsx.
+
+    Returns
+    -------
+    dict with keys:
+        "format"   – SNAPSHOT_FORMAT_VERSION
+        "size"     – file size in bytes
+        "mtime_ns" – modification time in nanoseconds
+        "sha256"   – hex digest of the file contents
+    """
+    stat = path.stat()
+    return {
+        "format":   SNAPSHOT_FORMAT_VERSION,
+        "size":     stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256":   hashlib.sha256(path.read_bytes()).hexdigest(),
+    }
+
+
+def read_snapshot(snapshot_path: Path, key: dict) -> dict | None:
+    """Load the data dict from *snapshot_path* if its header matches *key*.
+
+    Parameters
+    ----------
+    snapshot_path : Path
+        Location of the snapshot file.
+    key : dict
+        Expected cache key from workbook_key().
+
+    Returns
+    -------
+    dict or None
+        The cached data dict, or None on any miss (file absent, stale key,
+        different format version, or a corrupt / truncated file).
+    """
+    try:
+        with open(snapshot_path, "rb") as fh:
+            if fh.read(len(_MAGIC)) != _MAGIC:
+                return None
+            header = pickle.load(fh)
+            if header != key:
+                return None
+            return pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return None
+
+
+def write_snapshot(snapshot_path: Path, key: dict, data: dict) -> bool:
+    """Atomically write *data* to *snapshot_path* under header *key*.
+
+    The payload is written to a temporary file in the same directory and
+    moved into place with os.replace(), so concurrent workers never observe
+    a half-written snapshot.
+
+    Parameters
+    ----------
+    snapshot_path : Path
+        Destination of the snapshot file.
+    key : dict
+        Cache key from workbook_key() describing the parsed workbook.
+    data : dict
+        Data dict returned by the workbook parser.
+
+    Returns
+    -------
+    bool
+        True if the snapshot was written; False if the directory is not
+        writable (e.g. a read-only deploy).  Failure is never fatal.
+    """
+    try:
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=snapshot_path.name + ".", suffix=".tmp", dir=snapshot_path.parent
+        )
+    except OSError:
+        return False
+
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_MAGIC)
+            pickle.dump(key, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, snapshot_path)
+        return True
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        return False
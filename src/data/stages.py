@@ -0,0 +1,153 @@
+"""
+src/data/stages.py
+==================
+Process-stage index of the equipment tables.
+
+STAGE_BY_NAME maps every configured equipment name to its process stage,
+per system, so get_equipment_stage() is one dict lookup instead of a scan
+of every stage list in config.PROCESS_STAGES.  It depends only on the
+configuration and is built once at import.
+
+StageIndex groups the rows of one data version by stage: for every
+(stage, system) it holds the row names with their typed cost and lifespan
+columns already extracted, plus the position of each name's first row.  A
+cross-system comparison is then a lookup of the item's stage rather than a
+scan of every other system's DataFrame.  stage_index(data) builds it once
+per data dict (i.e. per registry version) and returns the same index on
+later calls.
+
+Names not listed in PROCESS_STAGES map to "Other", and rows with such names
+are grouped under "Other" in the index.
+
+Exports
+-------
+OTHER_STAGE                           — stage of unlisted equipment ("Other")
+STAGE_BY_NAME                         — system → {equipment name → stage}
+StageItems                            — rows of one system in one stage
+StageIndex                            — stage → system → StageItems, plus name offsets
+build_stage_index(data) -> StageIndex
+stage_index(data) -> StageIndex       — build_stage_index() memoized per data dict
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import PROCESS_STAGES
+from src.data.cache import LRUCache
+from src.data.normalize import normalize_equipment
+
+OTHER_STAGE = "Other"
+
+# Equipment tables indexed by build_stage_index().
+_SYSTEMS = ("mechanical", "electrical", "hybrid")
+
+
+def _stage_by_name() -> dict[str, dict[str, str]]:
+    # setdefault keeps the first stage listing a name, as the former linear
+    # scan did.
+    mapping: dict[str, dict[str, str]] = {}
+    for system, stages in PROCESS_STAGES.items():
+        names = mapping.setdefault(system, {})
+        for stage, items in stages.items():
+            for name in items:
+                names.setdefault(name, stage)
+    return mapping
+
+
+STAGE_BY_NAME: dict[str, dict[str, str]] = _stage_by_name()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Per-version stage index
+# ──────────────────────────────────────────────────────────────────────────────
+
+class StageItems(NamedTuple):
+    """Rows of one system in one process stage, in table order."""
+
+    names: tuple[str, ...]     # raw equipment names
+    cost: np.ndarray           # typed cost_usd (float64)
+    lifespan: tuple            # original lifespan cells, for display
+    years: np.ndarray          # typed lifespan_years (int64, 0 = indefinite)
+
+
+_NO_ITEMS = StageItems((), np.empty(0), (), np.empty(0, dtype=np.int64))
+
+
+class StageIndex(NamedTuple):
+    """Equipment rows of a data version grouped by process stage."""
+
+    items: dict[str, dict[str, StageItems]]   # stage → system → rows
+    offsets: dict[str, dict[str, int]]        # system → name → first row in its stage
+
+    def stage_items(self, stage: str, system: str) -> StageItems:
+        """Rows of *system* in *stage* (empty when there are none)."""
+        return self.items.get(stage, {}).get(system, _NO_ITEMS)
+
+    def offset(self, system: str, name: str) -> int | None:
+        """Position of *name*'s first row within its stage's StageItems, or None."""
+        return self.offsets.get(system, {}).get(name)
+
+
+def build_stage_index(data: dict) -> StageIndex:
+    """Group the mechanical / electrical / hybrid rows of *data* by stage.
+
+    Parameters
+    ----------
+    data : dict
+        load_data() dict; equipment tables may be raw or normalized, and
+        missing systems are skipped.
+
+    Returns
+    -------
+    StageIndex
+    """
+    items: dict[str, dict[str, StageItems]] = {}
+    offsets: dict[str, dict[str, int]] = {}
+    for system in _SYSTEMS:
+        df = data.get(system)
+        if df is None or df.empty:
+            continue
+        df = normalize_equipment(df)
+        names = [str(name) for name in df["name"]]
+        lookup = STAGE_BY_NAME.get(system, {})
+        stages = np.array([lookup.get(name, OTHER_STAGE) for name in names], dtype=object)
+        cost = df["cost_usd"].to_numpy(dtype=float)
+        years = df["lifespan_years"].to_numpy(dtype=np.int64)
+        lifespan = df["lifespan_years_raw"].tolist()
+        system_offsets = offsets.setdefault(system, {})
+        for stage in pd.unique(stages):
+            rows = np.flatnonzero(stages == stage)
+            stage_names = tuple(names[i] for i in rows)
+            items.setdefault(stage, {})[system] = StageItems(
+                names=stage_names,
+                cost=cost[rows],
+                lifespan=tuple(lifespan[i] for i in rows),
+                years=years[rows],
+            )
+            for offset, name in enumerate(stage_names):
+                system_offsets.setdefault(name, offset)
+    return StageIndex(items, offsets)
+
+
+# A few versions' worth: the current data plus any still being served
+# during a reload, and hand-built dicts in tests.
+_index_cache = LRUCache(4)
+
+
+def stage_index(data: dict) -> StageIndex:
+    """build_stage_index(*data*), built once per data dict.
+
+    Entries are keyed by the identity of *data* (a published snapshot's
+    mapping is never modified, so a version keeps one index) and hold a
+    reference to it, so an id is not reused while its entry exists.
+    """
+    entry = _index_cache.get(id(data))
+    if entry is not None and entry[0] is data:
+        return entry[1]
+    index = build_stage_index(data)
+    _index_cache.put(id(data), (data, index))
+    return index
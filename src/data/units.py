@@ -0,0 +1,194 @@
+"""
+src/data/units.py
+=================
+Unit-aware parser for the free-text numeric cells of data.xlsx.
+
+Equipment cells are usually plain numbers, but the workbook also allows
+annotated values such as "~15 tons", "$ 2500 per ton", "<= 3 units" or
+"indefinite".  parse_quantity() turns each cell into a QuantityRecord:
+
+  magnitude  float — the number in the cell (NaN when there is none); a
+             currency amount's k / M / B suffix is applied ("$1.8M" →
+             1,800,000), while without a currency marker "15 m" stays metres
+  unit       canonical unit: "" for a plain count / USD amount, "ton", "kg",
+             "gal", "year", … and "/ton" etc. for a price *per* unit
+  qualifier  "" (exact), "approx" (~, about, ca.), "max" (<, up to),
+             "min" (>, at least) or "indefinite"
+
+parse_column() applies it to a whole column and returns compact arrays
+(float64 magnitudes plus categorical unit / qualifier codes).  It runs once
+per load inside normalize_equipment(), so the results are stored in the
+data snapshot and no string work happens at request time.
+
+Exports
+-------
+QuantityRecord                       — (magnitude, unit, qualifier) tuple
+parse_quantity(value) -> QuantityRecord
+parse_column(values) -> (np.ndarray, pd.Categorical, pd.Categorical)
+is_rate(unit) -> bool                — unit is a price per unit ("/ton")
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Vocabulary
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Spelling → canonical unit.  Counting words map to "" (a plain count).
+_UNIT_ALIASES: dict[str, str] = {
+    **dict.fromkeys(("ton", "tons", "t", "tonne", "tonnes", "metric ton", "metric tons"), "ton"),
+    **dict.fromkeys(("kg", "kgs", "kilogram", "kilograms"), "kg"),
+    **dict.fromkeys(("lb", "lbs", "pound", "pounds"), "lb"),
+    **dict.fromkeys(("gal", "gals", "gallon", "gallons"), "gal"),
+    **dict.fromkeys(("m", "meter", "meters", "metre", "metres"), "m"),
+    **dict.fromkeys(("ft", "foot", "feet"), "ft"),
+    **dict.fromkeys(("yr", "yrs", "year", "years"), "year"),
+    **dict.fromkeys(("kw",), "kW"),
+    **dict.fromkeys(("kwh",), "kWh"),
+    **dict.fromkeys(("mw",), "MW"),
+    **dict.fromkeys(("mwh",), "MWh"),
+    **dict.fromkeys(("unit", "units", "pc", "pcs", "piece", "pieces", "ea", "each", "x"), ""),
+}
+
+_QUALIFIER_ALIASES: dict[str, str] = {
+    **dict.fromkeys(("~", "≈", "approx", "approx.", "approximately", "about", "around",
+                     "ca", "ca.", "circa", "est", "est."), "approx"),
+    **dict.fromkeys(("<", "<=", "≤", "up to", "max", "max.", "at most"), "max"),
+    **dict.fromkeys((">", ">=", "≥", "min", "min.", "at least"), "min"),
+}
+
+# Magnitude suffixes of currency amounts ("$1.8M", "250k USD").  Only
+# applied when the cell has a currency marker; otherwise "m" is metres.
+_CURRENCY_SCALES: dict[str, float] = {
+    **dict.fromkeys(("k", "thousand"), 1e3),
+    **dict.fromkeys(("m", "mm", "mn", "million"), 1e6),
+    **dict.fromkeys(("b", "bn", "billion"), 1e9),
+}
+
+_INDEFINITE_WORDS = {"indefinite", "indefinitely", "infinite", "permanent", "life of plant"}
+
+_QUALIFIER_RE = "|".join(
+    re.escape(q) for q in sorted(_QUALIFIER_ALIASES, key=len, reverse=True)
+)
+_SCALE_RE = "|".join(sorted(_CURRENCY_SCALES, key=len, reverse=True))
+_CELL_RE = re.compile(
+    rf"""^\s*
+    (?P<qualifier>{_QUALIFIER_RE})?\s*
+    (?P<currency>\$|usd)?\s*
+    (?P<number>[-+]?(?:\d[\d,]*(?:\.\d*)?|\.\d+))\s*
+    (?:(?P<scale>{_SCALE_RE})(?![a-z]))?\s*
+    (?P<currency_after>\$|usd)?\s*
+    (?:
+        (?:per|/)\s*(?P<rate_unit>[a-z][a-z ]*?)
+      | (?P<unit>[a-z][a-z .]*?)
+    )?
+    \s*$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+class QuantityRecord(NamedTuple):
+    """One parsed cell: magnitude, canonical unit and qualifier."""
+
+    magnitude: float
+    unit: str
+    qualifier: str
+
+
+_EMPTY = QuantityRecord(math.nan, "", "")
+
+
+def _canonical_unit(text: str) -> str:
+    text = text.strip().rstrip(".").lower()
+    return _UNIT_ALIASES.get(text, text)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────────────────
+
+def is_rate(unit: str) -> bool:
+    """True when *unit* is a price per unit (e.g. "/ton")."""
+    return unit.startswith("/")
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text: str) -> QuantityRecord:
+    stripped = text.strip()
+    if stripped.lower() in _INDEFINITE_WORDS:
+        return QuantityRecord(math.nan, "", "indefinite")
+    match = _CELL_RE.match(stripped)
+    if match is None:
+        return _EMPTY
+    magnitude = float(match["number"].replace(",", ""))
+    qualifier = _QUALIFIER_ALIASES.get((match["qualifier"] or "").lower(), "")
+    scale, unit_text = match["scale"], match["unit"]
+    if scale and not (match["currency"] or match["currency_after"]):
+        # Not a currency amount: the "suffix" is the unit ("15 m" is metres).
+        if match["rate_unit"]:
+            return QuantityRecord(magnitude, _canonical_unit(f"{scale} per {match['rate_unit']}"), qualifier)
+        unit_text = scale if unit_text is None else f"{scale} {unit_text}"
+    elif scale:
+        magnitude *= _CURRENCY_SCALES[scale.lower()]
+    if match["rate_unit"]:
+        unit = "/" + _canonical_unit(match["rate_unit"])
+    else:
+        unit = _canonical_unit(unit_text or "")
+    return QuantityRecord(magnitude, unit, qualifier)
+
+
+def parse_quantity(value) -> QuantityRecord:
+    """Parse one workbook cell into a QuantityRecord.
+
+    Examples
+    --------
+    >>> parse_quantity("~15 tons")
+    QuantityRecord(magnitude=15.0, unit='ton', qualifier='approx')
+    >>> parse_quantity("$ 2500 per ton")
+    QuantityRecord(magnitude=2500.0, unit='/ton', qualifier='')
+    >>> parse_quantity("$1.8M")
+    QuantityRecord(magnitude=1800000.0, unit='', qualifier='')
+    >>> parse_quantity(3)
+    QuantityRecord(magnitude=3.0, unit='', qualifier='')
+
+    Parameters
+    ----------
+    value : any
+        Raw cell value (number, string or None).
+
+    Returns
+    -------
+    QuantityRecord
+        Unparseable text and blank cells give a NaN magnitude with empty
+        unit and qualifier; "indefinite" gives qualifier "indefinite".
+    """
+    if isinstance(value, str):
+        return _parse_text(value)
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+        return QuantityRecord(float(value), "", "")
+    return _EMPTY
+
+
+def parse_column(values: Iterable) -> tuple[np.ndarray, pd.Categorical, pd.Categorical]:
+    """Parse a column of cells into compact arrays.
+
+    Returns
+    -------
+    tuple
+        (magnitude, unit, qualifier): a float64 array and two categoricals
+        (small integer codes over the distinct strings), all aligned with
+        *values*.
+    """
+    records = [parse_quantity(v) for v in values]
+    magnitude = np.array([r.magnitude for r in records], dtype=float)
+    unit = pd.Categorical([r.unit for r in records])
+    qualifier = pd.Categorical([r.qualifier for r in records])
+    return magnitude, unit, qualifier
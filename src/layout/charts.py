@@ -4,51 +4,307 @@ src/layout/charts.py
 Plotly figure builders, chart section layout, and callbacks for the System
 Comparison panel.
 
-Provides two pure figure-building functions, one layout factory, and three
-Dash callbacks that wire sliders and legend toggles to the chart figures.
+Provides two pure figure-building functions, one layout factory, and Dash
+callbacks that wire sliders and legend toggles to the chart figures.  The
+cost chart (time horizon + battery sliders) and the power chart (TDS + depth
+sliders) are updated by independent callbacks.  On-grid slider positions are
+read from the memory-mapped scenario grid (src/data/grid.py); other values
+are computed live behind per-chart LRU caches.  With FIGURE_CACHE set, the
+callbacks' pre-serialized figures are also shared between worker processes
+(src/data/shared_cache.py).
 
 Exports
 -------
-set_data(data) -> None
 build_cost_chart(years, mech_cumulative, elec_cumulative, hybrid_cumulative, visibility) -> go.Figure
 build_energy_bar_chart(mech_energy, elec_energy, hybrid_energy, visibility) -> go.Figure
+patch_cost_chart(years, mech_cumulative, elec_cumulative, hybrid_cumulative) -> Patch
+patch_energy_bar_chart(mech_energy, elec_energy, hybrid_energy) -> Patch
 make_chart_section() -> html.Div
-update_charts(years, battery_fraction, visibility, tds_ppm, depth_m) -> tuple
-    Returns (cost_fig, power_fig, label_years, label_ratio, label_cost, label_tds, label_depth)
-toggle_legend(n_mech, n_elec, n_hybrid, visibility) -> dict
-update_badge_styles(visibility) -> tuple
+update_cost_chart(years, battery_fraction, figure) -> tuple
+    Returns (cost_fig, label_years, label_ratio, label_cost)
+update_power_chart(tds_ppm, depth_m, figure) -> tuple
+    Returns (power_fig, label_tds, label_depth)
+scenario_tables(data) -> dict
+    build_scenario_tables() for the clientside sliders, built once per data
+    version
+chart_cache_stats() -> dict
+    Hit / miss / eviction counters of the cost and energy LRU caches and of
+    the shared figure cache
+
+Legend toggling, badge styles, applying legend visibility to the figures and
+dismissing the guidance banner are clientside callbacks (no server round
+trip).  With CLIENTSIDE_SLIDERS=1 the slider → chart callbacks are clientside
+too (assets/scenario_sliders.js).
 """
 
+import json
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
 import plotly.graph_objects as go
-from dash import html, dcc, callback, Input, Output, State, ctx
+from plotly.io.json import to_json_plotly
+from dash import html, dcc, callback, clientside_callback, ctx, ClientsideFunction, Input, Output, Patch, State
 import dash_bootstrap_components as dbc
 
-from src.config import SYSTEM_COLORS, STAGE_COLORS
-from src.data.processing import compute_chart_data, interpolate_battery_cost, battery_ratio_label, fmt_cost
+from src.config import (
+    SYSTEM_COLORS,
+    STAGE_COLORS,
+    CHART_CACHE_SIZE,
+    BATTERY_SLIDER_STEP,
+    CLIENTSIDE_SLIDERS,
+    FIGURE_CACHE,
+    FIGURE_CACHE_MAX_MB,
+    GRID_FILE,
+    SCENARIO_GRID,
+    SUBSYSTEM_POWER,
+)
+from src.data.cache import LRUCache
+from src.data.grid import ScenarioGrid, grid_digest, load_grid
+from src.data.interpolation import LookupInterpolators, build_interpolators
+from src.data.registry import DataSnapshot, registry
+from src.data.shared_cache import SharedCache, open_shared_cache
+from src.metrics import note_cache
+from src.data.processing import (
+    DEFAULT_HORIZON_YEARS,
+    CostModel,
+    build_scenario_tables,
+    compute_cost_chart_data,
+    compute_energy_chart_data,
+    interpolate_battery_cost,
+    battery_ratio_label,
+    fmt_cost,
+)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Module-level data reference — mirrors set_data() pattern from shell.py.
-# Populated by set_data() called from app.py after data is loaded.
+# Derived per-version state.  Data comes from src.data.registry; the CostModel,
+# the lookup interpolators, the scenario grid and the data digest keying the
+# shared figure cache are rebuilt on every publish and the chart caches are
+# dropped with them.
 # ──────────────────────────────────────────────────────────────────────────────
 
-_data = None
+_derived_lock = threading.Lock()
+_derived_version = 0
+_cost_model: CostModel | None = None
+_interpolators: LookupInterpolators | None = None
+_grid: ScenarioGrid | None = None
+_digest: str | None = None
+_cost_cache = LRUCache(CHART_CACHE_SIZE)
+_energy_cache = LRUCache(CHART_CACHE_SIZE)
+
+# Clientside slider tables by data version; two versions' worth, so pages of
+# the outgoing version still being served during a reload do not evict them.
+_tables_cache = LRUCache(2 if CLIENTSIDE_SLIDERS else 0)
+
+# Bump whenever the figure builders or the cached outputs change, so figures
+# stored by an older deploy are not served.
+FIGURE_CACHE_FORMAT = 1
+
+_shared_cache: SharedCache | None = (
+    open_shared_cache(FIGURE_CACHE, int(FIGURE_CACHE_MAX_MB * 1024 * 1024)) if FIGURE_CACHE else None
+)
 
 
-def set_data(data: dict) -> None:
-    """Store the loaded data dict for use in the chart callbacks.
+class _Derived(NamedTuple):
+    snapshot: DataSnapshot | None
+    cost_model: CostModel | None
+    interpolators: LookupInterpolators | None
+    grid: ScenarioGrid | None
+    digest: str | None
 
-    Called once from app.py after DATA is loaded, before any callbacks fire.
-    Mirrors the pattern used in shell.py to avoid circular imports and
-    callback data loading.
 
-    Parameters
-    ----------
-    data : dict
-        Data dict returned by load_data().
+def _current() -> _Derived:
+    """Return the current data snapshot with the state derived from it.
+
+    The CostModel and the lookup interpolators are built once per registry
+    version so slider callbacks never touch the DataFrames, and the scenario
+    grid (when
+    SCENARIO_GRID is on and the slider callbacks run on the server) is
+    mapped or rebuilt for the same version.  With the shared figure cache
+    enabled, the data digest keying its entries is computed here too:
+    registry versions are per process, the digest is the same in every
+    worker serving the same data.  Memoized chart data from an older version
+    is dropped at the same time.
+    """
+    global _derived_version, _cost_model, _interpolators, _grid, _digest
+    with _derived_lock:
+        snapshot = registry.current()
+        if snapshot is None:
+            return _Derived(None, None, None, None, None)
+        if snapshot.version != _derived_version:
+            _cost_model = CostModel(snapshot.data)
+            _interpolators = build_interpolators(snapshot.data)
+            _grid = (
+                load_grid(GRID_FILE, snapshot.data, _cost_model)
+                if SCENARIO_GRID and not CLIENTSIDE_SLIDERS else None
+            )
+            _digest = None
+            if _shared_cache is not None:
+                _digest = _grid.digest if _grid is not None else grid_digest(snapshot.data, _cost_model)
+            _derived_version = snapshot.version
+            _cost_cache.clear()
+            _energy_cache.clear()
+        return _Derived(snapshot, _cost_model, _interpolators, _grid, _digest)
+
+
+def _compile_derived(_snapshot: DataSnapshot) -> None:
+    """Registry listener: compile derived state as soon as data is published.
+
+    Keeps the build off the first slider callback, and when app.py publishes
+    in a preloading gunicorn master the model is built once before fork and
+    shared by every worker.  With CLIENTSIDE_SLIDERS the scenario tables
+    shipped with every page are built here too.
+    """
+    derived = _current()
+    if CLIENTSIDE_SLIDERS and derived.snapshot is not None:
+        scenario_tables(derived.snapshot.data)
+
+
+registry.add_listener(_compile_derived)
+
+
+def _rearm_after_fork() -> None:
+    """Child side of fork(): replace _derived_lock.
+
+    With ASYNC_STARTUP in a preloading master, _compile_derived() runs in the
+    load thread and holds the lock while it builds the CostModel and grid; a
+    worker forked in that window would otherwise inherit it held forever.
+    An interrupted build never recorded its version, so the worker simply
+    rebuilds.
+    """
+    global _derived_lock
+    _derived_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_rearm_after_fork)
+
+
+def scenario_tables(data: dict) -> dict:
+    """build_scenario_tables() of *data* at BATTERY_SLIDER_STEP.
+
+    For the current registry data the tables are built once per version
+    from the compiled CostModel and shared between page loads, so they must
+    not be mutated; any other dict is built from scratch.
+    """
+    derived = _current()
+    if derived.snapshot is None or derived.snapshot.data is not data:
+        return build_scenario_tables(data, BATTERY_SLIDER_STEP)
+    return _tables_cache.get_or_compute(
+        derived.snapshot.version,
+        lambda: build_scenario_tables(data, BATTERY_SLIDER_STEP, derived.cost_model),
+    )
+
+
+def chart_cache_stats() -> dict:
+    """Return {"cost", "energy", "shared"} cache stats ("shared" is None when disabled)."""
+    return {
+        "cost": _cost_cache.stats(),
+        "energy": _energy_cache.stats(),
+        "shared": _shared_cache.stats() if _shared_cache is not None else None,
+    }
+
+
+def _get_or_compute(cache: LRUCache, key, compute):
+    """cache.get_or_compute() that reports "hit" / "miss" to the callback metrics."""
+    status = "hit"
+
+    def _compute():
+        nonlocal status
+        status = "miss"
+        return compute()
+
+    value = cache.get_or_compute(key, _compute)
+    note_cache(status)
+    return value
+
+
+def _cached_cost_data(years, battery_fraction) -> dict | None:
+    """compute_cost_chart_data() for the current data, memoized by slider state.
+
+    On-grid slider positions are read from the scenario grid.  Anything else
+    is computed live and memoized under (data version, years, battery step
+    index); the battery fraction is quantized to BATTERY_SLIDER_STEP.  The
+    returned dict is shared between callers and must not be mutated.
+    Returns None when no data has been published yet.
+    """
+    snapshot, cost_model, _, grid, _ = _current()
+    if snapshot is None:
+        return None
+    battery_step = int(round(battery_fraction / BATTERY_SLIDER_STEP))
+    if grid is not None:
+        hit = grid.cost_chart_data(int(years), battery_step * BATTERY_SLIDER_STEP)
+        if hit is not None:
+            note_cache("grid")
+            return hit
+    key = (snapshot.version, int(years), battery_step)
+    return _get_or_compute(
+        _cost_cache,
+        key,
+        lambda: compute_cost_chart_data(
+            snapshot.data, battery_step * BATTERY_SLIDER_STEP, int(years), cost_model=cost_model,
+        ),
+    )
+
+
+def _cached_energy_data(tds_ppm, depth_m) -> dict | None:
+    """compute_energy_chart_data() for the current data, memoized by slider state.
+
+    On-grid slider positions are read from the scenario grid.  Anything else
+    (e.g. the 950 ppm TDS default) is computed live and memoized under
+    (data version, tds_ppm, depth_m).  The returned dict is shared between
+    callers and must not be mutated.  Returns None when no data has been
+    published yet.
+    """
+    snapshot, _, interpolators, grid, _ = _current()
+    if snapshot is None:
+        return None
+    if grid is not None:
+        hit = grid.energy_chart_data(float(tds_ppm), float(depth_m))
+        if hit is not None:
+            note_cache("grid")
+            return hit
+    key = (snapshot.version, float(tds_ppm), float(depth_m))
+    return _get_or_compute(
+        _energy_cache,
+        key,
+        lambda: compute_energy_chart_data(
+            snapshot.data, float(tds_ppm), float(depth_m), interpolators=interpolators,
+        ),
+    )
+
+
+def _shared_outputs(chart: str, inputs: tuple, build):
+    """build()'s callback outputs, through the shared figure cache.
+
+    *inputs* are the normalized slider inputs the outputs depend on.  A hit
+    returns the outputs as stored — plain JSON (a Patch as its wire dict),
+    so neither the computation nor Plotly's figure serialization runs.  A
+    miss calls build() and stores its serialized result under the data
+    digest.  build() returns a list of outputs, or None when no data has
+    been published (never stored).
     """
-    global _data
-    _data = data
+    if _shared_cache is None:
+        return build()
+    digest = _current().digest
+    if digest is None:
+        return build()
+    key = (FIGURE_CACHE_FORMAT, digest, chart, *inputs)
+    payload = _shared_cache.get(key)
+    if payload is not None:
+        try:
+            outputs = json.loads(payload)
+        except ValueError:
+            outputs = None  # truncated by a full disk: rebuild and overwrite
+        if outputs is not None:
+            note_cache("shared")
+            return outputs
+    outputs = build()
+    if outputs is not None:
+        _shared_cache.put(key, to_json_plotly(outputs).encode())
+    return outputs
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -56,6 +312,18 @@ def set_data(data: dict) -> None:
 # ──────────────────────────────────────────────────────────────────────────────
 
 _TRANSITION = {"duration": 300, "easing": "cubic-in-out"}
+_ALL_VISIBLE = {"mechanical": True, "electrical": True, "hybrid": True}
+
+# Sliders report every intermediate value only when the charts are rebuilt
+# in the browser; server-side rebuilds wait for mouse release.
+_SLIDER_UPDATEMODE = "drag" if CLIENTSIDE_SLIDERS else "mouseup"
+
+# Stacked-bar trace order of the power chart (one trace per stage).
+_ENERGY_STAGES = [
+    "Groundwater Extraction",
+    "RO Desalination",
+    "Brine Reinjection",
+]
 _MARGIN = dict(l=75, r=20, t=10, b=40)
 
 
@@ -147,7 +415,8 @@ def build_energy_bar_chart(
     One bar per visible system, stacked by process stage. Fixed per-stage
     colors (from STAGE_COLORS) prevent color shifting when stage values drop
     to 0 as slider parameters change. Hidden systems are excluded from the
-    data entirely so they don't affect the axis scale.
+    bar x/y data so they don't affect the axis scale; every system's value is
+    kept in each trace's meta for the clientside legend callback.
 
     Parameters
     ----------
@@ -164,61 +433,47 @@ def build_energy_bar_chart(
     -------
     go.Figure
     """
-    ALL_STAGES = [
-        "Groundwater Extraction",
-        "RO Desalination",
-        "Brine Reinjection",
-    ]
-
     all_systems = [
         ("Mechanical", mech_energy),
         ("Electrical", elec_energy),
         ("Hybrid",     hybrid_energy),
     ]
+    system_names = [name for name, _ in all_systems]
 
     # Exclude toggled-off systems so they don't appear as phantom bars
-    visible_systems = [
-        (name, energy)
-        for name, energy in all_systems
-        if visibility.get(name.lower(), True)
-    ]
+    visible = [visibility.get(name.lower(), True) for name in system_names]
+    any_visible = any(visible)
 
     fig = go.Figure()
 
-    if not visible_systems:
-        fig.update_layout(
-            annotations=[dict(
-                text="All systems hidden — click a badge above to show data",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5,
-                showarrow=False,
-                font=dict(size=13, color="#999999"),
-            )],
-            xaxis=dict(visible=False),
-            yaxis=dict(visible=False),
-            transition=_TRANSITION,
-            margin=dict(l=40, r=10, t=10, b=10),
-        )
-        return fig
-
-    x_labels = [name for name, _ in visible_systems]
-
-    for stage in ALL_STAGES:
-        y_values = [energy_dict.get(stage, 0.0) for _, energy_dict in visible_systems]
+    for stage in _ENERGY_STAGES:
+        values = [energy_dict.get(stage, 0.0) for _, energy_dict in all_systems]
         # Always emit all stage traces (even zeros) so trace count stays
         # constant across slider updates — Plotly needs a stable trace list
         # to correctly reconcile bar assignments during live drags.
+        # meta keeps every system's value so the clientside legend callback
+        # can re-filter x/y without a server round trip.
         fig.add_trace(go.Bar(
             name=stage,
-            x=x_labels,
-            y=y_values,
+            x=[name for name, shown in zip(system_names, visible) if shown],
+            y=[value for value, shown in zip(values, visible) if shown],
+            meta={"systems": system_names, "values": values},
             marker_color=STAGE_COLORS.get(stage, "#999999"),
             hovertemplate="%{x} — " + stage + ": %{y:.1f} kW<extra></extra>",
         ))
 
     fig.update_layout(
         barmode="stack",
-        yaxis_title="Power (kW)",
+        xaxis=dict(visible=any_visible),
+        yaxis=dict(title="Power (kW)", visible=any_visible),
+        annotations=[dict(
+            text="All systems hidden — click a badge above to show data",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5,
+            showarrow=False,
+            font=dict(size=13, color="#999999"),
+            visible=not any_visible,
+        )],
         transition=_TRANSITION,
         margin=dict(l=40, r=10, t=10, b=10),
         legend=dict(
@@ -229,11 +484,71 @@ def build_energy_bar_chart(
             x=1,
             font=dict(size=10),
         ),
-        showlegend=True,
+        showlegend=any_visible,
     )
     return fig
 
 
+def patch_cost_chart(years: int, mech_cumulative, elec_cumulative, hybrid_cumulative) -> Patch:
+    """Incremental update for a figure built by build_cost_chart().
+
+    Only the x range, each system's y values and the uirevision change with
+    the sliders; layout, colors and hovertemplates stay in the browser.
+
+    Parameters
+    ----------
+    years : int
+        Time horizon in years.
+    mech_cumulative, elec_cumulative, hybrid_cumulative : array-like
+        Cumulative cost per year, in the trace order of build_cost_chart().
+
+    Returns
+    -------
+    dash.Patch
+    """
+    x = list(range(0, years + 1))
+    patch = Patch()
+    for i, cumulative in enumerate((mech_cumulative, elec_cumulative, hybrid_cumulative)):
+        patch["data"][i]["x"] = x
+        patch["data"][i]["y"] = np.asarray(cumulative[: years + 1], dtype=float).tolist()
+    patch["layout"]["uirevision"] = f"cost-{years}"
+    return patch
+
+
+def patch_energy_bar_chart(mech_energy: dict, elec_energy: dict, hybrid_energy: dict) -> Patch:
+    """Incremental update for an all-visible build_energy_bar_chart() figure.
+
+    Replaces each stage trace's bar values (y and meta.values); x, colors and
+    layout are unchanged.
+
+    Parameters
+    ----------
+    mech_energy, elec_energy, hybrid_energy : dict[str, float]
+        Stage -> kW dicts for the three systems.
+
+    Returns
+    -------
+    dash.Patch
+    """
+    patch = Patch()
+    for i, stage in enumerate(_ENERGY_STAGES):
+        values = [energy.get(stage, 0.0) for energy in (mech_energy, elec_energy, hybrid_energy)]
+        patch["data"][i]["y"] = values
+        patch["data"][i]["meta"]["values"] = values
+    return patch
+
+
+def _cost_skeleton() -> go.Figure:
+    """All-visible cost chart at the maximum horizon, values to be filled in."""
+    zeros = np.zeros(DEFAULT_HORIZON_YEARS + 1)
+    return build_cost_chart(DEFAULT_HORIZON_YEARS, zeros, zeros, zeros, _ALL_VISIBLE)
+
+
+def _power_skeleton() -> go.Figure:
+    """All-visible power chart at base subsystem power, values to be filled in."""
+    return build_energy_bar_chart(SUBSYSTEM_POWER, SUBSYSTEM_POWER, SUBSYSTEM_POWER, _ALL_VISIBLE)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Chart section layout factory
 # ──────────────────────────────────────────────────────────────────────────────
@@ -246,6 +561,7 @@ def make_chart_section() -> html.Div:
     - Control panel card with both sliders (time horizon and battery/tank)
     - Shared legend row with clickable system badges
     - dcc.Store for legend visibility state
+    - dcc.Store per chart holding the server-built figure
     - 2x2 responsive chart grid
 
     No callbacks are defined in this function — they are registered in Plan 02
@@ -308,7 +624,7 @@ def make_chart_section() -> html.Div:
                             value=50,
                             marks={1: "1yr", 25: "25yr", 50: "50yr"},
                             tooltip={"always_visible": True, "placement": "bottom"},
-                            updatemode="mouseup",
+                            updatemode=_SLIDER_UPDATEMODE,
                             allow_direct_input=False,
                             persistence=True,
                             persistence_type="session",
@@ -339,7 +655,7 @@ def make_chart_section() -> html.Div:
                             value=0.5,
                             marks={0: "100% Tank", 0.5: "50/50", 1: "100% Battery"},
                             tooltip={"always_visible": True, "placement": "bottom"},
-                            updatemode="mouseup",
+                            updatemode=_SLIDER_UPDATEMODE,
                             allow_direct_input=False,
                             persistence=True,
                             persistence_type="session",
@@ -377,7 +693,7 @@ def make_chart_section() -> html.Div:
                             value=950,
                             marks={0: "0 PPM", 5000: "5k", 10000: "10k PPM"},
                             tooltip={"always_visible": True, "placement": "bottom"},
-                            updatemode="mouseup",
+                            updatemode=_SLIDER_UPDATEMODE,
                             allow_direct_input=False,
                             persistence=True,
                             persistence_type="session",
@@ -408,7 +724,7 @@ def make_chart_section() -> html.Div:
                             value=950,
                             marks={0: "0", 950: "950", 1900: "1900"},
                             tooltip={"always_visible": True, "placement": "bottom"},
-                            updatemode="mouseup",
+                            updatemode=_SLIDER_UPDATEMODE,
                             allow_direct_input=False,
                             persistence=True,
                             persistence_type="session",
@@ -474,6 +790,16 @@ def make_chart_section() -> html.Div:
         data={"mechanical": True, "electrical": True, "hybrid": True},
     )
 
+    # ── Server-built figures (all systems visible) ────────────────────────────
+    # The server callbacks write here; clientside callbacks apply the legend
+    # visibility and render into the dcc.Graph components.
+    # In CLIENTSIDE_SLIDERS mode the stores start with the figure skeletons
+    # that assets/scenario_sliders.js fills in.
+    figure_stores = [
+        dcc.Store(id="store-cost-figure", data=_cost_skeleton() if CLIENTSIDE_SLIDERS else None),
+        dcc.Store(id="store-power-figure", data=_power_skeleton() if CLIENTSIDE_SLIDERS else None),
+    ]
+
     # ── 2-chart row ───────────────────────────────────────────────────────────
     chart_row = dbc.Row(
         [
@@ -494,6 +820,7 @@ def make_chart_section() -> html.Div:
     return html.Div([
         html.H4("System Comparison", className="mt-4 mb-3"),
         legend_store,
+        *figure_stores,
         banner,
         control_panel,
         legend_row,
@@ -508,26 +835,18 @@ def make_chart_section() -> html.Div:
 # Callbacks
 # ──────────────────────────────────────────────────────────────────────────────
 
-@callback(
-    Output("chart-cost", "figure"),
-    Output("chart-power", "figure"),
-    Output("label-years", "children"),
-    Output("label-battery-ratio", "children"),
-    Output("label-elec-cost", "children"),
-    Output("label-tds", "children"),
-    Output("label-depth", "children"),
-    Input("slider-time-horizon", "value"),
-    Input("slider-battery", "value"),
-    Input("store-legend-visibility", "data"),
-    Input("slider-tds", "value"),
-    Input("slider-depth", "value"),
-)
-def update_charts(years, battery_fraction, visibility, tds_ppm, depth_m):
-    """Master chart update callback.
+def update_cost_chart(years, battery_fraction, figure):
+    """Cost chart update callback.
 
-    Fires whenever the time horizon slider, battery/tank slider, TDS slider,
-    depth slider, or legend visibility store changes. Computes all chart data
-    in one call and returns two updated figures plus five live label strings.
+    Fires when the time horizon or battery/tank slider changes. Cost data is
+    memoized by slider state, so revisited slider positions skip the
+    computation. The figure is built with every system visible and written
+    to store-cost-figure; legend visibility is applied clientside. Once the
+    store holds a figure, only a dash.Patch of the changed arrays is sent;
+    while it is still empty (a slider moved before the initial response
+    landed) the full figure is sent instead. With
+    FIGURE_CACHE set, the figure and cost label are shared by all workers
+    per (years, battery step, initial render).
 
     Parameters
     ----------
@@ -535,49 +854,162 @@ def update_charts(years, battery_fraction, visibility, tds_ppm, depth_m):
         Time horizon from the time horizon slider (1-50).
     battery_fraction : float
         Battery/tank split from the battery slider (0.0-1.0).
-    visibility : dict
-        Legend visibility store {"mechanical": bool, "electrical": bool, "hybrid": bool}.
+    figure : dict or None
+        Current store-cost-figure data; None until a full figure arrived.
+
+    Returns
+    -------
+    tuple
+        (cost_fig, label_years, label_ratio, label_cost)
+    """
+    # Initial render (no triggering input) and an empty store get the full
+    # skeleton; slider moves patch only the arrays that changed.
+    initial = ctx.triggered_id is None or figure is None
+
+    def build():
+        cd = _cached_cost_data(years, battery_fraction)
+        if cd is None:
+            return None
+        series = (
+            cd["cost_over_time"]["mechanical"],
+            cd["cost_over_time"]["electrical"],
+            cd["cost_over_time"]["hybrid"],
+        )
+        if initial:
+            cost_fig = build_cost_chart(years, *series, _ALL_VISIBLE)
+        else:
+            cost_fig = patch_cost_chart(years, *series)
+        return [cost_fig, f"Electrical total: {fmt_cost(cd['electrical_total_cost'])}"]
+
+    battery_step = int(round(battery_fraction / BATTERY_SLIDER_STEP))
+    outputs = _shared_outputs("cost", (int(years), battery_step, initial), build)
+
+    # Guard: if data not yet loaded, return an empty figure and blank labels
+    if outputs is None:
+        return go.Figure(), "", "", ""
+
+    cost_fig, label_cost = outputs
+    label_years = f"{years} year{'s' if years != 1 else ''}"
+    label_ratio = battery_ratio_label(battery_fraction)
+
+    return cost_fig, label_years, label_ratio, label_cost
+
+
+def update_power_chart(tds_ppm, depth_m, figure):
+    """Power chart update callback.
+
+    Fires when the TDS or depth slider changes. Energy data is memoized by
+    slider state. The figure is built with every system visible and written
+    to store-power-figure; legend visibility is applied clientside. Once the
+    store holds a figure, only a dash.Patch of the bar values is sent; while
+    it is still empty the full figure is sent instead. With
+    FIGURE_CACHE set, the figure is shared by all workers per (TDS, depth,
+    initial render).
+
+    Parameters
+    ----------
     tds_ppm : float
         Source water salinity in PPM from the TDS slider (0-35000, default 950).
     depth_m : float
         Water source depth in metres from the depth slider (0-1900, default 950).
+    figure : dict or None
+        Current store-power-figure data; None until a full figure arrived.
 
     Returns
     -------
     tuple
-        (cost_fig, power_fig, label_years, label_ratio, label_cost, label_tds, label_depth)
+        (power_fig, label_tds, label_depth)
     """
-    # Guard: if data not yet loaded, return empty figures and blank labels
-    if _data is None:
-        empty = go.Figure()
-        return empty, empty, "", "", "", "", ""
-
-    cd = compute_chart_data(_data, battery_fraction, years, tds_ppm=tds_ppm, depth_m=depth_m)
-
-    cost_fig = build_cost_chart(
-        years,
-        cd["cost_over_time"]["mechanical"],
-        cd["cost_over_time"]["electrical"],
-        cd["cost_over_time"]["hybrid"],
-        visibility,
-    )
-    power_fig = build_energy_bar_chart(
-        cd["energy_breakdown"]["mechanical"],
-        cd["energy_breakdown"]["electrical"],
-        cd["energy_breakdown"]["hybrid"],
-        visibility,
-    )
+    initial = ctx.triggered_id is None or figure is None
+
+    def build():
+        cd = _cached_energy_data(tds_ppm, depth_m)
+        if cd is None:
+            return None
+        energy = (
+            cd["energy_breakdown"]["mechanical"],
+            cd["energy_breakdown"]["electrical"],
+            cd["energy_breakdown"]["hybrid"],
+        )
+        if initial:
+            return [build_energy_bar_chart(*energy, _ALL_VISIBLE)]
+        return [patch_energy_bar_chart(*energy)]
 
-    label_years = f"{years} year{'s' if years != 1 else ''}"
-    label_ratio = battery_ratio_label(battery_fraction)
-    label_cost = f"Electrical total: {fmt_cost(cd['electrical_total_cost'])}"
+    outputs = _shared_outputs("power", (float(tds_ppm), float(depth_m), initial), build)
+
+    # Guard: if data not yet loaded, return an empty figure and blank labels
+    if outputs is None:
+        return go.Figure(), "", ""
+
+    (power_fig,) = outputs
     label_tds = f"{int(round(tds_ppm))} PPM"
     label_depth = f"{int(round(depth_m))} m"
 
-    return cost_fig, power_fig, label_years, label_ratio, label_cost, label_tds, label_depth
+    return power_fig, label_tds, label_depth
+
+
+# Slider → chart wiring.  By default the two callbacks above run on the
+# server; in CLIENTSIDE_SLIDERS mode the same outputs are produced in the
+# browser by assets/scenario_sliders.js from store-scenario-tables and the
+# figure skeletons placed in the layout by make_chart_section().
+_COST_CHART_IO = [
+    Output("store-cost-figure", "data"),
+    Output("label-years", "children"),
+    Output("label-battery-ratio", "children"),
+    Output("label-elec-cost", "children"),
+    Input("slider-time-horizon", "value"),
+    Input("slider-battery", "value"),
+]
+_POWER_CHART_IO = [
+    Output("store-power-figure", "data"),
+    Output("label-tds", "children"),
+    Output("label-depth", "children"),
+    Input("slider-tds", "value"),
+    Input("slider-depth", "value"),
+]
+
+if CLIENTSIDE_SLIDERS:
+    clientside_callback(
+        ClientsideFunction("scenario", "costChart"),
+        *_COST_CHART_IO,
+        State("store-scenario-tables", "data"),
+        State("store-cost-figure", "data"),
+    )
+    clientside_callback(
+        ClientsideFunction("scenario", "powerChart"),
+        *_POWER_CHART_IO,
+        State("store-scenario-tables", "data"),
+        State("store-power-figure", "data"),
+    )
+else:
+    # The current figure tells the callbacks whether a Patch has anything to
+    # apply to: a slider can move before the initial full figure has landed.
+    callback(*_COST_CHART_IO, State("store-cost-figure", "data"))(update_cost_chart)
+    callback(*_POWER_CHART_IO, State("store-power-figure", "data"))(update_power_chart)
+
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Clientside legend callbacks
+# Legend clicks never reach the server: the badge toggles the visibility store
+# in the browser, and the figures stored by the server callbacks above are
+# re-rendered with the new trace visibility (Plotly.react on the existing
+# traces — no recompute, no payload).
+# ──────────────────────────────────────────────────────────────────────────────
 
-@callback(
+clientside_callback(
+    """
+    function(n_mech, n_elec, n_hybrid, visibility) {
+        const key = {
+            "legend-btn-mechanical": "mechanical",
+            "legend-btn-electrical": "electrical",
+            "legend-btn-hybrid": "hybrid",
+        }[dash_clientside.callback_context.triggered_id];
+        if (!key) return dash_clientside.no_update;
+        const updated = Object.assign({}, visibility);
+        updated[key] = updated[key] === false;
+        return updated;
+    }
+    """,
     Output("store-legend-visibility", "data"),
     Input("legend-btn-mechanical", "n_clicks"),
     Input("legend-btn-electrical", "n_clicks"),
@@ -585,87 +1017,96 @@ def update_charts(years, battery_fraction, visibility, tds_ppm, depth_m):
     State("store-legend-visibility", "data"),
     prevent_initial_call=True,
 )
-def toggle_legend(n_mech, n_elec, n_hybrid, visibility):
-    """Toggle a system's visibility in the legend store.
-
-    Uses ctx.triggered_id to identify which badge was clicked, then flips
-    that system's boolean in the visibility dict.
-
-    Parameters
-    ----------
-    n_mech : int or None
-        Number of times Mechanical badge was clicked.
-    n_elec : int or None
-        Number of times Electrical badge was clicked.
-    n_hybrid : int or None
-        Number of times Hybrid badge was clicked.
-    visibility : dict
-        Current legend visibility store.
 
-    Returns
-    -------
-    dict
-        Updated visibility dict with one system's bool toggled.
+# Hidden badges drop to 40% opacity with a line-through.
+clientside_callback(
     """
-    _id_to_key = {
-        "legend-btn-mechanical": "mechanical",
-        "legend-btn-electrical": "electrical",
-        "legend-btn-hybrid": "hybrid",
+    function(visibility) {
+        const colors = %s;
+        return ["mechanical", "electrical", "hybrid"].map(function(key) {
+            const shown = (visibility || {})[key] !== false;
+            const style = {
+                cursor: "pointer",
+                backgroundColor: colors[key],
+                fontSize: "0.9rem",
+                opacity: shown ? "1" : "0.4",
+            };
+            if (!shown) style.textDecoration = "line-through";
+            return style;
+        });
     }
-    triggered = ctx.triggered_id
-    key = _id_to_key.get(triggered)
-    if key is None:
-        return visibility
-
-    updated = dict(visibility)
-    updated[key] = not updated[key]
-    return updated
-
-
-@callback(
+    """ % json.dumps({label.lower(): color for label, color in SYSTEM_COLORS.items()}),
     Output("legend-btn-mechanical", "style"),
     Output("legend-btn-electrical", "style"),
     Output("legend-btn-hybrid", "style"),
     Input("store-legend-visibility", "data"),
 )
-def update_badge_styles(visibility):
-    """Update legend badge opacity to reflect visibility state.
 
-    Fully visible systems have opacity 1.0; hidden systems have opacity 0.4
-    with a line-through text decoration to signal toggled-off state.
+# Cost chart: one line trace per system, named after it — hide via "legendonly".
+clientside_callback(
+    """
+    function(figure, visibility) {
+        if (!figure) return dash_clientside.no_update;
+        const vis = visibility || {};
+        const data = figure.data.map(function(trace) {
+            const shown = vis[(trace.name || "").toLowerCase()] !== false;
+            return Object.assign({}, trace, {visible: shown ? true : "legendonly"});
+        });
+        return Object.assign({}, figure, {data: data});
+    }
+    """,
+    Output("chart-cost", "figure"),
+    Input("store-cost-figure", "data"),
+    Input("store-legend-visibility", "data"),
+)
 
-    Parameters
-    ----------
-    visibility : dict
-        Legend visibility store {"mechanical": bool, "electrical": bool, "hybrid": bool}.
+# Power chart: one stacked-bar trace per stage; re-filter each trace's x/y
+# from its meta so hidden systems don't affect the axis scale.
+clientside_callback(
+    """
+    function(figure, visibility) {
+        if (!figure) return dash_clientside.no_update;
+        const vis = visibility || {};
+        let anyVisible = false;
+        const data = figure.data.map(function(trace) {
+            if (!trace.meta) return trace;
+            const x = [], y = [];
+            trace.meta.systems.forEach(function(name, i) {
+                if (vis[name.toLowerCase()] !== false) {
+                    x.push(name);
+                    y.push(trace.meta.values[i]);
+                }
+            });
+            anyVisible = anyVisible || x.length > 0;
+            return Object.assign({}, trace, {x: x, y: y});
+        });
+        const layout = Object.assign({}, figure.layout, {
+            xaxis: Object.assign({}, figure.layout.xaxis, {visible: anyVisible}),
+            yaxis: Object.assign({}, figure.layout.yaxis, {visible: anyVisible}),
+            annotations: (figure.layout.annotations || []).map(function(a) {
+                return Object.assign({}, a, {visible: !anyVisible});
+            }),
+            showlegend: anyVisible,
+        });
+        return Object.assign({}, figure, {data: data, layout: layout});
+    }
+    """,
+    Output("chart-power", "figure"),
+    Input("store-power-figure", "data"),
+    Input("store-legend-visibility", "data"),
+)
 
-    Returns
-    -------
-    tuple[dict, dict, dict]
-        Style dicts for Mechanical, Electrical, and Hybrid badges.
+
+# Dismiss the first-visit guidance banner on any slider interaction.
+# Clientside so that live-dragging sliders (CLIENTSIDE_SLIDERS mode) never
+# generates server traffic.  prevent_initial_call=True ensures the banner is
+# not dismissed on page load when slider defaults fire.
+clientside_callback(
     """
-    systems = [
-        ("mechanical", "Mechanical"),
-        ("electrical", "Electrical"),
-        ("hybrid",     "Hybrid"),
-    ]
-    styles = []
-    for key, label in systems:
-        is_visible = visibility.get(key, True)
-        style = {
-            "cursor": "pointer",
-            "backgroundColor": SYSTEM_COLORS[label],
-            "fontSize": "0.9rem",
-            "opacity": "1" if is_visible else "0.4",
-        }
-        if not is_visible:
-            style["textDecoration"] = "line-through"
-        styles.append(style)
-
-    return styles[0], styles[1], styles[2]
-
-
-@callback(
+    function(_th, _bat, _tds, _depth, store) {
+        return [{dismissed: true}, false];
+    }
+    """,
     Output("store-banner-dismissed", "data"),
     Output("banner-guidance", "is_open"),
     Input("slider-time-horizon", "value"),
@@ -675,29 +1116,3 @@ def update_badge_styles(visibility):
     State("store-banner-dismissed", "data"),
     prevent_initial_call=True,
 )
-def dismiss_banner(_th, _bat, _tds, _depth, store):
-    """Dismiss the first-visit guidance banner on any slider interaction.
-
-    Fires when any of the four sliders change value (drag or click). Sets the
-    store flag to dismissed and hides the banner. prevent_initial_call=True
-    ensures the banner is not dismissed on page load when slider defaults fire.
-
-    Parameters
-    ----------
-    _th : float
-        Time horizon slider value (unused; fires callback).
-    _bat : float
-        Battery slider value (unused; fires callback).
-    _tds : float
-        TDS slider value (unused; fires callback).
-    _depth : float
-        Depth slider value (unused; fires callback).
-    store : dict
-        Current banner dismissed-state store.
-
-    Returns
-    -------
-    tuple[dict, bool]
-        Updated store with dismissed=True, and is_open=False to hide banner.
-    """
-    return {"dismissed": True}, False
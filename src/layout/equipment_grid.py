@@ -3,21 +3,46 @@ src/layout/equipment_grid.py
 ============================
 Equipment card grid with accordion detail expansion and cross-system comparison.
 
+Accordion bodies are loaded on demand: the section is sent with a
+placeholder body per item, and when an item is expanded a pattern-matching
+callback (load_equipment_body) renders its description, detail table and
+cross-system comparison.  Rendered bodies are cached pre-serialized (as in
+the system view cache of src/layout/shell.py) per (data version, system,
+row), so an item is built at most once per version per worker.
+
+Body IDs carry the item's name next to its row index.  After a hot reload
+the row at that index may be a different item (or gone); the callback then
+shows a "data changed — reload the page" note instead of another item's
+details.  The name, unlike the registry version, is the same in every
+worker, so a page rendered by one worker can be expanded by any other.
+
 Exports
 -------
-make_equipment_section(df, system, all_data)
-    Returns an html.Div grouping equipment accordion items by process stage,
-    with full detail and cross-system comparison in the expanded view.
+make_equipment_section(df, system)
+    Returns an html.Div grouping equipment accordion items by process stage;
+    item bodies are filled in by load_equipment_body when expanded.
+make_equipment_body(row, system, all_data)
+    Returns the expanded body of one item: description, badges, detail
+    table and cross-system comparison.
 """
 
 from __future__ import annotations
 
+import json
+import math
+
 import pandas as pd
-from dash import html
+from dash import html, callback, no_update, ALL, MATCH, Input, Output, State
 import dash_bootstrap_components as dbc
+from plotly.io.json import to_json_plotly
 
 from src.config import EQUIPMENT_DESCRIPTIONS, PROCESS_STAGES, DISPLAY_NAMES, LIFESPAN_DEFAULTS
+from src.data.cache import LRUCache
+from src.data.normalize import LIFESPAN_INDEFINITE, raw_value
 from src.data.processing import fmt_cost, fmt_num, fmt, fmt_sig2, get_equipment_stage
+from src.data.registry import registry
+from src.data.stages import StageItems, stage_index
+from src.metrics import note_cache
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -34,6 +59,23 @@ _STAGE_ORDER = [
     "Support",
 ]
 
+# Pattern-matching component types of the lazy accordion bodies.
+_ACCORDION_TYPE = "equipment-accordion"
+_BODY_TYPE = "equipment-body"
+
+# Rendered bodies kept per worker, keyed by (data version, system, row).
+_BODY_CACHE_SIZE = 512
+
+# Data dict keys holding equipment tables; bodies are only loaded for these.
+_EQUIPMENT_SYSTEMS = ("mechanical", "electrical", "hybrid")
+
+# Shown in an expanded item whose row changed since the page was rendered.
+_STALE_BODY = html.P(
+    "The equipment data has changed since this page was loaded — "
+    "reload the page to see the current details.",
+    className="text-warning small mb-0",
+)
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Private helpers
@@ -65,9 +107,9 @@ def _make_summary_badges(row: pd.Series) -> dbc.Row:
         Three small badge columns: Qty, Cost, Lifespan.
     """
     badges = [
-        ("Qty", fmt_sig2(row.get("quantity"))),
+        ("Qty", fmt_sig2(raw_value(row, "quantity"))),
         ("Cost", fmt_cost(row.get("cost_usd"))),
-        ("Lifespan", _fmt_lifespan(row.get("lifespan_years"), row.get("name", ""))),
+        ("Lifespan", _fmt_lifespan(raw_value(row, "lifespan_years"), row.get("name", ""))),
     ]
     cols = []
     for label, value in badges:
@@ -103,9 +145,9 @@ def _make_detail_table(row: pd.Series) -> dbc.Table:
     display_name = DISPLAY_NAMES.get(name, name)
     fields = [
         ("Name", fmt(display_name)),
-        ("Quantity", fmt_sig2(row.get("quantity"))),
+        ("Quantity", fmt_sig2(raw_value(row, "quantity"))),
         ("Cost", fmt_cost(row.get("cost_usd"))),
-        ("Lifespan", _fmt_lifespan(row.get("lifespan_years"), name)),
+        ("Lifespan", _fmt_lifespan(raw_value(row, "lifespan_years"), name)),
     ]
     table_rows = [
         html.Tr([html.Th(label, style={"width": "35%"}), html.Td(value)])
@@ -127,8 +169,9 @@ def _make_cross_system_comparison(
     """Build a cross-system comparison table for equipment in the same process stage.
 
     Finds equipment items from other systems that share the same process stage as
-    the given equipment item, then renders a small comparison table highlighting
-    the best value per numeric metric column.
+    the given equipment item (one lookup in the data version's stage index,
+    src.data.stages), then renders a small comparison table highlighting the
+    best value per numeric metric column.
 
     Parameters
     ----------
@@ -146,41 +189,34 @@ def _make_cross_system_comparison(
     """
     # Determine the stage for the current equipment
     this_stage = get_equipment_stage(equipment_name, system)
+    index = stage_index(all_data)
 
     # Collect equivalents from other systems (same process stage)
     other_systems = [s for s in ("mechanical", "electrical") if s != system]
 
-    comparison_rows: list[dict] = []
-    # Include current item
-    this_df = all_data.get(system, pd.DataFrame())
-    this_row_df = this_df[this_df["name"] == equipment_name]
-    if not this_row_df.empty:
-        r = this_row_df.iloc[0]
-        raw_name = str(r.get("name", "N/A"))
-        raw_ls = r.get("lifespan_years")
-        comparison_rows.append({
-            "System": system.capitalize(),
+    def _comparison_row(sys_key: str, items: StageItems, i: int) -> dict:
+        # Cost and Years are typed (normalize_equipment()); Lifespan is the
+        # original cell, or the LIFESPAN_DEFAULTS fallback, for display.
+        raw_name = items.names[i]
+        raw_ls = items.lifespan[i]
+        return {
+            "System": sys_key.capitalize(),
             "Name": DISPLAY_NAMES.get(raw_name, raw_name),
-            "Cost": r.get("cost_usd"),
+            "Cost": float(items.cost[i]),
             "Lifespan": raw_ls if raw_ls is not None else LIFESPAN_DEFAULTS.get(raw_name, "indefinite"),
-        })
+            "Years": int(items.years[i]),
+        }
+
+    comparison_rows: list[dict] = []
+    # Include current item
+    offset = index.offset(system, equipment_name)
+    if offset is not None:
+        comparison_rows.append(_comparison_row(system, index.stage_items(this_stage, system), offset))
 
+    # Items of the other systems in the same process stage
     for other_sys in other_systems:
-        other_df = all_data.get(other_sys, pd.DataFrame())
-        if other_df.empty:
-            continue
-        # Find items in the same process stage
-        for _, other_row in other_df.iterrows():
-            other_stage = get_equipment_stage(str(other_row.get("name", "")), other_sys)
-            if other_stage == this_stage:
-                other_name = str(other_row.get("name", "N/A"))
-                raw_ls = other_row.get("lifespan_years")
-                comparison_rows.append({
-                    "System": other_sys.capitalize(),
-                    "Name": DISPLAY_NAMES.get(other_name, other_name),
-                    "Cost": other_row.get("cost_usd"),
-                    "Lifespan": raw_ls if raw_ls is not None else LIFESPAN_DEFAULTS.get(other_name, "indefinite"),
-                })
+        items = index.stage_items(this_stage, other_sys)
+        comparison_rows.extend(_comparison_row(other_sys, items, i) for i in range(len(items.names)))
 
     if len(comparison_rows) <= 1:
         return html.Div(
@@ -191,16 +227,11 @@ def _make_cross_system_comparison(
             className="mt-2",
         )
 
-    # Best values: lowest cost, highest lifespan
-    best_cost = None
-    best_lifespan = None
-    for r in comparison_rows:
-        c = pd.to_numeric(r["Cost"], errors="coerce")
-        if not pd.isna(c):
-            best_cost = min(best_cost, c) if best_cost is not None else c
-        ls = pd.to_numeric(r["Lifespan"], errors="coerce")
-        if not pd.isna(ls):
-            best_lifespan = max(best_lifespan, ls) if best_lifespan is not None else ls
+    # Best values: lowest cost, longest finite lifespan
+    costs = [r["Cost"] for r in comparison_rows if not math.isnan(r["Cost"])]
+    lifespans = [r["Years"] for r in comparison_rows if r["Years"] != LIFESPAN_INDEFINITE]
+    best_cost = min(costs) if costs else None
+    best_lifespan = max(lifespans) if lifespans else None
 
     # Build table rows
     header = html.Thead(
@@ -213,27 +244,16 @@ def _make_cross_system_comparison(
     )
     body_rows = []
     for comp_row in comparison_rows:
-        cost_raw = comp_row["Cost"]
-        cost_numeric = pd.to_numeric(cost_raw, errors="coerce")
-        cost_is_best = (
-            best_cost is not None
-            and not pd.isna(cost_numeric)
-            and float(cost_numeric) == best_cost
-        )
-
+        cost = comp_row["Cost"]
+        cost_is_best = best_cost is not None and cost == best_cost
         ls_raw = comp_row["Lifespan"]
-        ls_numeric = pd.to_numeric(ls_raw, errors="coerce")
-        ls_is_best = (
-            best_lifespan is not None
-            and not pd.isna(ls_numeric)
-            and float(ls_numeric) == best_lifespan
-        )
+        ls_is_best = best_lifespan is not None and comp_row["Years"] == best_lifespan
 
         best_style = {"color": "#28A745", "fontWeight": "bold"}
         cells = [
             html.Td(comp_row["System"], style={"fontWeight": "600"}),
             html.Td(comp_row["Name"], style={"fontSize": "0.85rem"}),
-            html.Td(fmt_cost(cost_raw), style=best_style if cost_is_best else {}),
+            html.Td(fmt_cost(cost), style=best_style if cost_is_best else {}),
             html.Td(_fmt_lifespan(ls_raw), style=best_style if ls_is_best else {}),
         ]
         body_rows.append(html.Tr(cells))
@@ -258,14 +278,22 @@ def _make_cross_system_comparison(
     )
 
 
+def _item_id(system: str, idx: int) -> str:
+    return f"item-{system}-{idx}"
+
+
 def _make_accordion_item(
     row: pd.Series,
     system: str,
     idx: int,
-    all_data: dict,
+    stage: str,
 ) -> dbc.AccordionItem:
     """Build a single accordion item for one equipment row.
 
+    Only the header is built here; the body is a placeholder that
+    load_equipment_body fills with make_equipment_body() when the item is
+    expanded.
+
     Parameters
     ----------
     row : pd.Series
@@ -273,9 +301,9 @@ def _make_accordion_item(
     system : str
         System key ("mechanical" or "electrical").
     idx : int
-        Row index (used for unique item IDs).
-    all_data : dict
-        Full data dictionary for cross-system comparison.
+        Row index (used for unique item IDs and to find the row again).
+    stage : str
+        Process stage of the accordion holding the item.
 
     Returns
     -------
@@ -295,28 +323,15 @@ def _make_accordion_item(
         ),
     ])
 
-    # Description uses original name since EQUIPMENT_DESCRIPTIONS keys match raw xlsx strings
-    description_text = EQUIPMENT_DESCRIPTIONS.get(name, "No description available.")
-    description = html.P(
-        description_text,
-        className="fst-italic text-muted small",
+    body = html.Div(
+        html.P("Loading details…", className="text-muted small fst-italic"),
+        id={"type": _BODY_TYPE, "system": system, "stage": stage, "item": int(idx), "name": name},
     )
 
-    # Detail content
-    detail_table = _make_detail_table(row)
-    cross_comparison = _make_cross_system_comparison(name, system, all_data)
-
-    content = html.Div([
-        description,
-        _make_summary_badges(row),
-        detail_table,
-        cross_comparison,
-    ])
-
     return dbc.AccordionItem(
-        content,
+        body,
         title=title,
-        item_id=f"item-{system}-{idx}",
+        item_id=_item_id(system, idx),
     )
 
 
@@ -324,16 +339,13 @@ def _make_accordion_item(
 # Public API
 # ──────────────────────────────────────────────────────────────────────────────
 
-def make_equipment_section(
-    df: pd.DataFrame,
-    system: str,
-    all_data: dict,
-) -> html.Div:
+def make_equipment_section(df: pd.DataFrame, system: str) -> html.Div:
     """Build the equipment grid for a given system.
 
     Groups equipment by process stage, renders each stage with a header and a
-    dbc.Accordion.  Each accordion item shows collapsed summary (name + cost)
-    and expanded detail (description, badges, data table, cross-system comparison).
+    dbc.Accordion.  Each accordion item shows collapsed summary (name + cost);
+    its expanded detail (description, badges, data table, cross-system
+    comparison) is loaded by load_equipment_body on first expansion.
 
     Parameters
     ----------
@@ -341,8 +353,6 @@ def make_equipment_section(
         Equipment DataFrame for the system being displayed.
     system : str
         System key: "mechanical", "electrical", or "hybrid".
-    all_data : dict
-        Full data dictionary from load_data() — passed to cross-system comparison.
 
     Returns
     -------
@@ -370,7 +380,7 @@ def make_equipment_section(
             continue
 
         accordion_items = [
-            _make_accordion_item(row, system, idx, all_data)
+            _make_accordion_item(row, system, idx, stage)
             for idx, row in items_in_stage
         ]
 
@@ -387,6 +397,7 @@ def make_equipment_section(
                 html.H5(stage, className=stage_class),
                 dbc.Accordion(
                     accordion_items,
+                    id={"type": _ACCORDION_TYPE, "system": system, "stage": stage},
                     always_open=False,
                     active_item=None,
                     className="shadow-sm",
@@ -403,3 +414,106 @@ def make_equipment_section(
         )
 
     return html.Div(sections)
+
+
+def make_equipment_body(row: pd.Series, system: str, all_data: dict) -> html.Div:
+    """Build the expanded body of one equipment accordion item.
+
+    Parameters
+    ----------
+    row : pd.Series
+        Equipment row from the system DataFrame.
+    system : str
+        System key: "mechanical", "electrical", or "hybrid".
+    all_data : dict
+        Full data dictionary from load_data() — passed to cross-system comparison.
+
+    Returns
+    -------
+    html.Div
+        Description, summary badges, detail table and cross-system comparison.
+    """
+    name = str(row.get("name", "Unknown"))
+
+    # Description uses original name since EQUIPMENT_DESCRIPTIONS keys match raw xlsx strings
+    description_text = EQUIPMENT_DESCRIPTIONS.get(name, "No description available.")
+    description = html.P(
+        description_text,
+        className="fst-italic text-muted small",
+    )
+
+    return html.Div([
+        description,
+        _make_summary_badges(row),
+        _make_detail_table(row),
+        _make_cross_system_comparison(name, system, all_data),
+    ])
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Lazy body callback
+# ──────────────────────────────────────────────────────────────────────────────
+
+_body_cache = LRUCache(_BODY_CACHE_SIZE)
+
+
+def _cached_body(system: str, idx: int, name: str):
+    """make_equipment_body() for row *idx* of *system* in the current data.
+
+    Memoized per (data version, system, row) in its JSON form, which is
+    shared between requests and must not be mutated.  *name* is the item
+    named in the page's header: when the current row at *idx* is another
+    item or no longer exists, the _STALE_BODY note is returned instead.
+    None when no data is published or *system* is not an equipment table.
+    """
+    snapshot = registry.current()
+    if snapshot is None or system not in _EQUIPMENT_SYSTEMS:
+        return None
+    df = snapshot.data.get(system)
+    if df is None:
+        return None
+    if idx not in df.index or str(df.loc[idx].get("name", "Unknown")) != name:
+        return _STALE_BODY
+    status = "hit"
+
+    def _build():
+        nonlocal status
+        status = "miss"
+        return json.loads(to_json_plotly(make_equipment_body(df.loc[idx], system, snapshot.data)))
+
+    body = _body_cache.get_or_compute((snapshot.version, system, idx), _build)
+    note_cache(status)
+    return body
+
+
+@callback(
+    Output({"type": _BODY_TYPE, "system": MATCH, "stage": MATCH, "item": ALL, "name": ALL}, "children"),
+    Input({"type": _ACCORDION_TYPE, "system": MATCH, "stage": MATCH}, "active_item"),
+    State({"type": _BODY_TYPE, "system": MATCH, "stage": MATCH, "item": ALL, "name": ALL}, "id"),
+    prevent_initial_call=True,
+)
+def load_equipment_body(active_item, body_ids):
+    """Render the body of the accordion item that was just expanded.
+
+    Parameters
+    ----------
+    active_item : str or None
+        item_id of the expanded item ("item-<system>-<idx>"), None when the
+        accordion was collapsed.
+    body_ids : list[dict]
+        Pattern-matching IDs of every body in the accordion.
+
+    Returns
+    -------
+    list
+        The rendered body for the expanded item (or a "data changed" note
+        when its row no longer holds that item), no_update for the others.
+    """
+    bodies = []
+    for body_id in body_ids:
+        if active_item != _item_id(body_id["system"], body_id["item"]):
+            bodies.append(no_update)
+            continue
+        body = _cached_body(body_id["system"], body_id["item"], body_id["name"])
+        bodies.append(no_update if body is None else body)
+    return bodies
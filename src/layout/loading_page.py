@@ -0,0 +1,68 @@
+"""
+src/layout/loading_page.py
+==========================
+Lightweight page served while data.xlsx is still being parsed in the
+background (ASYNC_STARTUP mode).
+
+create_loading_page() returns a spinner plus a clientside poll of the
+/ready endpoint.  As soon as the endpoint reports anything other than
+"loading" the browser reloads, and app.serve_layout() then returns either
+the dashboard shell or the error page.
+"""
+
+from dash import html, dcc, clientside_callback, Input, Output
+import dash_bootstrap_components as dbc
+
+# How often the loading page polls /ready (milliseconds).
+_POLL_INTERVAL_MS = 1000
+
+
+def create_loading_page() -> html.Div:
+    """
+    Build the full-page "loading data" placeholder.
+
+    Returns
+    -------
+    html.Div  — full-viewport centered spinner with a /ready poller.
+    """
+    return html.Div(
+        style={"minHeight": "100vh", "paddingTop": "2rem"},
+        children=[
+            dcc.Interval(id="loading-ready-poll", interval=_POLL_INTERVAL_MS),
+            html.Div(id="loading-ready-sink", style={"display": "none"}),
+            dbc.Container([
+                dbc.Row(
+                    dbc.Col([
+                        dbc.Spinner(color="primary", spinner_class_name="mt-5"),
+                        html.H4("Loading dashboard data…", className="mt-3"),
+                        html.P(
+                            "The page will refresh automatically once the data "
+                            "file has been read.",
+                            className="text-muted",
+                        ),
+                    ], width=8, className="text-center"),
+                    justify="center",
+                )
+            ]),
+        ],
+    )
+
+
+# Poll /ready in the browser; reload once the data is ready (or has failed,
+# so the error page is shown).  No server callback is involved.
+clientside_callback(
+    """
+    function(n_intervals) {
+        fetch("/ready", {cache: "no-store"})
+            .then(function(resp) { return resp.json(); })
+            .then(function(body) {
+                if (body.status !== "loading") window.location.reload();
+            })
+            .catch(function() {});
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output("loading-ready-sink", "children"),
+    Input("loading-ready-poll", "n_intervals"),
+    prevent_initial_call=True,
+)
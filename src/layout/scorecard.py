@@ -5,24 +5,18 @@ RAG scorecard comparison table for the system overview view.
 
 Exports
 -------
-set_data(data) -> None
-make_scorecard_table(mechanical_df, electrical_df, hybrid_df=None)
+make_scorecard_table(mechanical_df, electrical_df, hybrid_df=None, summary=None)
     Returns an html.Div containing the formatted comparison table with RAG
-    traffic-light dots. Accepts an optional hybrid_df for 3-column display.
+    traffic-light dots. Accepts an optional hybrid_df for 3-column display
+    and a precomputed scorecard summary (src/data/derived.py).
 """
 
 import pandas as pd
 from dash import html, clientside_callback, Input, Output
 import dash_bootstrap_components as dbc
 
-from src.config import RAG_COLORS
-from src.data.processing import (
-    compute_scorecard_metrics,
-    generate_comparison_text,
-    rag_color,
-    fmt_cost,
-    fmt_sig2,
-)
+from src.data.derived import scorecard_summary
+from src.data.processing import fmt_cost, fmt_sig2
 from src.layout.equipment_grid import make_equipment_section
 
 
@@ -47,28 +41,6 @@ clientside_callback(
 )
 
 
-# ──────────────────────────────────────────────────────────────────────────────
-# Module-level data reference — mirrors set_data() pattern from shell.py.
-# ──────────────────────────────────────────────────────────────────────────────
-
-_data: dict | None = None
-
-
-def set_data(data: dict) -> None:
-    """Store the loaded data dict for use in scorecard callbacks.
-
-    Called once from app.py after DATA is loaded, before any callbacks fire.
-    Mirrors the pattern used in shell.py and charts.py.
-
-    Parameters
-    ----------
-    data : dict
-        Data dict returned by load_data().
-    """
-    global _data
-    _data = data
-
-
 # ──────────────────────────────────────────────────────────────────────────────
 # Helper: RAG dot
 # ──────────────────────────────────────────────────────────────────────────────
@@ -108,12 +80,15 @@ def make_scorecard_table(
     mechanical_df: pd.DataFrame,
     electrical_df: pd.DataFrame,
     hybrid_df: pd.DataFrame | None = None,
+    summary: dict | None = None,
 ) -> html.Div:
     """Build the RAG scorecard comparison table.
 
-    Computes aggregate cost for Mechanical and Electrical systems, assigns
-    RAG colors (green = best, red = worst), and renders a bordered Bootstrap
-    table with colored dot indicators.
+    Renders aggregate cost for Mechanical and Electrical systems with their
+    RAG colors (green = best, red = worst) as a bordered Bootstrap table
+    with colored dot indicators.  The figures come from *summary* — the
+    scorecard stored with the data snapshot — or are computed from the
+    DataFrames when it is not given.
 
     An overall summary row counts which system has more green dots and declares
     the best overall system.
@@ -130,53 +105,30 @@ def make_scorecard_table(
     hybrid_df : pd.DataFrame or None, optional
         Equipment DataFrame for the hybrid system (from compute_hybrid_df()).
         When provided, a Hybrid column is added with RAG indicators.
+    summary : dict or None, optional
+        scorecard_summary() of the same DataFrames, e.g.
+        derived_metrics(data)["scorecard"].  Computed here when None.
 
     Returns
     -------
     html.Div
         Container holding the title, legend note, table, and summary row.
     """
-    # ── 1. Compute aggregate metrics ─────────────────────────────────────────
-    metrics = compute_scorecard_metrics(mechanical_df, electrical_df, hybrid_df)
+    # ── 1. Metrics, RAG colors and verdict (src/data/derived.py) ─────────────
+    if summary is None:
+        summary = scorecard_summary(mechanical_df, electrical_df, hybrid_df)
+    metrics = summary["metrics"]
     mech = metrics["mechanical"]
     elec = metrics["electrical"]
-    has_hybrid = hybrid_df is not None and "hybrid" in metrics
-    hyb = metrics.get("hybrid") if has_hybrid else None
-
-    # ── 2. Assign RAG colors per metric ──────────────────────────────────────
-    if has_hybrid:
-        cost_values   = {"mechanical": mech["cost"],                 "electrical": elec["cost"],                 "hybrid": hyb["cost"]}
-        dt_eff_values = {"mechanical": mech["drivetrain_efficiency"], "electrical": elec["drivetrain_efficiency"], "hybrid": hyb["drivetrain_efficiency"]}
-        lcow_values   = {"mechanical": mech["lcow"],                 "electrical": elec["lcow"],                 "hybrid": hyb["lcow"]}
-    else:
-        cost_values   = {"mechanical": mech["cost"],                 "electrical": elec["cost"]}
-        dt_eff_values = {"mechanical": mech["drivetrain_efficiency"], "electrical": elec["drivetrain_efficiency"]}
-        lcow_values   = {"mechanical": mech["lcow"],                 "electrical": elec["lcow"]}
-
-    cost_colors   = rag_color(cost_values,   metric="cost")
-    dt_eff_colors = rag_color(dt_eff_values, metric="drivetrain_efficiency")
-    lcow_colors   = rag_color(lcow_values,   metric="lcow")
-
-    # ── 3. Count green dots per system ───────────────────────────────────────
-    green_hex = RAG_COLORS["green"]
-    all_color_maps = [cost_colors, dt_eff_colors, lcow_colors]
-
-    mech_greens = sum(1 for colors in all_color_maps if colors.get("mechanical") == green_hex)
-    elec_greens = sum(1 for colors in all_color_maps if colors.get("electrical") == green_hex)
-    hyb_greens = sum(1 for colors in all_color_maps if colors.get("hybrid") == green_hex) if has_hybrid else 0
-
-    systems_greens = {"Mechanical": mech_greens, "Electrical": elec_greens}
-    if has_hybrid:
-        systems_greens["Hybrid"] = hyb_greens
+    has_hybrid = "hybrid" in metrics
+    hyb = metrics.get("hybrid")
 
-    best_overall = max(systems_greens, key=lambda k: systems_greens[k])
-    # Check for tie
-    max_greens = systems_greens[best_overall]
-    tied = [k for k, v in systems_greens.items() if v == max_greens]
-    if len(tied) > 1:
-        best_overall = "Tied"
+    cost_colors   = summary["colors"]["cost"]
+    dt_eff_colors = summary["colors"]["drivetrain_efficiency"]
+    lcow_colors   = summary["colors"]["lcow"]
+    best_overall  = summary["best_overall"]
 
-    # ── 4. Build table rows ───────────────────────────────────────────────────
+    # ── 2. Build table rows ───────────────────────────────────────────────────
     def _value_cell(value_str: str, color_hex: str) -> html.Td:
         return html.Td(
             [_make_rag_dot(color_hex), value_str],
@@ -236,7 +188,7 @@ def make_scorecard_table(
             html.Th("Electrical", style={"textAlign": "center"}),
         ])
 
-    # ── 5. Best overall summary row ───────────────────────────────────────────
+    # ── 3. Best overall summary row ───────────────────────────────────────────
     summary_row = html.Tr(
         html.Td(
             f"Best Overall: {best_overall}",
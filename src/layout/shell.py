@@ -3,7 +3,9 @@ src/layout/shell.py
 ===================
 App shell layout: top header bar, collapsible sidebar, and content area.
 
-create_layout(data) returns the full Dash component tree.  The sidebar toggle
+create_layout(data) returns the full Dash component tree.  Callbacks read
+the current data from src.data.registry, so a hot-reloaded workbook is
+picked up on the next render.  The sidebar toggle
 callback and navigation callbacks are registered here via the @callback
 decorator (Dash 4.0 style).
 
@@ -12,13 +14,33 @@ Navigation state is managed via a dcc.Store("active-system"):
   - "mechanical"  → mechanical system tab view
   - "electrical"  → electrical system tab view
   - "hybrid"      → hybrid system tab view (empty state until Phase 4)
+
+System views only change with the data, so with LAYOUT_CACHE on they are
+built once per (system, data version) — for all three systems as soon as a
+version is published — and stored pre-serialized: the component tree is
+encoded to JSON once and kept as the decoded plain dicts / lists, which Dash
+re-encodes in well under a millisecond instead of walking the component
+tree on every tab switch.
+
+With CLIENTSIDE_SLIDERS the scenario tables shipped in every page are taken
+from src.layout.charts.scenario_tables(), built once per data version from
+the compiled CostModel rather than on each page load.
 """
 
+import json
+
 import dash
 from dash import html, dcc, callback, Input, Output, State, ctx, ALL
 import dash_bootstrap_components as dbc
+from plotly.io.json import to_json_plotly
 
 from src.config import SYSTEM_COLORS  # available for future use by child components
+from src.config import CLIENTSIDE_SLIDERS, LAYOUT_CACHE
+from src.data.cache import LRUCache
+from src.data.registry import DataSnapshot, registry
+from src.layout.charts import scenario_tables
+from src.layout.loading_page import create_loading_page
+from src.metrics import note_cache
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
@@ -41,25 +63,6 @@ _SIDEBAR_STYLE_BASE = {
     "flexShrink": "0",
 }
 
-# Module-level data reference — avoids circular imports.
-# Populated by set_data() called from app.py after data is loaded.
-_data = None
-
-
-def set_data(data: dict) -> None:
-    """Store the loaded data dict for use in the render_content callback.
-
-    Called once from app.py after DATA is loaded, before any callbacks fire.
-
-    Parameters
-    ----------
-    data : dict
-        Data dict returned by load_data().
-    """
-    global _data
-    _data = data
-
-
 # ──────────────────────────────────────────────────────────────────────────────
 # Layout factory
 # ──────────────────────────────────────────────────────────────────────────────
@@ -71,8 +74,7 @@ def create_layout(data: dict) -> html.Div:
     Parameters
     ----------
     data : dict
-        Data dict returned by load_data().  Stored via set_data() for use in
-        the render_content callback.
+        Data dict returned by load_data() (the current registry snapshot).
 
     Returns
     -------
@@ -88,6 +90,13 @@ def create_layout(data: dict) -> html.Div:
         # Banner dismissed-state store — session-scoped first-visit guidance banner
         dcc.Store(id="store-banner-dismissed", data={"dismissed": False}),
 
+        # Precomputed chart tables for the clientside slider mode — shipped
+        # once per page load, read by assets/scenario_sliders.js
+        dcc.Store(
+            id="store-scenario-tables",
+            data=scenario_tables(data) if CLIENTSIDE_SLIDERS else None,
+        ),
+
         # ── Top header bar ─────────────────────────────────────────────────
         dbc.Navbar(
             dbc.Container([
@@ -242,8 +251,11 @@ def render_content(active_system):
     """Render the main page content based on the active-system store.
 
     - None → landing overview (create_overview_layout), no accent border
-    - string → system tab view (create_system_view_layout) with a 4px
-      colored top border matching the system color
+    - string → system tab view (create_system_view_layout, cached per
+      data version) with a 4px colored top border matching the system color;
+      the loading page instead while the registry holds no data yet (a tab
+      left open across a restart with ASYNC_STARTUP), which reloads the
+      browser once /ready stops reporting "loading"
 
     Imports are deferred inside this function to avoid circular imports at
     module load time.
@@ -262,13 +274,68 @@ def render_content(active_system):
     # Deferred imports — layout modules import from shell.py's module scope
     # so top-level imports would create circular dependencies.
     from src.layout.overview import create_overview_layout
-    from src.layout.system_view import create_system_view_layout
 
+    no_border = {**_BASE_CONTENT_STYLE, "borderTop": "4px solid transparent"}
     if active_system is None:
-        no_border = {**_BASE_CONTENT_STYLE, "borderTop": "4px solid transparent"}
         return create_overview_layout(), no_border
 
+    snapshot = registry.current()
+    if snapshot is None:
+        return create_loading_page(), no_border
+
     label = active_system.capitalize()
     hex_color = SYSTEM_COLORS.get(label, "#6c757d")
     border_style = {**_BASE_CONTENT_STYLE, "borderTop": f"4px solid {hex_color}"}
-    return create_system_view_layout(active_system, _data), border_style
+    return _system_view(active_system, snapshot), border_style
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# System view cache
+# ──────────────────────────────────────────────────────────────────────────────
+
+_VIEW_SYSTEMS = ("mechanical", "electrical", "hybrid")
+
+# Two versions' worth, so views of the outgoing version still being served
+# while a reload is published do not evict the new ones.
+_view_cache = LRUCache(2 * len(_VIEW_SYSTEMS) if LAYOUT_CACHE else 0)
+
+
+def _system_view(active_system: str, snapshot: DataSnapshot) -> dict:
+    """create_system_view_layout() for *snapshot*, cached per (system, version).
+
+    Returns the view in its JSON form (plain dicts and lists, as Dash
+    serializes components), which is shared between requests and must not
+    be mutated.  Reports "hit" / "miss" to the callback metrics.
+    """
+    from src.layout.system_view import create_system_view_layout
+
+    status = "hit"
+
+    def _build():
+        nonlocal status
+        status = "miss"
+        return json.loads(to_json_plotly(create_system_view_layout(active_system, snapshot.data)))
+
+    view = _view_cache.get_or_compute((active_system, snapshot.version), _build)
+    note_cache(status)
+    return view
+
+
+def _prewarm_system_views(snapshot: DataSnapshot) -> None:
+    """Registry listener: build every system view for a new data version.
+
+    Runs in the gunicorn master when preloading, so workers inherit the
+    built views and the first tab switch is already a cache hit.  Views of
+    older versions are left to the LRU bound to evict.
+    """
+    for system in _VIEW_SYSTEMS:
+        _system_view(system, snapshot)
+
+
+def system_view_cache_stats() -> dict:
+    """Hit / miss / eviction counters of the system view cache."""
+    return _view_cache.stats()
+
+
+if LAYOUT_CACHE:
+    registry.add_listener(_prewarm_system_views)
@@ -21,7 +21,7 @@ from src.config import SYSTEM_COLORS
 from src.layout.scorecard import make_scorecard_table
 from src.layout.equipment_grid import make_equipment_section
 from src.layout.charts import make_chart_section
-from src.data.processing import compute_scorecard_metrics, generate_comparison_text
+from src.data.derived import derived_metrics
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -135,22 +135,20 @@ def create_system_view_layout(active_system: str, data: dict) -> html.Div:
 
     # ── 3. Scorecard — always 3-column from BOM data ──────────────────────────
     # All three DataFrames are available from load_data(); no gating required.
+    # Metrics, colors and comparison text are computed once per snapshot.
+    derived = derived_metrics(data)
     initial_scorecard = make_scorecard_table(
-        data["mechanical"], data["electrical"], data.get("hybrid")
+        data["mechanical"], data["electrical"], data.get("hybrid"),
+        summary=derived["scorecard"],
     )
     scorecard_container = html.Div(
         initial_scorecard,
         id="scorecard-container",
     )
 
-    # ── 4. Comparison text — generated from BOM metrics at render time ────────
-    metrics = compute_scorecard_metrics(
-        data["mechanical"], data["electrical"], data.get("hybrid")
-    )
-    if "hybrid" in metrics:
-        comparison_str = generate_comparison_text(
-            metrics["hybrid"], metrics["mechanical"], metrics["electrical"]
-        )
+    # ── 4. Comparison text — generated from BOM metrics per snapshot ──────────
+    comparison_str = derived["comparison_text"]
+    if comparison_str is not None:
         comparison_content = html.P(
             comparison_str,
             className="text-muted small mt-2",
@@ -172,7 +170,7 @@ def create_system_view_layout(active_system: str, data: dict) -> html.Div:
 
     # ── 5. Equipment section — same pattern for all three systems ─────────────
     system_df = data.get(active_system, data.get("mechanical"))
-    equipment = make_equipment_section(system_df, active_system, data)
+    equipment = make_equipment_section(system_df, active_system)
 
     # ── 6. Chart section (no gate overlay) ───────────────────────────────────
     chart_wrapper = make_chart_section()
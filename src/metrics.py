@@ -0,0 +1,349 @@
+"""
+src/metrics.py
+==============
+In-process metrics: fixed-bucket histograms, counters and gauges, exposed
+on the Flask server in Prometheus text format (/metrics) and as a JSON
+summary (/metrics.json).
+
+instrument_dash() hooks the Dash callback dispatch route
+(/_dash-update-component).  Every server-side callback request records,
+labelled with the callback's function name (the output ID for callbacks
+without one):
+
+  dash_callback_duration_seconds   wall time
+  dash_callback_cpu_seconds        CPU time of the serving thread
+  dash_callback_request_bytes      request body size
+  dash_callback_response_bytes     response body size
+  dash_callback_requests_total     requests by HTTP status (500: callback raised)
+  dash_callback_cache_total        cache outcomes reported via note_cache()
+
+Clientside callbacks run in the browser and never reach these hooks.
+
+The data loader times its stages with stage() (data_load_stage_seconds) and
+reports parsed table sizes as gauges (data_load_rows).
+
+Histograms have fixed buckets, so memory stays constant however many
+requests are served.  Metrics are per process: under gunicorn each worker
+keeps its own and a scrape reads the worker that answers it (samples carry
+a worker="<pid>" label).
+
+app.py instruments the callbacks and serves the routes only with METRICS=1
+(off by default): the routes are unauthenticated and expose callback names
+and timings.
+
+Exports
+-------
+Histogram(buckets)                     — fixed-bucket histogram
+MetricsRegistry                        — named, labelled metrics
+metrics                                — process-wide MetricsRegistry
+stage(name)                            — context manager timing a load stage
+note_cache(status)                     — cache outcome of the current callback
+callback_name(app, output) -> str       — function name of the callback for an output
+instrument_dash(app)                   — request hooks + /metrics routes
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Buckets and metric descriptions
+# ──────────────────────────────────────────────────────────────────────────────
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (128, 512, 2_048, 8_192, 32_768, 131_072, 524_288, 2_097_152, 8_388_608)
+
+_HELP = {
+    "dash_callback_duration_seconds": "Wall time of Dash callback requests.",
+    "dash_callback_cpu_seconds":      "CPU time of the thread serving Dash callback requests.",
+    "dash_callback_request_bytes":    "Size of Dash callback request bodies.",
+    "dash_callback_response_bytes":   "Size of Dash callback response bodies.",
+    "dash_callback_requests_total":   "Dash callback requests by HTTP status (500: callback raised).",
+    "dash_callback_cache_total":      "Chart cache outcomes (grid, shared, hit, miss) per callback.",
+    "data_load_stage_seconds":        "Duration of data load stages.",
+    "data_load_rows":                 "Rows parsed per workbook table in the latest load.",
+}
+
+_DISPATCH_SUFFIX = "/_dash-update-component"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Metric types
+# ──────────────────────────────────────────────────────────────────────────────
+
+class Histogram:
+    """Counts of observations per fixed bucket, plus their sum.
+
+    Parameters
+    ----------
+    buckets : tuple of float
+        Increasing upper bounds; an implicit +Inf bucket follows the last.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[int]:
+        """Cumulative counts per bucket (Prometheus "le" semantics), +Inf last."""
+        out, running = [], 0
+        for n in self.counts:
+            running += n
+            out.append(running)
+        return out
+
+    def quantile(self, q: float) -> float:
+        """Estimate the *q* quantile by linear interpolation inside its bucket.
+
+        Observations in the +Inf bucket are reported as the last finite
+        bound, as Prometheus' histogram_quantile() does.  NaN when empty.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        running = 0
+        for i, n in enumerate(self.counts):
+            if n and running + n >= rank:
+                if i == len(self.buckets):
+                    return float(self.buckets[-1])
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - running) / n
+            running += n
+        return float(self.buckets[-1])
+
+
+def _label_key(labels: dict | None) -> tuple:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Thread-safe store of histograms, counters and gauges by name and labels."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._gauges: dict[str, dict[tuple, float]] = {}
+
+    def observe(self, name: str, value: float, labels: dict | None = None,
+                buckets: tuple[float, ...] = SECONDS_BUCKETS) -> None:
+        """Record *value* in histogram *name* (created with *buckets* on first use)."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, labels: dict | None = None, amount: float = 1) -> None:
+        """Add *amount* to counter *name*."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name: str, value: float, labels: dict | None = None) -> None:
+        """Set gauge *name* to *value*."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def clear(self) -> None:
+        """Drop every metric (tests)."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        worker = (("worker", str(os.getpid())),)
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                lines += [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} histogram"]
+                for key, h in sorted(series.items()):
+                    bounds = (*h.buckets, math.inf)
+                    for bound, total in zip(bounds, h.cumulative()):
+                        le = (("le", _format_value(float(bound))),)
+                        lines.append(f"{name}_bucket{_format_labels(key, worker + le)} {total}")
+                    lines.append(f"{name}_sum{_format_labels(key, worker)} {_format_value(h.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key, worker)} {h.count}")
+            for kind, table in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(table.items()):
+                    lines += [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} {kind}"]
+                    for key, value in sorted(series.items()):
+                        lines.append(f"{name}{_format_labels(key, worker)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        """JSON-ready digest: count / mean / p50 / p95 / p99 per histogram series.
+
+        Returns
+        -------
+        dict with keys:
+            "worker"     – process id
+            "histograms" – {name: [{"labels", "count", "sum", "mean", "p50", "p95", "p99"}]}
+            "counters"   – {name: [{"labels", "value"}]}
+            "gauges"     – {name: [{"labels", "value"}]}
+        """
+        def _finite(value: float) -> float | None:
+            return None if math.isnan(value) else value
+
+        with self._lock:
+            histograms = {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "count": h.count,
+                        "sum": h.sum,
+                        "mean": h.sum / h.count if h.count else None,
+                        "p50": _finite(h.quantile(0.50)),
+                        "p95": _finite(h.quantile(0.95)),
+                        "p99": _finite(h.quantile(0.99)),
+                    }
+                    for key, h in sorted(series.items())
+                ]
+                for name, series in sorted(self._histograms.items())
+            }
+            scalars = {
+                kind: {
+                    name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                    for name, series in sorted(table.items())
+                }
+                for kind, table in (("counters", self._counters), ("gauges", self._gauges))
+            }
+        return {"worker": os.getpid(), "histograms": histograms, **scalars}
+
+
+metrics = MetricsRegistry()
+
+
+def _rearm_after_fork() -> None:
+    """Child side of fork(): a load stage timed by a master thread may hold the lock."""
+    metrics._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_rearm_after_fork)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Load stages and cache outcomes
+# ──────────────────────────────────────────────────────────────────────────────
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as data_load_stage_seconds{stage=*name*}."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe("data_load_stage_seconds", time.perf_counter() - start, {"stage": name})
+
+
+_request_state = threading.local()
+
+
+def note_cache(status: str) -> None:
+    """Record a cache outcome ("grid", "shared", "hit", "miss") for the current callback.
+
+    Outside an instrumented callback request this is a no-op.
+    """
+    notes = getattr(_request_state, "cache", None)
+    if notes is not None:
+        notes.append(status)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dash instrumentation
+# ──────────────────────────────────────────────────────────────────────────────
+
+def callback_name(app, output: str) -> str:
+    """Function name of the callback writing *output*, else *output* itself."""
+    entry = app.callback_map.get(output) or {}
+    func = entry.get("callback")
+    func = getattr(func, "__wrapped__", func)
+    return getattr(func, "__name__", None) or output
+
+
+def instrument_dash(app) -> None:
+    """Record callback metrics on *app* and serve /metrics and /metrics.json."""
+    import flask
+
+    server = app.server
+
+    @server.before_request
+    def _start_callback_timer():
+        if flask.request.method == "POST" and flask.request.path.endswith(_DISPATCH_SUFFIX):
+            flask.g.metrics_start = (time.perf_counter(), time.thread_time())
+            _request_state.cache = []
+
+    @server.after_request
+    def _record_callback(response):
+        start = flask.g.pop("metrics_start", None)
+        if start is None:
+            return response
+        wall = time.perf_counter() - start[0]
+        cpu = time.thread_time() - start[1]
+        body = flask.request.get_json(silent=True) or {}
+        labels = {"callback": callback_name(app, body.get("output", "unknown"))}
+        metrics.observe("dash_callback_duration_seconds", wall, labels)
+        metrics.observe("dash_callback_cpu_seconds", cpu, labels)
+        metrics.observe("dash_callback_request_bytes", flask.request.content_length or 0,
+                        labels, BYTES_BUCKETS)
+        metrics.observe("dash_callback_response_bytes", response.calculate_content_length() or 0,
+                        labels, BYTES_BUCKETS)
+        metrics.inc("dash_callback_requests_total", {**labels, "code": str(response.status_code)})
+        for status in getattr(_request_state, "cache", None) or ():
+            metrics.inc("dash_callback_cache_total", {**labels, "status": status})
+        _request_state.cache = None
+        return response
+
+    @server.teardown_request
+    def _reset_cache_notes(exc):
+        _request_state.cache = None
+
+    @server.route("/metrics")
+    def prometheus_metrics():
+        """Prometheus scrape endpoint."""
+        return flask.Response(metrics.render_prometheus(),
+                              mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+    @server.route("/metrics.json")
+    def metrics_summary():
+        """JSON summary with estimated latency percentiles."""
+        return flask.jsonify(metrics.summary())
@@ -0,0 +1,396 @@
+"""
+src/profiling.py
+================
+On-demand cProfile captures of single Dash callback requests.
+
+With PROFILING=1 and a PROFILE_TOKEN configured, a request to
+/_dash-update-component is profiled when it carries the token as a query
+flag — either on the request itself (``?profile=<token>``, e.g. a request
+replayed with curl) or on the page that sent it (open the dashboard as
+``/?profile=<token>``; the browser sends the page URL as the Referer).
+Every other request runs unprofiled, and each worker profiles at most one
+request at a time.
+
+Each capture is written to PROFILE_DIR as four files sharing one id:
+
+  <id>.json       metadata: callback, wall time, per-phase times
+  <id>.txt        pstats report, sorted by cumulative time
+  <id>.prof       raw cProfile dump (snakeviz, pstats.Stats)
+  <id>.collapsed  collapsed stacks ("a;b;c <µs>") for flamegraph.pl /
+                  speedscope
+
+The directory is a ring buffer: only the newest PROFILE_KEEP captures are
+kept.  /_profiles?token=<token> lists them with links to the files, and the
+id is returned on the profiled response in the X-Profile-Capture header.
+
+The phase times split a capture into the parts of a chart callback:
+
+  chart_data  compute_chart_data() and friends, or the scenario grid read
+  figure      building or patching the Plotly figure
+  serialize   Dash's JSON encoding of the callback response
+
+cProfile records caller → callee totals, not full stacks, so the collapsed
+stacks are reconstructed by splitting each function's time over its callers
+in proportion; they are exact for functions with a single call path.
+
+Exports
+-------
+PHASES                                  — phase name → (file suffix, function) pairs
+phase_times(stats) -> dict[str, float]
+collapsed_stacks(stats) -> list[str]
+ProfileStore(directory, keep)           — on-disk ring buffer of captures
+install_profiling(app, token, store)    — request hooks + /_profiles routes
+"""
+
+from __future__ import annotations
+
+import cProfile
+import hmac
+import html
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+from src.metrics import callback_name
+
+# Functions whose cumulative time makes up each phase, as (path suffix,
+# function name) of their code objects.
+PHASES: dict[str, tuple[tuple[str, str], ...]] = {
+    "chart_data": (
+        ("src/data/processing.py", "compute_chart_data"),
+        ("src/data/processing.py", "compute_cost_chart_data"),
+        ("src/data/processing.py", "compute_energy_chart_data"),
+        ("src/data/grid.py", "cost_chart_data"),
+        ("src/data/grid.py", "energy_chart_data"),
+    ),
+    "figure": (
+        ("src/layout/charts.py", "build_cost_chart"),
+        ("src/layout/charts.py", "build_energy_bar_chart"),
+        ("src/layout/charts.py", "patch_cost_chart"),
+        ("src/layout/charts.py", "patch_energy_bar_chart"),
+    ),
+    "serialize": (
+        ("dash/_utils.py", "to_json"),
+    ),
+}
+
+_DISPATCH_SUFFIX = "/_dash-update-component"
+_SUFFIXES = (".json", ".txt", ".prof", ".collapsed")
+_STATS_LINES = 200        # rows of the pstats report
+_MAX_DEPTH = 128          # collapsed stack depth limit
+_MIN_MICROSECONDS = 1.0   # call paths below this are dropped from the stacks
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Analysis of pstats data
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _phase_of(func: tuple) -> str | None:
+    filename, _lineno, name = func
+    path = filename.replace(os.sep, "/")
+    for phase, entries in PHASES.items():
+        for suffix, function in entries:
+            if name == function and path.endswith(suffix):
+                return phase
+    return None
+
+
+def phase_times(stats: dict) -> dict[str, float]:
+    """Seconds spent in each of PHASES.
+
+    Parameters
+    ----------
+    stats : dict
+        pstats.Stats(...).stats: (file, line, function) →
+        (primitive calls, calls, self time, cumulative time, callers).
+
+    Returns
+    -------
+    dict[str, float]
+        Phase name → cumulative seconds.  Calls from one function of a phase
+        to another of the same phase are counted once.
+    """
+    matched = {func: phase for func in stats if (phase := _phase_of(func))}
+    totals = dict.fromkeys(PHASES, 0.0)
+    for func, phase in matched.items():
+        _cc, _nc, _tt, ct, callers = stats[func]
+        if not callers:
+            totals[phase] += ct
+            continue
+        totals[phase] += sum(
+            edge[3] for caller, edge in callers.items() if matched.get(caller) != phase
+        )
+    return totals
+
+
+def _frame_name(func: tuple) -> str:
+    filename, _lineno, name = func
+    if filename == "~":
+        return name.replace(";", ",")
+    return f"{Path(filename).name}:{name}".replace(";", ",")
+
+
+def collapsed_stacks(stats: dict) -> list[str]:
+    """Collapsed-stack lines ("root;caller;callee <microseconds>") of a profile.
+
+    Walks the call graph from the functions without recorded callers.  A
+    function reached over several paths has its time split between them in
+    proportion to the time each caller spent in it; recursive edges are cut.
+
+    Parameters
+    ----------
+    stats : dict
+        pstats.Stats(...).stats (see phase_times()).
+
+    Returns
+    -------
+    list[str]
+        Sorted lines with integer self time in microseconds.
+    """
+    children: dict[tuple, list[tuple]] = defaultdict(list)
+    roots = []
+    for func, (_cc, _nc, _tt, _ct, callers) in stats.items():
+        if not callers:
+            roots.append(func)
+        for caller in callers:
+            children[caller].append(func)
+
+    totals: dict[str, float] = defaultdict(float)
+
+    def walk(func: tuple, frames: tuple[str, ...], on_path: frozenset, fraction: float) -> None:
+        _cc, _nc, tt, _ct, _callers = stats[func]
+        frames = frames + (_frame_name(func),)
+        totals[";".join(frames)] += tt * fraction * 1e6
+        if len(frames) >= _MAX_DEPTH:
+            return
+        on_path = on_path | {func}
+        for child in children[func]:
+            if child in on_path:
+                continue
+            child_ct = stats[child][3]
+            edge_ct = stats[child][4][func][3] * fraction
+            if child_ct <= 0 or edge_ct * 1e6 < _MIN_MICROSECONDS:
+                continue
+            walk(child, frames, on_path, edge_ct / child_ct)
+
+    for root in roots:
+        walk(root, (), frozenset(), 1.0)
+    return sorted(
+        f"{stack} {int(round(us))}" for stack, us in totals.items() if us >= 0.5
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# On-disk ring buffer
+# ──────────────────────────────────────────────────────────────────────────────
+
+_ID_PATTERN = re.compile(r"^\d{8}-\d{6}-\d{3}-\d+-[\w.-]+$")
+
+
+class ProfileStore:
+    """Directory keeping the newest *keep* profile captures.
+
+    Parameters
+    ----------
+    directory : Path
+        Created on the first save.  Shared by all workers; capture ids carry
+        the worker pid so they never collide.
+    keep : int
+        Number of captures kept; older ones are deleted after each save.
+    """
+
+    def __init__(self, directory: Path, keep: int):
+        self.directory = Path(directory)
+        self.keep = max(1, int(keep))
+
+    def save(self, profile: cProfile.Profile, callback: str, wall: float) -> str:
+        """Write *profile* as a capture and trim the buffer; returns its id."""
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        safe = re.sub(r"[^\w.-]", "_", callback)[:80] or "callback"
+        capture_id = f"{stamp}-{int(now * 1000) % 1000:03d}-{os.getpid()}-{safe}"
+
+        stats = pstats.Stats(profile)
+        phases = phase_times(stats.stats)
+        report = io.StringIO()
+        report.write(f"callback: {callback}\nwall: {wall * 1000:.2f} ms\n")
+        for phase, seconds in phases.items():
+            report.write(f"{phase}: {seconds * 1000:.2f} ms\n")
+        report.write("\n")
+        stats.stream = report
+        stats.sort_stats("cumulative").print_stats(_STATS_LINES)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.directory / capture_id
+        profile.dump_stats(str(base.with_name(capture_id + ".prof")))
+        base.with_name(capture_id + ".txt").write_text(report.getvalue(), encoding="utf-8")
+        base.with_name(capture_id + ".collapsed").write_text(
+            "\n".join(collapsed_stacks(stats.stats)) + "\n", encoding="utf-8",
+        )
+        meta = {
+            "id": capture_id,
+            "callback": callback,
+            "time": now,
+            "pid": os.getpid(),
+            "wall_seconds": wall,
+            "phases": phases,
+        }
+        # Metadata last: a capture is listed only once all its files exist.
+        base.with_name(capture_id + ".json").write_text(json.dumps(meta), encoding="utf-8")
+        self._trim()
+        return capture_id
+
+    def _trim(self) -> None:
+        ids = sorted(p.stem for p in self.directory.glob("*.json"))
+        for capture_id in ids[:-self.keep]:
+            for suffix in _SUFFIXES:
+                (self.directory / (capture_id + suffix)).unlink(missing_ok=True)
+
+    def captures(self) -> list[dict]:
+        """Metadata of the stored captures, newest first."""
+        if not self.directory.is_dir():
+            return []
+        out = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                out.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue  # trimmed or half-written by another worker
+        return out
+
+    def file(self, name: str) -> Path | None:
+        """Path of capture file *name* ("<id><suffix>"), or None if unknown."""
+        stem, suffix = os.path.splitext(name)
+        if suffix not in _SUFFIXES or not _ID_PATTERN.match(stem):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Flask wiring
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _token_matches(given: str | None, token: str) -> bool:
+    return bool(given) and hmac.compare_digest(given.encode(), token.encode())
+
+
+def _profile_flag(request) -> str | None:
+    """The ?profile= value of the request, else of the page that sent it."""
+    flag = request.args.get("profile")
+    if flag is None and request.referrer:
+        flag = (parse_qs(urlsplit(request.referrer).query).get("profile") or [None])[0]
+    return flag
+
+
+def _listing_page(captures: list[dict], token: str) -> str:
+    query = "?token=" + quote(token, safe="")
+    rows = []
+    for meta in captures:
+        capture_id = html.escape(meta["id"])
+        links = " ".join(
+            f'<a href="/_profiles/{capture_id}{suffix}{html.escape(query)}">{suffix[1:]}</a>'
+            for suffix in (".txt", ".collapsed", ".prof")
+        )
+        phases = meta.get("phases", {})
+        cells = "".join(f"<td>{phases.get(p, 0.0) * 1000:.1f}</td>" for p in PHASES)
+        rows.append(
+            f"<tr><td>{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta['time']))}</td>"
+            f"<td>{html.escape(meta['callback'])}</td><td>{meta['pid']}</td>"
+            f"<td>{meta['wall_seconds'] * 1000:.1f}</td>{cells}<td>{links}</td></tr>"
+        )
+    header = "".join(f"<th>{p} (ms)</th>" for p in PHASES)
+    body = "\n".join(rows) or f'<tr><td colspan="{5 + len(PHASES)}">No captures yet.</td></tr>'
+    return (
+        "<!doctype html><html><head><title>Profile captures</title>"
+        "<style>body{font-family:sans-serif}td,th{padding:2px 10px;text-align:left}</style>"
+        "</head><body><h1>Profile captures</h1>"
+        "<p>Open the dashboard with <code>?profile=&lt;token&gt;</code> to profile its callbacks.</p>"
+        f"<table><tr><th>Time</th><th>Callback</th><th>Worker</th><th>Wall (ms)</th>{header}"
+        f"<th>Files</th></tr>\n{body}\n</table></body></html>"
+    )
+
+
+def install_profiling(app, token: str, store: ProfileStore) -> None:
+    """Profile flagged callback requests on *app* and serve /_profiles.
+
+    Parameters
+    ----------
+    app : dash.Dash
+    token : str
+        Admin token; required for both profiling and the listing.
+    store : ProfileStore
+        Where captures are written.
+    """
+    import flask
+
+    if not token:
+        raise ValueError("install_profiling() needs a non-empty admin token")
+
+    server = app.server
+    busy = threading.Lock()
+
+    def _stop():
+        profiling = flask.g.pop("profiling", None)
+        if profiling is None:
+            return None
+        profiling[0].disable()
+        busy.release()
+        return profiling
+
+    @server.before_request
+    def _start_profile():
+        request = flask.request
+        if request.method != "POST" or not request.path.endswith(_DISPATCH_SUFFIX):
+            return
+        if not _token_matches(_profile_flag(request), token):
+            return
+        if not busy.acquire(blocking=False):
+            return  # another request of this worker is being profiled
+        profile = cProfile.Profile()
+        flask.g.profiling = (profile, time.perf_counter())
+        profile.enable()
+
+    @server.after_request
+    def _save_profile(response):
+        profiling = _stop()
+        if profiling is None:
+            return response
+        profile, start = profiling
+        wall = time.perf_counter() - start
+        body = flask.request.get_json(silent=True) or {}
+        capture_id = store.save(profile, callback_name(app, body.get("output", "unknown")), wall)
+        response.headers["X-Profile-Capture"] = capture_id
+        return response
+
+    @server.teardown_request
+    def _abandon_profile(exc):
+        _stop()
+
+    @server.route("/_profiles")
+    def profile_listing():
+        """Admin page listing the stored captures."""
+        given = flask.request.args.get("token")
+        if not _token_matches(given, token):
+            flask.abort(403)
+        return _listing_page(store.captures(), given)
+
+    @server.route("/_profiles/<name>")
+    def profile_file(name):
+        """One file of a capture."""
+        if not _token_matches(flask.request.args.get("token"), token):
+            flask.abort(403)
+        path = store.file(name)
+        if path is None:
+            flask.abort(404)
+        mimetype = "application/json" if name.endswith(".json") else (
+            "application/octet-stream" if name.endswith(".prof") else "text/plain"
+        )
+        return flask.send_file(path, mimetype=mimetype, as_attachment=name.endswith(".prof"))
@@ -0,0 +1,86 @@
+"""
+tests/sample_data.py
+====================
+Synthetic data dicts shared by the test modules.
+
+minimal_data() builds the smallest dict the cost model, the chart data
+functions and the chart callbacks accept: one turbine per system, an
+11-row linear battery lookup and two-point energy lookups.  Every part can
+be overridden, so tests only spell out the rows that matter to them.
+
+Exports
+-------
+EQUIPMENT_COLUMNS                                         — equipment DataFrame columns
+minimal_data(turbine_cost=1_000_000, **overrides) -> dict
+cycle_data(battery, electrical=()) -> dict
+    minimal_data() with replacement cycles, a battery row and an
+    "indefinite" lifespan
+"""
+
+import pandas as pd
+
+from src.data.processing import BATTERY_ITEM_NAME
+
+EQUIPMENT_COLUMNS = ["name", "quantity", "cost_usd", "lifespan_years"]
+
+
+def minimal_data(
+    turbine_cost: float = 1_000_000,
+    *,
+    mechanical: list | None = None,
+    electrical: list | None = None,
+    hybrid: list = (),
+    battery: tuple[float, float] = (0.0, 100_000.0),
+    tds: tuple[list, list] = ([0, 1000], [0.0, 100.0]),
+    depth: tuple[list, list] = ([0, 1000], [0.0, 100.0]),
+) -> dict:
+    """Minimal data dict accepted by compute_chart_data() and CostModel.
+
+    Parameters
+    ----------
+    turbine_cost : float, optional
+        Cost of the mechanical turbine in the default mechanical rows.
+    mechanical, electrical, hybrid : list, optional
+        [name, quantity, cost_usd, lifespan_years] rows.  Default to one
+        turbine (mechanical at *turbine_cost*, electrical at $2M, both 25
+        years) and no hybrid rows.
+    battery : tuple[float, float], optional
+        (base, slope) of the battery lookup: total_cost = base + slope * f
+        at fractions f = 0.0, 0.1, ..., 1.0.
+    tds, depth : tuple[list, list], optional
+        (x, y) points of the TDS and depth energy lookups.
+    """
+    if mechanical is None:
+        mechanical = [["Turbine", 1, turbine_cost, 25]]
+    if electrical is None:
+        electrical = [["Turbine", 1, 2_000_000, 25]]
+    fractions = [i * 0.1 for i in range(11)]
+    base, slope = battery
+    return {
+        "mechanical": pd.DataFrame(list(mechanical), columns=EQUIPMENT_COLUMNS),
+        "electrical": pd.DataFrame(list(electrical), columns=EQUIPMENT_COLUMNS),
+        "hybrid": pd.DataFrame(list(hybrid), columns=EQUIPMENT_COLUMNS),
+        "battery_lookup": pd.DataFrame({
+            "battery_fraction": fractions,
+            "total_cost": [base + f * slope for f in fractions],
+        }),
+        "tds_lookup": pd.DataFrame({"tds_ppm": tds[0], "ro_energy_kw": tds[1]}),
+        "depth_lookup": pd.DataFrame({"depth_m": depth[0], "pump_energy_kw": depth[1]}),
+    }
+
+
+def cycle_data(battery: tuple[float, float], electrical: list = ()) -> dict:
+    """minimal_data() with replacement cycles and a battery row.
+
+    Adds a 12-year gearbox, the battery row (priced by the slider) and
+    *electrical* extra rows, "indefinite" hybrid pipes, a three-point TDS
+    lookup and a depth lookup with a non-zero base.
+    """
+    return minimal_data(
+        mechanical=[["Turbine", 1, 1_000_000, 25], ["Gearbox", 1, 150_000, 12]],
+        electrical=[["Turbine", 1, 2_000_000, 25], [BATTERY_ITEM_NAME, 1, 999, 15], *electrical],
+        hybrid=[["Pipes (total)", 1, 500_000, "indefinite"]],
+        battery=battery,
+        tds=([0, 1000, 2000], [0.0, 40.0, 100.0]),
+        depth=([0, 1000], [5.0, 105.0]),
+    )
@@ -0,0 +1,138 @@
+"""
+tests/test_chart_builders.py
+============================
+Tests for the Plotly figure builders in src/layout/charts.py.
+
+The clientside legend callbacks re-filter figures in the browser, so the
+builders must always emit a stable trace list and carry enough data to
+restore hidden systems.  Verifies that:
+  - build_energy_bar_chart() always emits one trace per stage
+  - Hidden systems are dropped from x/y but kept in each trace's meta
+  - The "all systems hidden" annotation is present and toggled via visible
+  - build_cost_chart() marks hidden systems "legendonly"
+  - patch_cost_chart() / patch_energy_bar_chart() applied to a skeleton
+    reproduce a full rebuild
+  - The chart callbacks send a Patch only when the figure store is populated
+"""
+
+import json
+from unittest import mock
+
+import numpy as np
+import plotly
+import pytest
+from dash import Patch
+
+import src.layout.charts as charts
+from src.data.registry import registry
+from src.layout.charts import (
+    build_cost_chart,
+    build_energy_bar_chart,
+    patch_cost_chart,
+    patch_energy_bar_chart,
+)
+from tests.sample_data import minimal_data
+
+_ALL = {"mechanical": True, "electrical": True, "hybrid": True}
+
+
+def _to_json(fig) -> dict:
+    """Figure as the browser receives it (plain JSON types)."""
+    return json.loads(json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def _apply_patch(figure: dict, patch) -> dict:
+    """Apply a dash.Patch made only of Assign operations, as the renderer does."""
+    for op in patch.to_plotly_json()["operations"]:
+        assert op["operation"] == "Assign"
+        *path, last = op["location"]
+        target = figure
+        for key in path:
+            target = target[key]
+        target[last] = op["params"]["value"]
+    return figure
+
+_ENERGY = {
+    "Groundwater Extraction": 10.0,
+    "RO Desalination": 20.0,
+    "Brine Reinjection": 5.0,
+}
+
+
+class TestBuildEnergyBarChart:
+    """Stacked power chart structure."""
+
+    def test_hidden_system_kept_in_meta(self):
+        """A hidden system is absent from x/y but present in meta."""
+        fig = build_energy_bar_chart(_ENERGY, _ENERGY, _ENERGY, {"electrical": False})
+        assert len(fig.data) == 3
+        for trace in fig.data:
+            assert list(trace.x) == ["Mechanical", "Hybrid"]
+            assert trace.meta["systems"] == ["Mechanical", "Electrical", "Hybrid"]
+            assert len(trace.meta["values"]) == 3
+        assert fig.layout.annotations[0].visible is False
+
+    def test_all_hidden_keeps_traces(self):
+        """With every system hidden, traces remain (empty) and the hint shows."""
+        fig = build_energy_bar_chart(
+            _ENERGY, _ENERGY, _ENERGY,
+            {"mechanical": False, "electrical": False, "hybrid": False},
+        )
+        assert len(fig.data) == 3
+        assert all(len(trace.x) == 0 for trace in fig.data)
+        assert fig.layout.annotations[0].visible is True
+        assert fig.layout.xaxis.visible is False
+
+
+class TestBuildCostChart:
+    """Cumulative cost chart visibility."""
+
+    def test_legendonly_for_hidden(self):
+        """Hidden systems stay in the figure as legendonly traces."""
+        series = np.arange(11, dtype=float)
+        fig = build_cost_chart(10, series, series, series, {"hybrid": False})
+        assert [trace.visible for trace in fig.data] == [True, True, "legendonly"]
+        assert [trace.name for trace in fig.data] == ["Mechanical", "Electrical", "Hybrid"]
+
+
+class TestFigurePatches:
+    """Patched skeletons match freshly built figures."""
+
+    def test_cost_patch_matches_rebuild(self):
+        """Changing horizon and values via Patch equals a full rebuild."""
+        old = np.arange(51, dtype=float)
+        new = [np.arange(51, dtype=float) * k for k in (2, 3, 4)]
+        figure = _to_json(build_cost_chart(50, old, old, old, _ALL))
+        patched = _apply_patch(figure, patch_cost_chart(20, *new))
+        expected = _to_json(build_cost_chart(20, *new, _ALL))
+        assert patched == expected
+
+    def test_energy_patch_matches_rebuild(self):
+        """Changing bar values via Patch equals a full rebuild."""
+        figure = _to_json(build_energy_bar_chart(_ENERGY, _ENERGY, _ENERGY, _ALL))
+        changed = dict(_ENERGY, **{"RO Desalination": 99.0})
+        patched = _apply_patch(figure, patch_energy_bar_chart(changed, _ENERGY, {}))
+        expected = _to_json(build_energy_bar_chart(changed, _ENERGY, {}, _ALL))
+        assert patched == expected
+
+
+class TestChartCallbacks:
+    """Slider moves patch the stored figure only when there is one."""
+
+    @pytest.fixture(autouse=True)
+    def _slider_move(self, monkeypatch):
+        """Live data without a grid file; every call is triggered by a slider."""
+        monkeypatch.setattr(charts, "SCENARIO_GRID", False)
+        monkeypatch.setattr(charts, "ctx", mock.Mock(triggered_id="slider-battery"))
+        registry.publish(minimal_data())
+
+    @pytest.mark.parametrize("update,args", [
+        (charts.update_cost_chart, (20, 0.3)),
+        (charts.update_power_chart, (950, 433)),
+    ])
+    def test_patch_needs_figure(self, update, args):
+        """An empty store gets the full figure; a populated one a Patch."""
+        full = update(*args, None)[0]
+        assert not isinstance(full, Patch) and len(full.data) > 0
+        assert isinstance(update(*args, _to_json(full))[0], Patch)
+
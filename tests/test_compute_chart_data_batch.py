@@ -0,0 +1,89 @@
+"""
+tests/test_compute_chart_data_batch.py
+======================================
+Tests for the vectorized scenario sweep compute_chart_data_batch().
+
+Verifies that:
+  - Every scenario row matches a scalar compute_chart_data() call
+  - Cost tensors are NaN-padded past each scenario's horizon
+  - Scalars broadcast against arrays; incompatible shapes raise ValueError
+  - TDS values above the lookup table are extrapolated like interpolate_energy()
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import numpy as np
+import pytest
+
+from src.data.processing import (
+    compute_chart_data,
+    compute_chart_data_batch,
+)
+from tests.sample_data import cycle_data
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+
+@pytest.fixture()
+def data() -> dict:
+    """Data dict with replacement cycles and a battery row in the electrical BOM."""
+    return cycle_data((50_000, 100_000), electrical=[["Inverter", 1, "n/a", 10]])
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestComputeChartDataBatch:
+    """Batch results equal the scalar function scenario by scenario."""
+
+    def test_matches_scalar_calls(self, data):
+        """Random scenarios reproduce compute_chart_data() row by row."""
+        rng = np.random.default_rng(1)
+        n = 40
+        years = rng.integers(0, 51, n)
+        battery = rng.random(n)
+        tds = rng.uniform(0, 5000, n)
+        depth = rng.uniform(0, 1900, n)
+
+        batch = compute_chart_data_batch(data, years, battery, tds, depth)
+
+        for i in range(n):
+            ref = compute_chart_data(data, battery[i], int(years[i]), tds_ppm=tds[i], depth_m=depth[i])
+            end = years[i] + 1
+            for sys_key in ("mechanical", "electrical", "hybrid"):
+                np.testing.assert_allclose(
+                    batch["cost_over_time"][sys_key][i, :end], ref["cost_over_time"][sys_key]
+                )
+                for stage, kw in ref["energy_breakdown"][sys_key].items():
+                    assert batch["energy_breakdown"][sys_key][stage][i] == pytest.approx(kw)
+            assert batch["electrical_total_cost"][i] == pytest.approx(ref["electrical_total_cost"])
+
+    def test_nan_padding_past_horizon(self, data):
+        """Entries beyond a scenario's own horizon are NaN."""
+        batch = compute_chart_data_batch(data, years=[5, 10])
+        mech = batch["cost_over_time"]["mechanical"]
+        assert mech.shape == (2, 11)
+        assert np.isnan(mech[0, 6:]).all()
+        assert not np.isnan(mech[1]).any()
+
+    def test_scalar_broadcast(self, data):
+        """Scalars broadcast against an array parameter."""
+        batch = compute_chart_data_batch(data, years=20, battery_fraction=[0.0, 0.5, 1.0])
+        assert batch["years"].tolist() == [20, 20, 20]
+        assert batch["cost_over_time"]["electrical"].shape == (3, 21)
+        assert batch["electrical_total_cost"].tolist() == pytest.approx(
+            [2_000_000 + 50_000, 2_000_000 + 100_000, 2_000_000 + 150_000]
+        )
+
+    def test_shape_mismatch_raises(self, data):
+        """Incompatible parameter shapes raise ValueError."""
+        with pytest.raises(ValueError):
+            compute_chart_data_batch(data, years=[1, 2], battery_fraction=[0.1, 0.2, 0.3])
+
+    def test_negative_years_raises(self, data):
+        """Negative horizons are rejected."""
+        with pytest.raises(ValueError):
+            compute_chart_data_batch(data, years=[-1, 5])
@@ -0,0 +1,169 @@
+"""
+tests/test_compute_cost_over_time.py
+====================================
+Reference-vs-vectorized equivalence tests for compute_cost_over_time().
+
+_reference_cost_over_time() below is the original row-by-row implementation
+(Python loop over rows and over range(0, years+1, lifespan)), with cells read
+through parse_quantity().  The vectorized engine must reproduce it for:
+  - Numeric, annotated ("about 15"), "indefinite", missing (LIFESPAN_DEFAULTS)
+    and unparseable lifespans
+  - Per-unit costs ("$ 2500 per ton", priced by quantity) and override_costs
+  - Randomized BOMs and horizons up to several hundred years
+
+Also covers the new per-item output and monthly resolution.
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import LIFESPAN_DEFAULTS
+from src.data.processing import compute_cost_over_time
+from src.data.units import is_rate, parse_quantity
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reference implementation (pre-vectorization behaviour)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _reference_cost_over_time(df, years=50, override_costs=None):
+    annual = np.zeros(years + 1)
+    for _, row in df.iterrows():
+        cost, cost_unit, _ = parse_quantity(row["cost_usd"])
+        if is_rate(cost_unit):
+            quantity, quantity_unit, _ = parse_quantity(row["quantity"])
+            cost = cost * quantity if quantity_unit in ("", cost_unit[1:]) else np.nan
+        if pd.isna(cost):
+            continue
+        if override_costs is not None and row["name"] in override_costs:
+            cost = override_costs[row["name"]]
+        lifespan = row["lifespan_years"]
+        if lifespan is None:
+            lifespan = LIFESPAN_DEFAULTS.get(row["name"], "indefinite")
+        if isinstance(lifespan, str) and lifespan.strip().lower() == "indefinite":
+            annual[0] += cost
+        else:
+            years_parsed = parse_quantity(lifespan).magnitude
+            if not years_parsed >= 1:
+                annual[0] += cost
+                continue
+            lifespan_int = int(years_parsed)
+            for yr in range(0, years + 1, lifespan_int):
+                annual[yr] += cost
+    return np.cumsum(annual)
+
+
+def _make_equipment_df(rows: list[tuple]) -> pd.DataFrame:
+    """Build an equipment DataFrame from (name, cost_usd, lifespan_years) tuples."""
+    return pd.DataFrame(
+        [{"name": n, "quantity": 1, "cost_usd": c, "lifespan_years": ls} for n, c, ls in rows],
+        columns=["name", "quantity", "cost_usd", "lifespan_years"],
+    )
+
+
+def _random_bom(n_rows: int, seed: int) -> pd.DataFrame:
+    """Random BOM mixing every lifespan/cost form the loader can produce."""
+    rng = np.random.default_rng(seed)
+    lifespan_pool = [1, 2, 5, 7, 12, 15, 20, 25, 30, 60, "indefinite", "Indefinite ", None, "n/a", 12.9]
+    rows = []
+    for i in range(n_rows):
+        cost = float(rng.integers(1, 5_000_000))
+        if rng.random() < 0.1:
+            cost = "$ 2500 per ton"
+        rows.append((f"Item {i % 7}", cost, lifespan_pool[rng.integers(len(lifespan_pool))]))
+    rows.append(("RO Membrane Trains", 90_000, None))   # LIFESPAN_DEFAULTS → 7
+    return _make_equipment_df(rows)
+
+
+@pytest.fixture()
+def mixed_df() -> pd.DataFrame:
+    return _make_equipment_df([
+        ("Turbine", 1_000_000, 25),
+        ("RO Membrane Trains", 350_000, None),
+        ("Pipes (total)", 2_000_000, "indefinite"),
+        ("Tank", "$ 2500 per ton", 10),
+        ("Valve", 8_000, "about 15"),
+        ("Pump", 60_000, 15.0),
+    ])
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Equivalence
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestReferenceEquivalence:
+    """Vectorized engine matches the row-by-row reference."""
+
+    @pytest.mark.parametrize("years", [0, 1, 7, 24, 50])
+    def test_mixed_lifespans(self, mixed_df, years):
+        """Numeric, default, indefinite and unparseable lifespans agree at each horizon."""
+        np.testing.assert_allclose(
+            compute_cost_over_time(mixed_df, years),
+            _reference_cost_over_time(mixed_df, years),
+        )
+
+    def test_override_costs(self, mixed_df):
+        """Overrides replace the costs of the named rows, per-unit ones included."""
+        overrides = {"Pump": 1.5, "Tank": 99.0}
+        np.testing.assert_allclose(
+            compute_cost_over_time(mixed_df, 50, override_costs=overrides),
+            _reference_cost_over_time(mixed_df, 50, override_costs=overrides),
+        )
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_boms_long_horizon(self, seed):
+        """Randomized 200-row BOMs agree over a 300-year horizon."""
+        df = _random_bom(200, seed)
+        years = 300
+        np.testing.assert_allclose(
+            compute_cost_over_time(df, years),
+            _reference_cost_over_time(df, years),
+        )
+
+    def test_empty_dataframe(self):
+        """An empty BOM yields a zero series of length years + 1."""
+        result = compute_cost_over_time(_make_equipment_df([]), 10)
+        assert result.shape == (11,)
+        assert not result.any()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Per-item series and monthly resolution
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestPerItemAndResolution:
+    """New outputs: per-item cumulative series and sub-annual steps."""
+
+    def test_per_item_sums_to_total(self, mixed_df):
+        """Per-item rows sum to the aggregate series."""
+        total, items = compute_cost_over_time(mixed_df, 50, per_item=True)
+        assert items.shape == (len(mixed_df), 51)
+        np.testing.assert_allclose(items.sum(axis=0), total)
+        np.testing.assert_allclose(total, compute_cost_over_time(mixed_df, 50))
+
+    def test_per_item_rows_follow_dataframe_order(self, mixed_df):
+        """Row i of the per-item matrix belongs to DataFrame row i."""
+        _, items = compute_cost_over_time(mixed_df, 50, per_item=True)
+        # Turbine (25 y): bought at years 0, 25, 50
+        assert items[0, 24] == 1_000_000
+        assert items[0, 25] == 2_000_000
+        assert items[0, 50] == 3_000_000
+        # Tank costs $2500 per ton at quantity 1, replaced every 10 years
+        assert items[3, 0] == 2_500
+        assert items[3, 50] == 6 * 2_500
+
+    def test_monthly_resolution_matches_yearly_samples(self, mixed_df):
+        """Every 12th monthly step equals the yearly series."""
+        monthly = compute_cost_over_time(mixed_df, 50, steps_per_year=12)
+        yearly = compute_cost_over_time(mixed_df, 50)
+        assert monthly.shape == (50 * 12 + 1,)
+        np.testing.assert_allclose(monthly[::12], yearly)
+
+    def test_hundreds_of_years_monthly(self, mixed_df):
+        """A 500-year monthly horizon still matches the reference at year boundaries."""
+        result = compute_cost_over_time(mixed_df, 500, steps_per_year=12)
+        assert result.shape == (6001,)
+        np.testing.assert_allclose(result[::12], _reference_cost_over_time(mixed_df, 500))
@@ -0,0 +1,119 @@
+"""
+tests/test_cost_model.py
+========================
+Tests for the precompiled CostModel in src/data/processing.py.
+
+Verifies that CostModel queries reproduce the DataFrame-based reference
+(compute_cost_over_time with the battery override) for:
+  - Mixed numeric / "indefinite" / missing / unparseable lifespans
+  - Non-numeric costs (dropped) and the battery slider override
+  - Every horizon up to the model's maximum and several battery fractions
+  - The live electrical total cost readout
+  - All arrays are views into one flat, read-only buffer
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import numpy as np
+import pytest
+
+from src.data.processing import (
+    BATTERY_ITEM_NAME,
+    CostModel,
+    compute_chart_data,
+    compute_cost_over_time,
+    interpolate_battery_cost,
+)
+from tests.sample_data import minimal_data
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures — synthetic data dict
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _rows(rows: list[tuple]) -> list[list]:
+    """Equipment rows of quantity 1 from (name, cost_usd, lifespan_years) tuples."""
+    return [[n, 1, c, ls] for n, c, ls in rows]
+
+
+@pytest.fixture()
+def data() -> dict:
+    return minimal_data(
+        mechanical=_rows([
+            ("Turbine", 1_000_000, 25),
+            ("Reverse osmosis train", 350_000, None),     # default lifespan 7
+            ("Pipes (total)", 2_000_000, "indefinite"),
+            ("Tank", "$ 2500 per ton", 10),               # per-unit cost × quantity
+            ("Valve", 8_000, "about 15"),                 # annotated: 15 years
+        ]),
+        electrical=_rows([
+            ("Turbine", 1_000_000, 20),
+            (BATTERY_ITEM_NAME, 2_600_000, 15),
+            ("Pumps", 400_000, 10.0),
+        ]),
+        battery=(150_000, 1_100_000),
+        tds=([0, 100], [0.0, 1.0]),
+        depth=([0, 100], [0.0, 1.0]),
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Equivalence with the DataFrame reference
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestCostModelEquivalence:
+    """CostModel answers match compute_cost_over_time for every query."""
+
+    @pytest.mark.parametrize("battery_fraction", [0.0, 0.333, 0.5, 1.0])
+    def test_all_horizons(self, data, battery_fraction):
+        model = CostModel(data, horizon=50)
+        battery = interpolate_battery_cost(battery_fraction, data["battery_lookup"])
+        for years in range(0, 51):
+            result = model.cost_over_time(years, battery_fraction)
+            np.testing.assert_allclose(
+                result["mechanical"], compute_cost_over_time(data["mechanical"], years)
+            )
+            np.testing.assert_allclose(
+                result["electrical"],
+                compute_cost_over_time(
+                    data["electrical"], years, override_costs={BATTERY_ITEM_NAME: battery}
+                ),
+            )
+            assert len(result["hybrid"]) == years + 1
+            assert not result["hybrid"].any()
+
+    def test_electrical_total_cost(self, data):
+        model = CostModel(data)
+        expected = 1_000_000 + 400_000 + interpolate_battery_cost(0.7, data["battery_lookup"])
+        assert model.electrical_total_cost(0.7) == pytest.approx(expected)
+
+    def test_horizon_exceeded_raises(self, data):
+        with pytest.raises(ValueError):
+            CostModel(data, horizon=10).cost_over_time(11, 0.5)
+
+    def test_arrays_share_one_read_only_buffer(self, data):
+        model = CostModel(data)
+        arrays = [a for a in (*model.costs.values(), *model.counts.values()) if a.size]
+        assert all(np.shares_memory(a, model.buffer) for a in arrays)
+        assert not model.buffer.flags.writeable
+        with pytest.raises(ValueError):
+            model.counts["mechanical"][0, 0] = 1.0
+
+
+class TestComputeChartDataWithModel:
+    """compute_chart_data gives identical results with and without a model."""
+
+    def test_prebuilt_model_matches(self, data):
+        model = CostModel(data)
+        with_model = compute_chart_data(data, 0.42, 37, cost_model=model)
+        without = compute_chart_data(data, 0.42, 37)
+        for sys_key in ("mechanical", "electrical", "hybrid"):
+            np.testing.assert_allclose(
+                with_model["cost_over_time"][sys_key], without["cost_over_time"][sys_key]
+            )
+        assert with_model["electrical_total_cost"] == pytest.approx(without["electrical_total_cost"])
+
+    def test_short_model_is_rebuilt(self, data):
+        """A model with too short a horizon is replaced rather than failing."""
+        cd = compute_chart_data(data, 0.5, 80, cost_model=CostModel(data, horizon=10))
+        assert len(cd["cost_over_time"]["mechanical"]) == 81
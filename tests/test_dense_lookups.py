@@ -0,0 +1,147 @@
+"""
+tests/test_dense_lookups.py
+===========================
+Tests for the dense slider-step lookup tables in src/data/interpolation.py.
+
+Verifies that:
+  - build_dense_tables() covers every battery / TDS / depth slider step and
+    each entry equals the exact interpolation at that step
+  - DenseLookup answers on-step values from the table and falls back to
+    the Interpolator off-step, out of range and for NaN — scalars and arrays
+  - build_interpolators() only wraps lookups with a stored table built for
+    the current slider (step, count), and not at all with dense=False
+  - The CostModel prices the battery row from the dense table, inside its
+    shared buffer, with the same results
+  - The tables survive a snapshot round trip
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.interpolation import (
+    DENSE_DOMAINS,
+    DenseLookup,
+    Interpolator,
+    build_dense_tables,
+    build_interpolators,
+)
+from src.data.processing import CostModel
+from src.data.snapshot import read_snapshot, workbook_key, write_snapshot
+
+
+@pytest.fixture()
+def data() -> dict:
+    columns = ["name", "quantity", "cost_usd", "lifespan_years"]
+    fractions = np.linspace(0.0, 1.0, 11)
+    data = {
+        "mechanical": pd.DataFrame([["Pump", 1, 10_000, 10]], columns=columns),
+        "electrical": pd.DataFrame([["Inverter", 1, 20_000, 15]], columns=columns),
+        "hybrid": pd.DataFrame([["Pump", 1, 15_000, 10]], columns=columns),
+        "battery_lookup": pd.DataFrame({
+            "battery_fraction": fractions,
+            "total_cost": 1_000_000 + 3_000_000 * fractions ** 2,
+        }),
+        "tds_lookup": pd.DataFrame({
+            "tds_ppm": [i * 100 for i in range(20)],
+            "ro_energy_kw": [3.0 * i + 0.1 * i * i for i in range(20)],
+        }),
+        "depth_lookup": pd.DataFrame({
+            "depth_m": [i * 100 for i in range(20)],
+            "pump_energy_kw": [7.5 * i + 0.01 * i ** 3 for i in range(20)],
+        }),
+        "energy": None,
+    }
+    data["dense_lookups"] = build_dense_tables(data)
+    return data
+
+
+class TestDenseTables:
+    """Materialized tables match the exact interpolation at every step."""
+
+    @pytest.mark.parametrize("name", ["battery", "tds", "depth"])
+    def test_every_step(self, data, name):
+        """One entry per slider step, equal to the Interpolator there."""
+        step, count = DENSE_DOMAINS[name]
+        exact = getattr(build_interpolators(data, dense=False), name)
+        dense = getattr(build_interpolators(data), name)
+        assert isinstance(dense, DenseLookup) and isinstance(exact, Interpolator)
+        steps = np.arange(count) * step
+        assert data["dense_lookups"][name]["domain"] == (step, count)
+        np.testing.assert_array_equal(data["dense_lookups"][name]["values"], exact(steps))
+        np.testing.assert_array_equal(dense(steps), exact(steps))
+        assert all(dense(x) == exact(x) for x in steps[::7])
+
+    @pytest.mark.parametrize("name,value", [
+        ("tds", 950.0), ("tds", 10_100.0), ("tds", 35_000.0), ("tds", -100.0),
+        ("depth", 12.5), ("depth", 2_500.0), ("battery", 0.0005), ("battery", 1.5),
+    ])
+    def test_off_step_falls_back(self, data, name, value):
+        """Values off the slider grid or outside it are interpolated exactly."""
+        exact = getattr(build_interpolators(data, dense=False), name)
+        dense = getattr(build_interpolators(data), name)
+        assert dense(value) == exact(value)
+
+    def test_mixed_array(self, data):
+        """An array mixing on- and off-step values keeps its shape and values."""
+        exact, dense = build_interpolators(data, dense=False).tds, build_interpolators(data).tds
+        values = np.array([[0.0, 950.0, 1_000.0], [np.nan, 10_000.0, 20_000.0]])
+        result = dense(values)
+        assert result.shape == values.shape
+        np.testing.assert_array_equal(result, exact(values))
+
+    def test_nan_scalar(self, data):
+        """NaN is not an index; it falls back and stays NaN."""
+        assert math.isnan(build_interpolators(data).depth(float("nan")))
+
+
+class TestWrapping:
+    """When build_interpolators() uses the stored tables."""
+
+    def test_disabled(self, data):
+        """dense=False returns plain Interpolators."""
+        assert all(isinstance(i, Interpolator) for i in build_interpolators(data, dense=False))
+
+    def test_missing_or_mismatched_tables(self, data):
+        """Data without tables, or with a table of the wrong length, is not wrapped."""
+        del data["dense_lookups"]
+        assert all(isinstance(i, Interpolator) for i in build_interpolators(data))
+        data["dense_lookups"] = {"tds": {"domain": DENSE_DOMAINS["tds"], "values": np.zeros(5)}}
+        assert isinstance(build_interpolators(data).tds, Interpolator)
+
+    def test_other_slider_step(self, data, monkeypatch):
+        """A table built for another step is not used, even at the same length."""
+        step, count = DENSE_DOMAINS["depth"]
+        monkeypatch.setitem(DENSE_DOMAINS, "depth", (step * 2, count))
+        assert isinstance(build_interpolators(data).depth, Interpolator)
+        assert isinstance(build_interpolators(data).tds, DenseLookup)
+
+
+class TestCostModelAndSnapshot:
+    """Per-version storage of the tables."""
+
+    def test_cost_model_uses_dense_battery(self, data):
+        """The battery table is packed into the shared buffer; costs are unchanged."""
+        model = CostModel(data)
+        assert isinstance(model.battery_interpolator, DenseLookup)
+        assert np.shares_memory(model.battery_interpolator.values, model.buffer)
+        plain = CostModel({k: v for k, v in data.items() if k != "dense_lookups"})
+        fractions = np.linspace(0.0, 1.0, 1001)
+        np.testing.assert_array_equal(model.battery_costs(fractions), plain.battery_costs(fractions))
+        assert model.battery_cost(0.237) == pytest.approx(plain.battery_cost(0.237), rel=1e-12)
+
+    def test_snapshot_round_trip(self, tmp_path, data):
+        """The tables are stored with the data snapshot."""
+        workbook = tmp_path / "data.xlsx"
+        workbook.write_bytes(b"workbook")
+        snap = tmp_path / "data.xlsx.snapshot"
+        key = workbook_key(workbook)
+        assert write_snapshot(snap, key, data)
+        loaded = read_snapshot(snap, key)
+        for name, entry in data["dense_lookups"].items():
+            assert loaded["dense_lookups"][name]["domain"] == entry["domain"]
+            np.testing.assert_array_equal(loaded["dense_lookups"][name]["values"], entry["values"])
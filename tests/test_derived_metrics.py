@@ -0,0 +1,135 @@
+"""
+tests/test_derived_metrics.py
+=============================
+Tests for the snapshot-level derived metrics in src/data/derived.py.
+
+Verifies that:
+  - scorecard_summary() colors every metric with rag_color() and picks the
+    system with the most green dots, or "Tied" on equal counts
+  - build_derived_metrics() adds the hybrid comparison sentences only when
+    a hybrid is configured
+  - derived_metrics() serves the stored result, and recomputes when it is
+    missing or was computed with other config constants
+  - make_scorecard_table() renders the same table from a precomputed summary
+  - The derived metrics survive a snapshot round trip
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import pandas as pd
+import pytest
+from plotly.io.json import to_json_plotly
+
+import src.data.derived as derived
+from src.config import RAG_COLORS
+from src.data.derived import (
+    SCORECARD_METRICS,
+    build_derived_metrics,
+    derived_metrics,
+    scorecard_summary,
+)
+from src.data.processing import compute_scorecard_metrics, generate_comparison_text, rag_color
+from src.data.snapshot import read_snapshot, workbook_key, write_snapshot
+from src.layout.scorecard import make_scorecard_table
+
+_COLUMNS = ["name", "quantity", "cost_usd", "lifespan_years"]
+
+
+def _bom(cost: float, lifespan: int = 20) -> pd.DataFrame:
+    return pd.DataFrame([["Pump", 1, cost, lifespan]], columns=_COLUMNS)
+
+
+@pytest.fixture()
+def data() -> dict:
+    return {
+        "mechanical": _bom(500_000),
+        "electrical": _bom(300_000),
+        "hybrid": _bom(400_000),
+    }
+
+
+class TestScorecardSummary:
+    """Metrics, colors and the best-overall verdict."""
+
+    def test_colors_match_rag_color(self, data):
+        """Each metric is colored exactly as rag_color() colors it."""
+        summary = scorecard_summary(data["mechanical"], data["electrical"], data["hybrid"])
+        metrics = compute_scorecard_metrics(data["mechanical"], data["electrical"], data["hybrid"])
+        assert summary["metrics"] == metrics
+        for metric in SCORECARD_METRICS:
+            expected = rag_color({s: metrics[s][metric] for s in metrics}, metric=metric)
+            assert summary["colors"][metric] == expected
+
+    def test_best_overall(self, data):
+        """The system with the most green dots wins; equal counts tie."""
+        summary = scorecard_summary(data["mechanical"], data["electrical"], data["hybrid"])
+        greens = {
+            s: sum(summary["colors"][m][s] == RAG_COLORS["green"] for m in SCORECARD_METRICS)
+            for s in summary["metrics"]
+        }
+        leaders = [s for s, n in greens.items() if n == max(greens.values())]
+        expected = leaders[0].capitalize() if len(leaders) == 1 else "Tied"
+        assert summary["best_overall"] == expected
+
+    def test_two_systems(self):
+        """Without a hybrid the cheaper preset wins cost and LCOW."""
+        summary = scorecard_summary(_bom(100_000), _bom(900_000))
+        assert set(summary["metrics"]) == {"mechanical", "electrical"}
+        assert summary["best_overall"] == "Mechanical"
+
+    def test_tie(self, data, monkeypatch):
+        """Equal green counts are reported as "Tied"."""
+        monkeypatch.setattr(
+            derived, "rag_color", lambda values, metric: dict.fromkeys(values, RAG_COLORS["green"])
+        )
+        summary = scorecard_summary(data["mechanical"], data["electrical"], data["hybrid"])
+        assert summary["best_overall"] == "Tied"
+
+
+class TestDerivedMetrics:
+    """The stored result and its config guard."""
+
+    def test_comparison_text(self, data):
+        """The hybrid sentences are built once; without a hybrid there are none."""
+        result = build_derived_metrics(data)
+        metrics = result["scorecard"]["metrics"]
+        assert result["comparison_text"] == generate_comparison_text(
+            metrics["hybrid"], metrics["mechanical"], metrics["electrical"]
+        )
+        no_hybrid = {k: v for k, v in data.items() if k != "hybrid"}
+        assert build_derived_metrics(no_hybrid)["comparison_text"] is None
+
+    def test_stored_result_reused(self, data):
+        """A stored result with the current config is returned as is."""
+        stored = build_derived_metrics(data)
+        assert derived_metrics({**data, "derived_metrics": stored}) is stored
+
+    def test_missing_or_stale_recomputed(self, data, monkeypatch):
+        """A missing result, or one from other config constants, is recomputed."""
+        assert derived_metrics(data)["scorecard"]["metrics"]["hybrid"]
+        stored = build_derived_metrics(data)
+        monkeypatch.setattr(derived, "LCOW_DENOMINATOR_KGAL", derived.LCOW_DENOMINATOR_KGAL * 2)
+        fresh = derived_metrics({**data, "derived_metrics": stored})
+        assert fresh is not stored
+        assert fresh["config"] != stored["config"]
+
+    def test_scorecard_from_summary(self, data):
+        """The table built from a precomputed summary equals a fresh one."""
+        summary = build_derived_metrics(data)["scorecard"]
+        fresh = make_scorecard_table(data["mechanical"], data["electrical"], data["hybrid"])
+        cached = make_scorecard_table(
+            data["mechanical"], data["electrical"], data["hybrid"], summary=summary
+        )
+        assert to_json_plotly(cached) == to_json_plotly(fresh)
+
+    def test_snapshot_round_trip(self, tmp_path, data):
+        """The derived metrics are written to and read back from the snapshot."""
+        workbook = tmp_path / "data.xlsx"
+        workbook.write_bytes(b"fake workbook contents")
+        snap = tmp_path / "data.xlsx.snapshot"
+        key = workbook_key(workbook)
+        stored = build_derived_metrics(data)
+        assert write_snapshot(snap, key, {**data, "derived_metrics": stored})
+        loaded = read_snapshot(snap, key)
+        assert loaded["derived_metrics"] == stored
+        assert derived_metrics(loaded) is loaded["derived_metrics"]
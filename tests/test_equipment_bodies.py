@@ -0,0 +1,168 @@
+"""
+tests/test_equipment_bodies.py
+==============================
+Tests for the lazily loaded equipment accordion bodies in
+src/layout/equipment_grid.py.
+
+Verifies that:
+  - make_equipment_section() sends placeholder bodies with pattern-matching
+    IDs and no cross-system comparison
+  - make_equipment_body() holds the detail table and the comparison
+  - load_equipment_body renders only the expanded item and leaves the
+    others untouched (no_update), including on collapse
+  - An item whose row changed or vanished since the page was rendered gets
+    a "data changed" note, and unknown systems render nothing
+  - Rendered bodies are cached pre-serialized per (data version, system, row)
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import json
+
+import pandas as pd
+import pytest
+from dash import no_update
+from plotly.io.json import to_json_plotly
+
+import src.layout.equipment_grid as equipment_grid
+from src.config import PROCESS_STAGES
+from src.data.registry import DataSnapshot
+from src.layout.equipment_grid import (
+    load_equipment_body,
+    make_equipment_body,
+    make_equipment_section,
+)
+
+_COLUMNS = ["name", "quantity", "cost_usd", "lifespan_years"]
+_MECH_PUMP = PROCESS_STAGES["mechanical"]["Water Extraction"][0]
+_ELEC_PUMP = PROCESS_STAGES["electrical"]["Water Extraction"][0]
+_MECH_TURBINE = PROCESS_STAGES["mechanical"]["Power & Drive"][0]
+
+
+@pytest.fixture()
+def data() -> dict:
+    return {
+        "mechanical": pd.DataFrame(
+            [[_MECH_TURBINE, 1, 500_000, 25], [_MECH_PUMP, 2, 40_000, 15]], columns=_COLUMNS,
+        ),
+        "electrical": pd.DataFrame([[_ELEC_PUMP, 1, 35_000, 20]], columns=_COLUMNS),
+        "hybrid": pd.DataFrame(columns=_COLUMNS),
+    }
+
+
+def _json(component) -> str:
+    return to_json_plotly(component)
+
+
+def _ids(tree, kind: str) -> list[dict]:
+    found = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            props = node.get("props", {})
+            if isinstance(props.get("id"), dict) and props["id"].get("type") == kind:
+                found.append(props["id"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(json.loads(_json(tree)))
+    return found
+
+
+@pytest.fixture()
+def published(monkeypatch, data):
+    """Serve *data* from a stand-in registry; yields a function to bump the version."""
+    state = {"snapshot": DataSnapshot(1, data, None, 0.0)}
+
+    class _Registry:
+        def current(self):
+            return state["snapshot"]
+
+    monkeypatch.setattr(equipment_grid, "registry", _Registry())
+    equipment_grid._body_cache.clear()
+
+    def bump():
+        state["snapshot"] = DataSnapshot(state["snapshot"].version + 1, data, None, 0.0)
+
+    yield bump
+    equipment_grid._body_cache.clear()
+
+
+class TestSection:
+    """The initial layout carries headers and placeholders only."""
+
+    def test_placeholders(self, data):
+        """Every item has a placeholder body; accordions carry their stage."""
+        section = make_equipment_section(data["mechanical"], "mechanical")
+        bodies = _ids(section, "equipment-body")
+        assert [b["item"] for b in bodies] == [0, 1]
+        assert [b["name"] for b in bodies] == [_MECH_TURBINE, _MECH_PUMP]
+        assert {b["stage"] for b in bodies} == {"Power & Drive", "Water Extraction"}
+        accordions = _ids(section, "equipment-accordion")
+        assert {a["stage"] for a in accordions} == {"Power & Drive", "Water Extraction"}
+        text = _json(section)
+        assert "Cross-System Comparison" not in text and "Loading details" in text
+
+    def test_body(self, data):
+        """The body has the detail table and the same-stage comparison."""
+        body = _json(make_equipment_body(data["mechanical"].iloc[1], "mechanical", data))
+        assert "Cross-System Comparison" in body and "Water Extraction" in body
+        assert "Quantity" in body
+
+
+class TestLoadCallback:
+    """The pattern-matching callback and its cache."""
+
+    _BODY_IDS = [
+        {"type": "equipment-body", "system": "mechanical", "stage": "Water Extraction",
+         "item": 1, "name": _MECH_PUMP},
+        {"type": "equipment-body", "system": "mechanical", "stage": "Water Extraction",
+         "item": 7, "name": _MECH_PUMP},
+    ]
+
+    def test_renders_active_item_only(self, published, data):
+        """Only the expanded item's body is sent, pre-serialized."""
+        result = load_equipment_body("item-mechanical-1", self._BODY_IDS)
+        assert result[1] is no_update
+        expected = make_equipment_body(data["mechanical"].loc[1], "mechanical", data)
+        assert result[0] == json.loads(_json(expected))
+
+    def test_collapse(self, published):
+        """Collapsing leaves every body unchanged."""
+        assert load_equipment_body(None, self._BODY_IDS) == [no_update, no_update]
+
+    def test_changed_row(self, published):
+        """A row that vanished or now holds another item gets the reload note."""
+        assert load_equipment_body("item-mechanical-7", self._BODY_IDS) == [
+            no_update, equipment_grid._STALE_BODY,
+        ]
+        renamed = [dict(self._BODY_IDS[0], name="Old item"), self._BODY_IDS[1]]
+        assert load_equipment_body("item-mechanical-1", renamed) == [
+            equipment_grid._STALE_BODY, no_update,
+        ]
+
+    def test_unknown_system(self, published):
+        """An unknown system never falls back to another system's rows."""
+        ids = [dict(self._BODY_IDS[0], system="tds_lookup"), dict(self._BODY_IDS[0], system="nuclear")]
+        assert load_equipment_body("item-nuclear-1", ids) == [no_update, no_update]
+        assert load_equipment_body("item-tds_lookup-1", ids) == [no_update, no_update]
+
+    def test_cached_per_version(self, published, monkeypatch):
+        """A body is built once per data version."""
+        calls = []
+        original = equipment_grid.make_equipment_body
+
+        def counting(row, system, all_data):
+            calls.append(system)
+            return original(row, system, all_data)
+
+        monkeypatch.setattr(equipment_grid, "make_equipment_body", counting)
+        first = load_equipment_body("item-mechanical-1", self._BODY_IDS)[0]
+        assert load_equipment_body("item-mechanical-1", self._BODY_IDS)[0] is first
+        assert len(calls) == 1
+        published()
+        load_equipment_body("item-mechanical-1", self._BODY_IDS)
+        assert len(calls) == 2
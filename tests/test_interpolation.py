@@ -0,0 +1,119 @@
+"""
+tests/test_interpolation.py
+===========================
+Tests for the prebuilt lookup interpolators in src/data/interpolation.py.
+
+Verifies that:
+  - Scalar calls return float and match interpolate_energy() /
+    interpolate_battery_cost() exactly
+  - Array calls keep the input shape and match the scalar results
+  - Values below the table are clamped; above it they are extrapolated with
+    the last slope (energy) or clamped (battery)
+  - Table arrays are contiguous, float64 and read-only, and the CostModel
+    battery interpolator reads from the model's shared buffer
+  - Mismatched table columns are rejected
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.interpolation import Interpolator, build_interpolators
+from src.data.processing import CostModel, interpolate_battery_cost, interpolate_energy
+
+
+@pytest.fixture()
+def data() -> dict:
+    columns = ["name", "quantity", "cost_usd", "lifespan_years"]
+    fractions = np.linspace(0.0, 1.0, 11)
+    return {
+        "mechanical": pd.DataFrame([["Pump", 1, 10_000, 10]], columns=columns),
+        "electrical": pd.DataFrame([["Inverter", 1, 20_000, 15]], columns=columns),
+        "hybrid": pd.DataFrame([["Pump", 1, 15_000, 10]], columns=columns),
+        "battery_lookup": pd.DataFrame({
+            "battery_fraction": fractions,
+            "total_cost": 1_000_000 + 3_000_000 * fractions ** 2,
+        }),
+        "tds_lookup": pd.DataFrame({
+            "tds_ppm": [i * 100 for i in range(20)],
+            "ro_energy_kw": [3.0 * i + 0.1 * i * i for i in range(20)],
+        }),
+        "depth_lookup": pd.DataFrame({
+            "depth_m": [i * 100 for i in range(20)],
+            "pump_energy_kw": [7.5 * i for i in range(20)],
+        }),
+    }
+
+
+class TestInterpolator:
+    """Call semantics of a single Interpolator."""
+
+    @pytest.mark.parametrize("value", [-50.0, 0, 950, 1234.5, 1900, 2000, 35_000])
+    def test_scalar_matches_interpolate_energy(self, data, value):
+        """Scalars give the same float as interpolate_energy()."""
+        tds = build_interpolators(data).tds
+        result = tds(value)
+        assert isinstance(result, float)
+        assert result == interpolate_energy(value, data["tds_lookup"], "tds_ppm", "ro_energy_kw")
+
+    def test_array_keeps_shape(self, data):
+        """A 2-D array returns a 2-D array equal to per-element scalar calls."""
+        depth = build_interpolators(data).depth
+        values = np.array([[-10.0, 0.0, 55.5], [1900.0, 2500.0, 10_000.0]])
+        result = depth(values)
+        assert result.shape == values.shape
+        np.testing.assert_array_equal(result, [[depth(v) for v in row] for row in values])
+
+    def test_extrapolation_and_clamping(self):
+        """Below the table clamps; above it follows the last slope unless disabled."""
+        extrapolating = Interpolator([0.0, 10.0, 20.0], [0.0, 5.0, 25.0])
+        clamping = Interpolator([0.0, 10.0, 20.0], [0.0, 5.0, 25.0], extrapolate=False)
+        assert extrapolating.slope == 2.0
+        assert extrapolating(-5.0) == 0.0
+        assert extrapolating(30.0) == 45.0
+        assert clamping(30.0) == 25.0
+        np.testing.assert_array_equal(extrapolating(np.array([15.0, 30.0])), [15.0, 45.0])
+
+    def test_battery_matches_interpolate_battery_cost(self, data):
+        """The battery interpolator clamps at both ends like interpolate_battery_cost()."""
+        battery = build_interpolators(data).battery
+        for value in (-0.5, 0.0, 0.37, 1.0, 1.5):
+            assert battery(value) == interpolate_battery_cost(value, data["battery_lookup"])
+
+    def test_tables_read_only(self, data):
+        """x / y are contiguous read-only float64 arrays."""
+        tds = build_interpolators(data).tds
+        for array in (tds.x, tds.y):
+            assert array.dtype == np.float64 and array.flags.c_contiguous
+            assert not array.flags.writeable
+
+    def test_source_array_left_writable(self):
+        """Building from a caller's array does not change that array's flags."""
+        x = np.array([0.0, 1.0])
+        Interpolator(x, x)
+        assert x.flags.writeable
+
+    def test_mismatched_columns_rejected(self):
+        """x and y of different lengths raise ValueError."""
+        with pytest.raises(ValueError):
+            Interpolator([0.0, 1.0, 2.0], [0.0, 1.0])
+
+
+class TestCostModelInterpolator:
+    """The CostModel prices the battery row through a shared-buffer interpolator."""
+
+    def test_shares_buffer(self, data):
+        """The battery table is a view of CostModel.buffer."""
+        model = CostModel(data)
+        assert np.shares_memory(model.battery_interpolator.x, model.buffer)
+        assert np.shares_memory(model.battery_interpolator.y, model.buffer)
+
+    def test_batch_matches_scalar(self, data):
+        """battery_costs() over an array equals battery_cost() per value."""
+        model = CostModel(data)
+        fractions = np.linspace(-0.1, 1.1, 241)
+        np.testing.assert_array_equal(
+            model.battery_costs(fractions), [model.battery_cost(f) for f in fractions],
+        )
@@ -0,0 +1,110 @@
+"""
+tests/test_layout_cache.py
+==========================
+Tests for the system view cache in src/layout/shell.py.
+
+Verifies that:
+  - A system view is built once per (system, data version) and served from
+    the cache afterwards
+  - The cached form is the view's JSON encoding as plain dicts / lists
+  - Publishing a version prebuilds all three systems, keeps the outgoing
+    version's views and leaves older ones to the LRU bound
+  - render_content() serves the cached view with the system's border, and
+    the loading page while the registry holds no data
+
+Uses a stub view builder and synthetic snapshots — does NOT read data.xlsx.
+"""
+
+import json
+
+import pytest
+from dash import html
+from plotly.io.json import to_json_plotly
+
+import src.layout.system_view as system_view
+from src.data.registry import DataSnapshot
+from src.layout import shell
+
+
+@pytest.fixture()
+def builds(monkeypatch):
+    calls = []
+
+    def fake_view(active_system, data):
+        calls.append((active_system, data["tag"]))
+        return html.Div(html.H2(f"{active_system} {data['tag']}"), id=f"view-{active_system}")
+
+    monkeypatch.setattr(system_view, "create_system_view_layout", fake_view)
+    shell._view_cache.clear()
+    yield calls
+    shell._view_cache.clear()
+
+
+def _snapshot(version: int) -> DataSnapshot:
+    return DataSnapshot(version, {"tag": f"v{version}"}, None, 0.0)
+
+
+class TestSystemViewCache:
+    """Per-(system, version) caching of the built view."""
+
+    def test_built_once_per_version(self, builds):
+        """Repeated renders of one version build the view once."""
+        snapshot = _snapshot(1)
+        first = shell._system_view("mechanical", snapshot)
+        assert shell._system_view("mechanical", snapshot) is first
+        assert builds == [("mechanical", "v1")]
+        shell._system_view("mechanical", _snapshot(2))
+        assert builds == [("mechanical", "v1"), ("mechanical", "v2")]
+
+    def test_pre_serialized(self, builds):
+        """The cached view is the component tree's JSON as plain data."""
+        view = shell._system_view("hybrid", _snapshot(1))
+        expected = html.Div(html.H2("hybrid v1"), id="view-hybrid")
+        assert view == json.loads(to_json_plotly(expected))
+        assert view["props"]["id"] == "view-hybrid"
+
+    def test_prewarm(self, builds):
+        """Publishing builds every system up front and keeps the outgoing version."""
+        old = shell._system_view("electrical", _snapshot(1))
+        shell._prewarm_system_views(_snapshot(2))
+        assert sorted(builds[1:]) == [("electrical", "v2"), ("hybrid", "v2"), ("mechanical", "v2")]
+        assert shell._system_view("electrical", _snapshot(1)) is old
+        for system in ("mechanical", "electrical", "hybrid"):
+            shell._system_view(system, _snapshot(2))
+        assert len(builds) == 4
+
+    def test_prewarm_evicts_older_versions(self, builds):
+        """The LRU bound holds two versions; a third publish evicts the first."""
+        for version in (1, 2, 3):
+            shell._prewarm_system_views(_snapshot(version))
+        assert len(shell._view_cache) == 6
+        shell._system_view("mechanical", _snapshot(1))
+        assert len(builds) == 10
+
+    def test_render_content_uses_cache(self, builds, monkeypatch):
+        """render_content() returns the cached view and the colored border."""
+        snapshot = _snapshot(7)
+
+        class _Registry:
+            def current(self):
+                return snapshot
+
+        monkeypatch.setattr(shell, "registry", _Registry())
+        shell._prewarm_system_views(snapshot)
+        content, style = shell.render_content("electrical")
+        assert content is shell._system_view("electrical", snapshot)
+        assert style["borderTop"].startswith("4px solid #")
+        assert len(builds) == 3
+
+    def test_render_content_without_data(self, builds, monkeypatch):
+        """A system view requested before data is published gets the loading page."""
+
+        class _Registry:
+            def current(self):
+                return None
+
+        monkeypatch.setattr(shell, "registry", _Registry())
+        content, style = shell.render_content("mechanical")
+        assert content.children[0].id == "loading-ready-poll"
+        assert style["borderTop"] == "4px solid transparent"
+        assert builds == []
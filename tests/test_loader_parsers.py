@@ -0,0 +1,176 @@
+"""
+tests/test_loader_parsers.py
+============================
+Tests for the streaming row parsers in src/data/loader.py.
+
+The parsers consume values-only row tuples (as yielded by a read-only
+worksheet's iter_rows), so these tests feed synthetic tuples directly:
+  - Part 1 state machine: section switching, "Total" skipping, blank-row stop,
+    per-section cost column, battery lookup rows 4-14
+  - Short rows (trimmed trailing cells) read as blank
+  - Part 2 lookups padded to 20 rows when the sheet is short
+  - Energy sheet grouping by system header
+  - Linear scaling to thousands of BOM rows
+  - Parsers report table sizes as data_load_rows gauges and print nothing
+
+Does NOT read data.xlsx.
+"""
+
+import pytest
+
+from src.data.loader import (
+    BATTERY_COLUMNS,
+    _parse_energy_sheet,
+    _parse_part1,
+    _parse_part2_lookups,
+)
+from src.metrics import metrics
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures — synthetic Part 1 rows
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _row(b=None, c=None, d=None, e=None, f=None, battery=None) -> tuple:
+    """Build a Part 1 row: columns A-F plus optional L-R battery cells."""
+    cells = [None, b, c, d, e, f]
+    if battery is not None:
+        cells += [None] * 5 + list(battery)
+    return tuple(cells)
+
+
+@pytest.fixture()
+def part1_rows() -> list[tuple]:
+    """Electrical (cost in col E), mechanical and hybrid (cost in col D)."""
+    battery = [(i / 10, 1 - i / 10, i * 1000, 0, i * 100, 0, i * 100) for i in range(11)]
+    return [
+        _row("Electrical Components", "Quantity", "Unit Cost", "Total Cost", "Lifespan"),  # 1
+        _row("Turbine", 1, 500, 1000, 20),                                                 # 2
+        _row("PLC", 2, 10, 20, 15),                                                        # 3
+        _row("Total", None, None, 1020, None, battery=battery[0]),                         # 4
+        _row(battery=battery[1]),                                                          # 5
+        _row("Mechanical Components", "Quantity", "Cost", "Lifespan", battery=battery[2]), # 6
+        _row("Gate valve", 2, 8000, 15, battery=battery[3]),                               # 7
+        _row("Pipes (total)", None, 2000, "indefinite", battery=battery[4]),               # 8
+        _row("Hybrid Components", "Quantity", "Cost", "Lifespan", battery=battery[5]),     # 9
+        _row("Gearbox", 1, 200, 20, battery=battery[6]),                                   # 10
+        _row(battery=battery[7]),                                                          # 11
+        _row("Notes row after blank", 1, 1, 1, battery=battery[8]),                        # 12
+        _row(battery=battery[9]),                                                          # 13
+        _row(battery=battery[10]),                                                         # 14
+    ]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Part 1
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestParsePart1:
+    """Section state machine and battery lookup dispatch."""
+
+    def test_sections_found(self, part1_rows):
+        sections, _ = _parse_part1(part1_rows)
+        assert set(sections) == {"electrical", "mechanical", "hybrid"}
+
+    def test_electrical_uses_total_cost_column(self, part1_rows):
+        """Electrical cost comes from col E; "Total" row is skipped."""
+        sections, _ = _parse_part1(part1_rows)
+        assert [r["name"] for r in sections["electrical"]] == ["Turbine", "PLC"]
+        assert sections["electrical"][0]["cost_usd"] == 1000
+        assert sections["electrical"][0]["lifespan_years"] == 20
+
+    def test_mechanical_stops_at_next_header(self, part1_rows):
+        """A header row ends the previous section; raw strings are kept as-is."""
+        sections, _ = _parse_part1(part1_rows)
+        mech = sections["mechanical"]
+        assert [r["name"] for r in mech] == ["Gate valve", "Pipes (total)"]
+        assert mech[1]["quantity"] is None
+        assert mech[1]["lifespan_years"] == "indefinite"
+
+    def test_blank_row_ends_section(self, part1_rows):
+        """Rows after a blank column B are not part of the section."""
+        sections, _ = _parse_part1(part1_rows)
+        assert [r["name"] for r in sections["hybrid"]] == ["Gearbox"]
+
+    def test_battery_lookup_rows_4_to_14(self, part1_rows):
+        _, battery_df = _parse_part1(part1_rows)
+        assert list(battery_df.columns) == BATTERY_COLUMNS
+        assert len(battery_df) == 11
+        assert battery_df["battery_fraction"].tolist() == pytest.approx([i / 10 for i in range(11)])
+        assert battery_df["total_cost"].iloc[-1] == 1000
+
+    def test_short_sheet_pads_battery_lookup(self):
+        """Sheets ending before row 14 leave missing lookup rows blank."""
+        _, battery_df = _parse_part1([_row("Electrical Components")])
+        assert len(battery_df) == 11
+        assert battery_df.isna().all().all()
+
+    def test_scales_to_thousands_of_rows(self):
+        """Large BOM sections parse in one pass with every row retained."""
+        n = 5000
+        rows = [_row("Mechanical Components")]
+        rows += [_row(f"Item {i}", 1, i, 10) for i in range(n)]
+        sections, _ = _parse_part1(rows)
+        assert len(sections["mechanical"]) == n
+        assert sections["mechanical"][-1]["cost_usd"] == n - 1
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Part 2 and Energy
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestParsePart2:
+    """Fixed 20-row TDS and depth lookups."""
+
+    def test_columns_split(self):
+        rows = [(i * 100, i * 1.5, None, i * 100, i * 2.0) for i in range(20)]
+        tds_df, depth_df = _parse_part2_lookups(rows)
+        assert tds_df["ro_energy_kw"].iloc[3] == pytest.approx(4.5)
+        assert depth_df["pump_energy_kw"].iloc[19] == pytest.approx(38.0)
+
+    def test_short_sheet_padded_to_20_rows(self):
+        tds_df, depth_df = _parse_part2_lookups([(0, 1.0, None, 0, 2.0)])
+        assert len(tds_df) == 20 and len(depth_df) == 20
+        assert tds_df["tds_ppm"].iloc[1:].isna().all()
+
+
+class TestParseEnergySheet:
+    """Energy rows grouped under system headers."""
+
+    def test_grouping_and_summaries(self):
+        rows = [
+            ("Mechanical System",),
+            ("Groundwater", 100, "hydraulic", 0.7, 140, "note"),
+            ("Total Shaft Power", 100),
+            ("Total at Turbine Shaft", None, None, None, 140),
+            ("Design Power (+10% margin)", None, None, None, 154),
+            ("Selected Turbine (kW)", None, None, None, 1000),
+            (None,),
+            ("Electrical System",),
+            ("RO", 50),
+        ]
+        result = _parse_energy_sheet(rows)
+        assert set(result) == {"mechanical", "electrical"}
+        mech = result["mechanical"]
+        assert [s["name"] for s in mech["subsystems"]] == ["Groundwater"]
+        assert mech["total_turbine_input"] == pytest.approx(140.0)
+        assert mech["selected_turbine_kw"] == pytest.approx(1000.0)
+        assert result["electrical"]["subsystems"][0]["turbine_input_kw"] is None
+
+
+class TestRowMetrics:
+    """Table sizes go to the data_load_rows gauge, not to stdout."""
+
+    def test_gauges_without_output(self, part1_rows, capsys):
+        """Each parsed table sets its gauge; nothing is printed."""
+        metrics.clear()
+        _parse_part1(part1_rows)
+        _parse_part2_lookups([(1, 2, 3, 4, 5)] * 3)
+        _parse_energy_sheet([("Mechanical System",), ("Groundwater", 100), ("RO", 50)])
+        rows = {
+            sample["labels"]["table"]: sample["value"]
+            for sample in metrics.summary()["gauges"]["data_load_rows"]
+        }
+        assert rows["tds_lookup"] == rows["depth_lookup"] == 20
+        assert rows["energy"] == 2
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,135 @@
+"""
+tests/test_lru_cache.py
+=======================
+Tests for the bounded LRU cache (src/data/cache.py) and its use in front of
+the chart data computations by the chart callbacks (src/layout/charts.py).
+
+Verifies that:
+  - Entries are evicted least-recently-used first once maxsize is reached
+  - Hit / miss / eviction counters are accurate
+  - maxsize=0 disables storage
+  - Concurrent get_or_compute() calls keep the cache consistent
+  - Slider values are quantized to the battery slider step in cache keys
+  - Publishing new data to the registry invalidates previous results
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import threading
+
+import pytest
+
+from src.data.cache import LRUCache
+from src.data.registry import registry
+from src.layout import charts
+from tests.sample_data import minimal_data
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# LRUCache
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestLRUCache:
+    """Core LRU semantics and counters."""
+
+    def test_evicts_least_recently_used(self):
+        """Reading a key protects it from the next eviction."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_counters(self):
+        """Hits, misses and evictions are counted."""
+        cache = LRUCache(1)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("a", lambda: 2)
+        cache.get_or_compute("b", lambda: 3)
+        assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 1, "size": 1, "maxsize": 1}
+
+    def test_zero_size_stores_nothing(self):
+        """maxsize=0 computes every time."""
+        cache = LRUCache(0)
+        calls = []
+        for _ in range(3):
+            cache.get_or_compute("k", lambda: calls.append(1))
+        assert len(calls) == 3
+        assert len(cache) == 0
+
+    def test_negative_size_rejected(self):
+        """A negative maxsize raises ValueError."""
+        with pytest.raises(ValueError):
+            LRUCache(-1)
+
+    def test_clear_keeps_counters(self):
+        """clear() drops entries but not the statistics."""
+        cache = LRUCache(4)
+        cache.get_or_compute("a", lambda: 1)
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats()["misses"] == 1
+
+    def test_thread_safety(self):
+        """Concurrent access never exceeds maxsize or loses counts."""
+        cache = LRUCache(16)
+
+        def worker(offset):
+            for i in range(500):
+                cache.get_or_compute((offset + i) % 40, lambda: i)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = cache.stats()
+        assert stats["size"] <= 16
+        assert stats["hits"] + stats["misses"] == 8 * 500
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Chart data memoization
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+class TestChartDataCache:
+    """charts._cached_cost_data() / _cached_energy_data() keys and invalidation."""
+
+    @pytest.fixture(autouse=True)
+    def _live_only(self, monkeypatch):
+        """Bypass the scenario grid so every lookup goes through the caches."""
+        monkeypatch.setattr(charts, "SCENARIO_GRID", False)
+
+    def test_quantized_battery_fraction_hits(self):
+        """Fractions within float noise of the same slider step share an entry."""
+        registry.publish(minimal_data(1_000_000))
+        before = charts.chart_cache_stats()["cost"]
+        first = charts._cached_cost_data(50, 0.3)
+        second = charts._cached_cost_data(50, 0.30000000004)
+        after = charts.chart_cache_stats()["cost"]
+        assert first is second
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+    def test_publish_invalidates(self):
+        """Reloading data never serves results computed from the old data."""
+        registry.publish(minimal_data(1_000_000))
+        old = charts._cached_cost_data(10, 0.5)
+        registry.publish(minimal_data(3_000_000))
+        new = charts._cached_cost_data(10, 0.5)
+        assert old["cost_over_time"]["mechanical"][0] == 1_000_000
+        assert new["cost_over_time"]["mechanical"][0] == 3_000_000
+
+    def test_caches_are_independent(self):
+        """Energy lookups never touch the cost cache and vice versa."""
+        registry.publish(minimal_data(1_000_000))
+        charts._cached_energy_data(950, 950)
+        cost_before = charts.chart_cache_stats()["cost"]
+        charts._cached_energy_data(950, 950)
+        stats = charts.chart_cache_stats()
+        assert stats["cost"] == cost_before
+        assert stats["energy"]["hits"] >= 1
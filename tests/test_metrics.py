@@ -0,0 +1,163 @@
+"""
+tests/test_metrics.py
+=====================
+Tests for the metrics layer in src/metrics.py.
+
+Verifies that:
+  - Histograms count into fixed buckets and estimate quantiles
+  - The Prometheus exposition has HELP / TYPE lines, cumulative buckets,
+    escaped labels and a worker label
+  - stage() times a block into data_load_stage_seconds
+  - instrument_dash() records wall / CPU time, payload sizes, status and
+    cache outcomes per callback name, counts raising callbacks as status
+    500, and serves /metrics and /metrics.json
+
+Uses a minimal Dash app — does NOT import app.py or read data.xlsx.
+"""
+
+import math
+
+import dash
+import pytest
+from dash import Input, Output, html
+
+from src.metrics import (
+    BYTES_BUCKETS,
+    Histogram,
+    MetricsRegistry,
+    instrument_dash,
+    metrics,
+    note_cache,
+    stage,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class TestHistogram:
+    """Fixed buckets and quantile estimates."""
+
+    def test_buckets(self):
+        """Observations land in the first bucket whose bound is >= the value."""
+        h = Histogram((1.0, 2.0, 4.0))
+        for value in (0.5, 1.0, 1.5, 3.0, 100.0):
+            h.observe(value)
+        assert h.counts == [2, 1, 1, 1]
+        assert h.cumulative() == [2, 3, 4, 5]
+        assert h.count == 5 and h.sum == pytest.approx(106.0)
+
+    def test_quantile(self):
+        """Quantiles interpolate inside the bucket; empty histograms give NaN."""
+        h = Histogram((1.0, 2.0))
+        assert math.isnan(h.quantile(0.5))
+        for _ in range(4):
+            h.observe(1.5)
+        assert h.quantile(0.5) == pytest.approx(1.5)
+        h.observe(50.0)
+        assert h.quantile(0.99) == 2.0
+
+
+class TestExposition:
+    """Prometheus text and JSON summary."""
+
+    def test_prometheus_text(self):
+        """Histogram and counter series render with escaped labels."""
+        registry = MetricsRegistry()
+        registry.observe("dash_callback_request_bytes", 300, {"callback": 'a"b'}, BYTES_BUCKETS)
+        registry.inc("dash_callback_requests_total", {"callback": "cb", "code": "200"}, 2)
+        text = registry.render_prometheus()
+        assert "# TYPE dash_callback_request_bytes histogram" in text
+        assert '# TYPE dash_callback_requests_total counter' in text
+        assert 'callback="a\\"b"' in text
+        assert 'le="+Inf"} 1' in text
+        assert 'le="128.0"} 0' in text and 'le="512.0"} 1' in text
+        assert 'code="200",worker="' in text
+        assert text.endswith("\n")
+
+    def test_stage_and_summary(self):
+        """stage() records one observation per block in the summary."""
+        with stage("normalize"):
+            pass
+        summary = metrics.summary()
+        (series,) = summary["histograms"]["data_load_stage_seconds"]
+        assert series["labels"] == {"stage": "normalize"} and series["count"] == 1
+
+
+@pytest.fixture()
+def client():
+    app = dash.Dash(__name__)
+    app.layout = html.Div([html.Div(id="in"), html.Div(id="out"), html.Div(id="boom")])
+
+    @app.callback(Output("out", "children"), Input("in", "children"))
+    def echo(value):
+        note_cache("hit")
+        return f"got {value}"
+
+    @app.callback(Output("boom", "children"), Input("in", "title"))
+    def explode(value):
+        raise RuntimeError("callback failed")
+
+    instrument_dash(app)
+    test_client = app.server.test_client()
+    test_client.get("/")
+    return test_client
+
+
+def _dispatch(client, output: str, prop: str, value):
+    component, attr = output.split(".")
+    return client.post("/_dash-update-component", json={
+        "output": output,
+        "outputs": {"id": component, "property": attr},
+        "inputs": [{"id": "in", "property": prop, "value": value}],
+        "changedPropIds": [f"in.{prop}"],
+        "state": [],
+    })
+
+
+class TestDashInstrumentation:
+    """Request hooks and endpoints on a real Flask server."""
+
+    def test_callback_recorded(self, client):
+        """Each dispatch records time, sizes, status and cache outcome by function name."""
+        for value in ("a", "b"):
+            assert _dispatch(client, "out.children", "children", value).status_code == 200
+        summary = client.get("/metrics.json").get_json()
+        for name in ("dash_callback_duration_seconds", "dash_callback_cpu_seconds",
+                     "dash_callback_request_bytes", "dash_callback_response_bytes"):
+            (series,) = summary["histograms"][name]
+            assert series["labels"] == {"callback": "echo"} and series["count"] == 2
+        counters = summary["counters"]
+        assert counters["dash_callback_requests_total"] == [
+            {"labels": {"callback": "echo", "code": "200"}, "value": 2}
+        ]
+        assert counters["dash_callback_cache_total"] == [
+            {"labels": {"callback": "echo", "status": "hit"}, "value": 2}
+        ]
+        assert summary["histograms"]["dash_callback_request_bytes"][0]["sum"] > 0
+
+    def test_errors_counted(self, client):
+        """A raising callback is counted with status 500."""
+        assert _dispatch(client, "boom.children", "title", "x").status_code == 500
+        counters = metrics.summary()["counters"]
+        assert counters["dash_callback_requests_total"] == [
+            {"labels": {"callback": "explode", "code": "500"}, "value": 1}
+        ]
+
+    def test_prometheus_endpoint(self, client):
+        """/metrics serves the text format; page loads are not recorded."""
+        _dispatch(client, "out.children", "children", "a")
+        response = client.get("/metrics")
+        assert response.mimetype == "text/plain"
+        text = response.get_data(as_text=True)
+        assert 'dash_callback_duration_seconds_count{callback="echo",worker="' in text
+        assert "/metrics" not in text
+
+    def test_note_cache_outside_request(self):
+        """note_cache() outside an instrumented request is ignored."""
+        note_cache("miss")
+        assert metrics.summary()["counters"] == {}
@@ -0,0 +1,132 @@
+"""
+tests/test_normalize.py
+=======================
+Tests for the typed columnar normalization in src/data/normalize.py.
+
+Verifies that:
+  - quantity / cost_usd become float64 parsed magnitudes; per-unit prices
+    become line costs and unparseable cells NaN
+  - lifespan_years becomes int64: defaults by name for missing cells,
+    LIFESPAN_INDEFINITE for "indefinite" / unparseable / non-positive values
+  - The original cell values are kept in the *_raw display columns
+  - Normalization is idempotent and leaves already-typed frames untouched
+  - Lookup tables become float64
+  - Processing results and formatted output are the same for raw and
+    normalized input
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.normalize import (
+    LIFESPAN_INDEFINITE,
+    normalize_data,
+    normalize_equipment,
+    normalize_lookup,
+    raw_value,
+)
+from src.data.processing import (
+    CostModel,
+    compute_cost_over_time,
+    compute_scorecard_metrics,
+    fmt,
+    fmt_cost,
+    fmt_num,
+    fmt_sig2,
+)
+
+_COLUMNS = ["name", "quantity", "cost_usd", "lifespan_years"]
+
+
+@pytest.fixture()
+def raw_df() -> pd.DataFrame:
+    return pd.DataFrame([
+        ["Turbine",                2,          1_000_000,        25],
+        ["Ballast",                "~15 tons", "$ 2500 per ton", "indefinite"],
+        ["RO Membrane Trains",     1,          80_000,           None],
+        ["Valve",                  4,          1_200,            "n/a"],
+        ["Tank",                   1,          30_000,           12.9],
+        ["Pad",                    1,          5_000,            -3],
+    ], columns=_COLUMNS)
+
+
+class TestNormalizeEquipment:
+    """Typed columns, sentinel and raw display columns."""
+
+    def test_typed_columns(self, raw_df):
+        """Numeric columns are float64 / int64; "~15 tons" at $2500/ton is priced."""
+        df = normalize_equipment(raw_df)
+        assert df["quantity"].dtype == np.float64
+        assert df["cost_usd"].dtype == np.float64
+        assert df["lifespan_years"].dtype == np.int64
+        assert df["quantity"].iloc[1] == 15.0 and df["cost_usd"].iloc[1] == 37_500.0
+
+    def test_lifespan_rules(self, raw_df):
+        """Defaults by name, truncation, and the indefinite sentinel."""
+        years = normalize_equipment(raw_df)["lifespan_years"].tolist()
+        i = LIFESPAN_INDEFINITE
+        assert years == [25, i, 7, i, 12, i]
+
+    def test_raw_columns_kept(self, raw_df):
+        """Original cell values stay available for display."""
+        df = normalize_equipment(raw_df)
+        row = df.iloc[1]
+        assert raw_value(row, "quantity") == "~15 tons"
+        assert raw_value(row, "cost_usd") == "$ 2500 per ton"
+        assert raw_value(row, "lifespan_years") == "indefinite"
+        assert raw_value(raw_df.iloc[1], "quantity") == "~15 tons"
+
+    def test_idempotent(self, raw_df):
+        """A normalized frame is returned as-is; the input is not modified."""
+        df = normalize_equipment(raw_df)
+        assert normalize_equipment(df) is df
+        assert raw_df["cost_usd"].iloc[1] == "$ 2500 per ton"
+
+    def test_lookup_and_data(self, raw_df):
+        """Lookup tables become float64 and normalize_data() covers every section."""
+        lookup = pd.DataFrame({"x": [0, 1, "bad"], "y": [0.0, "2", None]})
+        typed = normalize_lookup(lookup)
+        assert all(dtype == np.float64 for dtype in typed.dtypes)
+        assert typed["y"].iloc[1] == 2.0 and np.isnan(typed["x"].iloc[2])
+        data = normalize_data({
+            "mechanical": raw_df, "electrical": raw_df, "hybrid": raw_df,
+            "battery_lookup": lookup, "tds_lookup": lookup, "depth_lookup": lookup,
+            "energy": None,
+        })
+        assert data["energy"] is None
+        assert data["hybrid"]["lifespan_years"].dtype == np.int64
+
+
+class TestProcessingEquivalence:
+    """Raw and normalized input produce the same results."""
+
+    def test_cost_over_time(self, raw_df):
+        """compute_cost_over_time() is unchanged by normalization."""
+        np.testing.assert_array_equal(
+            compute_cost_over_time(raw_df, 50),
+            compute_cost_over_time(normalize_equipment(raw_df), 50),
+        )
+
+    def test_scorecard_and_cost_model(self, raw_df):
+        """Scorecard totals and compiled CostModel curves are unchanged."""
+        lookup = pd.DataFrame({"battery_fraction": [0.0, 1.0], "total_cost": [0.0, 10.0]})
+        raw = {"mechanical": raw_df, "electrical": raw_df, "hybrid": raw_df, "battery_lookup": lookup}
+        typed = normalize_data({**raw, "tds_lookup": lookup, "depth_lookup": lookup})
+        assert compute_scorecard_metrics(raw_df, raw_df, raw_df) == compute_scorecard_metrics(
+            typed["mechanical"], typed["electrical"], typed["hybrid"])
+        np.testing.assert_array_equal(CostModel(raw).buffer, CostModel(typed).buffer)
+
+    @pytest.mark.parametrize("value,expected", [
+        (1234.5,       ["1,200", "$1.2K", "1,234.5", "1,234"]),
+        (np.int64(85), ["85", "$85", "85.0", "85"]),
+        ("1500",       ["1,500", "$1.5K", "1,500.0", "1,500"]),
+        ("~15 tons",   ["~15 tons", "N/A", "~15 tons", "~15 tons"]),
+        (None,         ["N/A", "N/A", "N/A", "N/A"]),
+        (True,         ["1", "$1", "1.0", "1"]),
+    ])
+    def test_formatters(self, value, expected):
+        """The numeric fast path formats exactly as pd.to_numeric coercion did."""
+        assert [f(value) for f in (fmt_sig2, fmt_cost, fmt_num, fmt)] == expected
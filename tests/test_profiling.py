@@ -0,0 +1,184 @@
+"""
+tests/test_profiling.py
+=======================
+Tests for the on-demand request profiler in src/profiling.py.
+
+Verifies that:
+  - phase_times() sums each phase once, even when its functions call each other
+  - collapsed_stacks() splits a shared callee between its callers and cuts
+    recursion
+  - ProfileStore keeps only the newest captures and rejects unknown file names
+  - install_profiling() profiles only callback requests flagged with the
+    admin token (on the request or the referring page), times the figure and
+    serialization phases separately, and guards /_profiles with the token
+
+Uses a minimal Dash app and synthetic stats — does NOT import app.py or read
+data.xlsx.
+"""
+
+import cProfile
+
+import dash
+import numpy as np
+import pytest
+from dash import Input, Output, dcc, html
+
+from src.layout.charts import build_cost_chart
+from src.profiling import ProfileStore, collapsed_stacks, install_profiling, phase_times
+
+_PROC = ("/app/src/data/processing.py", 1, "compute_chart_data")
+_COST = ("/app/src/data/processing.py", 2, "compute_cost_chart_data")
+_FIG = ("/app/src/layout/charts.py", 3, "build_cost_chart")
+_CB = ("/app/src/layout/charts.py", 4, "update_cost_chart")
+_JSON = ("/venv/dash/_utils.py", 5, "to_json")
+_ROOT = ("/venv/dash/_callback.py", 6, "add_context")
+
+
+def _stats() -> dict:
+    """(cc, nc, self, cumulative, callers) per function; times in seconds."""
+    return {
+        _ROOT: (1, 1, 0.001, 0.008, {}),
+        _CB: (1, 1, 0.001, 0.006, {_ROOT: (1, 1, 0.001, 0.006)}),
+        _JSON: (1, 1, 0.001, 0.001, {_ROOT: (1, 1, 0.001, 0.001)}),
+        _COST: (1, 1, 0.001, 0.002, {_CB: (1, 1, 0.001, 0.002)}),
+        _PROC: (2, 2, 0.002, 0.002, {_COST: (1, 1, 0.001, 0.001), _FIG: (1, 1, 0.001, 0.001)}),
+        _FIG: (1, 1, 0.002, 0.003, {_CB: (1, 1, 0.002, 0.003)}),
+    }
+
+
+class TestAnalysis:
+    """Phase totals and collapsed stacks from pstats data."""
+
+    def test_phase_times(self):
+        """Nested calls within a phase count once; calls from another phase count."""
+        phases = phase_times(_stats())
+        assert phases["chart_data"] == pytest.approx(0.002 + 0.001)
+        assert phases["figure"] == pytest.approx(0.003)
+        assert phases["serialize"] == pytest.approx(0.001)
+
+    def test_collapsed_stacks(self):
+        """A callee reached from two callers is split between both stacks."""
+        lines = dict(line.rsplit(" ", 1) for line in collapsed_stacks(_stats()))
+        root = "_callback.py:add_context;charts.py:update_cost_chart"
+        assert lines[f"{root};processing.py:compute_cost_chart_data;processing.py:compute_chart_data"] == "1000"
+        assert lines[f"{root};charts.py:build_cost_chart;processing.py:compute_chart_data"] == "1000"
+        assert lines[f"{root};charts.py:build_cost_chart"] == "2000"
+        assert sum(int(us) for us in lines.values()) == 8_000
+
+    def test_recursion_cut(self):
+        """A function calling itself does not recurse forever."""
+        stats = {
+            _ROOT: (1, 1, 0.001, 0.003, {}),
+            _CB: (1, 3, 0.002, 0.002, {_ROOT: (1, 1, 0.001, 0.002), _CB: (0, 2, 0.001, 0.001)}),
+        }
+        assert collapsed_stacks(stats) == [
+            "_callback.py:add_context 1000",
+            "_callback.py:add_context;charts.py:update_cost_chart 2000",
+        ]
+
+
+def _capture(store: ProfileStore, callback: str = "cb") -> str:
+    profile = cProfile.Profile()
+    profile.enable()
+    sum(range(100))
+    profile.disable()
+    return store.save(profile, callback, 0.01)
+
+
+class TestProfileStore:
+    """The on-disk ring buffer."""
+
+    def test_keeps_newest(self, tmp_path):
+        """Saving beyond *keep* deletes the oldest capture and all its files."""
+        store = ProfileStore(tmp_path / "profiles", keep=2)
+        ids = [_capture(store, f"cb{i}") for i in range(3)]
+        assert [c["id"] for c in store.captures()] == sorted(ids, reverse=True)[:2]
+        oldest = sorted(ids)[0]
+        assert not list((tmp_path / "profiles").glob(oldest + ".*"))
+        assert len(list((tmp_path / "profiles").iterdir())) == 8
+
+    def test_files(self, tmp_path):
+        """Capture files resolve by name; traversal and unknown names do not."""
+        store = ProfileStore(tmp_path, keep=5)
+        capture_id = _capture(store, "update cost/chart")
+        assert "/" not in capture_id
+        assert "cumulative" in store.file(capture_id + ".txt").read_text()
+        assert store.file(capture_id + ".collapsed") is not None
+        assert store.file("../" + capture_id + ".txt") is None
+        assert store.file(capture_id + ".py") is None
+        assert store.file("20990101-000000-000-1-missing.txt") is None
+
+
+@pytest.fixture()
+def app_and_store(tmp_path):
+    app = dash.Dash(__name__)
+    app.layout = html.Div([dcc.Input(id="in"), dcc.Graph(id="graph")])
+
+    @app.callback(Output("graph", "figure"), Input("in", "value"))
+    def draw(value):
+        zeros = np.zeros(11)
+        return build_cost_chart(10, zeros, zeros, zeros, {})
+
+    store = ProfileStore(tmp_path, keep=5)
+    install_profiling(app, "s3cret", store)
+    client = app.server.test_client()
+    client.get("/")
+    return client, store
+
+
+def _dispatch(client, query: str = "", **headers):
+    return client.post("/_dash-update-component" + query, headers=headers, json={
+        "output": "graph.figure",
+        "outputs": {"id": "graph", "property": "figure"},
+        "inputs": [{"id": "in", "property": "value", "value": "x"}],
+        "changedPropIds": ["in.value"],
+        "state": [],
+    })
+
+
+class TestInstallProfiling:
+    """Request hooks and admin routes on a real Flask server."""
+
+    def test_unflagged_not_profiled(self, app_and_store):
+        """Requests without the token, or with a wrong one, are not captured."""
+        client, store = app_and_store
+        assert _dispatch(client).status_code == 200
+        assert _dispatch(client, "?profile=wrong").status_code == 200
+        assert store.captures() == []
+
+    def test_flagged_request_captured(self, app_and_store):
+        """A flagged request is captured with separate figure and serialize phases."""
+        client, store = app_and_store
+        response = _dispatch(client, "?profile=s3cret")
+        assert response.status_code == 200
+        (meta,) = store.captures()
+        assert response.headers["X-Profile-Capture"] == meta["id"]
+        assert meta["callback"] == "draw"
+        assert meta["phases"]["figure"] > 0 and meta["phases"]["serialize"] > 0
+        assert meta["phases"]["figure"] + meta["phases"]["serialize"] <= meta["wall_seconds"]
+        collapsed = store.file(meta["id"] + ".collapsed").read_text()
+        assert "charts.py:build_cost_chart" in collapsed
+
+    def test_referring_page_flag(self, app_and_store):
+        """The flag on the dashboard URL (sent as Referer) also triggers a capture."""
+        client, store = app_and_store
+        _dispatch(client, Referer="http://localhost/?profile=s3cret")
+        assert len(store.captures()) == 1
+
+    def test_admin_routes_need_token(self, app_and_store):
+        """/_profiles and its files are 403 without the token."""
+        client, store = app_and_store
+        _dispatch(client, "?profile=s3cret")
+        capture_id = store.captures()[0]["id"]
+        assert client.get("/_profiles").status_code == 403
+        assert client.get(f"/_profiles/{capture_id}.txt").status_code == 403
+        page = client.get("/_profiles?token=s3cret")
+        assert page.status_code == 200 and capture_id in page.get_data(as_text=True)
+        report = client.get(f"/_profiles/{capture_id}.txt?token=s3cret")
+        assert report.status_code == 200 and b"cumulative" in report.data
+        assert client.get("/_profiles/nope.txt?token=s3cret").status_code == 404
+
+    def test_empty_token_rejected(self):
+        """Installing without a token is an error."""
+        with pytest.raises(ValueError):
+            install_profiling(dash.Dash(__name__), "", ProfileStore("unused", 1))
@@ -0,0 +1,136 @@
+"""
+tests/test_quantity_parser.py
+=============================
+Tests for the unit-aware cell parser in src/data/units.py and the line
+costs normalize_equipment() derives from it.
+
+Verifies that:
+  - Plain numbers, annotated quantities ("~15 tons"), per-unit prices
+    ("$ 2500 per ton") and "indefinite" parse to the right records
+  - Unit spellings and qualifiers are canonicalised
+  - k / M / B suffixes scale currency amounts only ("$1.8M" vs "15 m")
+  - Unparseable text and blank cells give a NaN magnitude
+  - parse_column() returns a float64 array and categorical codes
+  - Per-unit prices are multiplied by matching or unitless quantities and
+    are NaN for mismatched units; costs in non-currency units are NaN
+  - The parsed unit / qualifier columns are stored on normalized frames
+
+Uses synthetic values only — does NOT read data.xlsx.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.normalize import PARSED_COLUMNS, normalize_equipment
+from src.data.processing import compute_scorecard_metrics
+from src.data.units import QuantityRecord, is_rate, parse_column, parse_quantity
+
+
+class TestParseQuantity:
+    """Single-cell parsing."""
+
+    @pytest.mark.parametrize("value,expected", [
+        (12,                  (12.0, "", "")),
+        (np.float64(2.5),     (2.5, "", "")),
+        ("1,200",             (1200.0, "", "")),
+        ("~15 tons",          (15.0, "ton", "approx")),
+        ("approx. 5 kg",      (5.0, "kg", "approx")),
+        ("about 20 years",    (20.0, "year", "approx")),
+        ("<= 3 units",        (3.0, "", "max")),
+        ("at least 4",        (4.0, "", "min")),
+        ("1.5 MW",            (1.5, "MW", "")),
+        ("~$5000",            (5000.0, "", "approx")),
+    ])
+    def test_values(self, value, expected):
+        """Numbers, units and qualifiers are extracted and canonicalised."""
+        assert parse_quantity(value) == QuantityRecord(*expected)
+
+    @pytest.mark.parametrize("value", ["$ 2500 per ton", "$2,500/ton", "2500 USD / tonnes"])
+    def test_rates(self, value):
+        """Prices per unit keep the magnitude and get a "/unit" unit."""
+        record = parse_quantity(value)
+        assert record == QuantityRecord(2500.0, "/ton", "")
+        assert is_rate(record.unit)
+
+    @pytest.mark.parametrize("value,expected", [
+        ("$1.8M",             (1_800_000.0, "", "")),
+        ("250k USD",          (250_000.0, "", "")),
+        ("~$3 bn",            (3e9, "", "approx")),
+        ("$1.8M/ton",         (1_800_000.0, "/ton", "")),
+        ("15 m",              (15.0, "m", "")),
+        ("5 kW",              (5.0, "kW", "")),
+        ("2 MWh",             (2.0, "MWh", "")),
+    ])
+    def test_currency_scales(self, value, expected):
+        """Suffixes scale currency amounts; without a currency marker they are units."""
+        assert parse_quantity(value) == QuantityRecord(*expected)
+
+    @pytest.mark.parametrize("value", ["indefinite", " Indefinite ", "permanent"])
+    def test_indefinite(self, value):
+        """Indefinite markers have no magnitude and their own qualifier."""
+        record = parse_quantity(value)
+        assert math.isnan(record.magnitude) and record.qualifier == "indefinite"
+
+    @pytest.mark.parametrize("value", ["n/a", "abc", "", None, float("nan"), True])
+    def test_unparseable(self, value):
+        """Text without a number, blanks and booleans give an empty record."""
+        record = parse_quantity(value)
+        assert math.isnan(record.magnitude)
+        assert (record.unit, record.qualifier) == ("", "")
+
+
+class TestParseColumn:
+    """Column parsing into compact arrays."""
+
+    def test_arrays(self):
+        """Magnitudes are float64; units and qualifiers are categorical codes."""
+        magnitude, unit, qualifier = parse_column([1, "~15 tons", "$ 2500 per ton", None])
+        assert magnitude.dtype == np.float64
+        np.testing.assert_array_equal(magnitude[:3], [1.0, 15.0, 2500.0])
+        assert isinstance(unit, pd.Categorical) and unit.codes.dtype == np.int8
+        assert list(unit) == ["", "ton", "/ton", ""]
+        assert list(qualifier) == ["", "approx", "", ""]
+
+
+class TestLineCosts:
+    """Per-unit prices become line costs in normalize_equipment()."""
+
+    @pytest.fixture()
+    def df(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            ["Ballast", "~15 tons", "$ 2500 per ton", "indefinite"],
+            ["Sand",    8,          "$ 100 / ton",    10],
+            ["Cable",   "40 m",     "$ 12 per ton",   20],
+            ["Pump",    2,          60_000,           15],
+        ], columns=["name", "quantity", "cost_usd", "lifespan_years"])
+
+    def test_costs(self, df):
+        """Matching and unitless quantities are priced; mismatched units are NaN."""
+        costs = normalize_equipment(df)["cost_usd"].to_numpy()
+        np.testing.assert_array_equal(costs, [37_500.0, 800.0, np.nan, 60_000.0])
+
+    def test_non_currency_costs(self):
+        """A cost in a physical or time unit is not a dollar amount."""
+        df = pd.DataFrame([
+            ["Turbine", 1, "$1.8M",    20],
+            ["Motor",   1, "5 kW",     20],
+            ["Tank",    1, "12 years", 20],
+        ], columns=["name", "quantity", "cost_usd", "lifespan_years"])
+        costs = normalize_equipment(df)["cost_usd"].to_numpy()
+        np.testing.assert_array_equal(costs, [1_800_000.0, np.nan, np.nan])
+
+    def test_parsed_columns_stored(self, df):
+        """Units and qualifiers are kept as categorical columns."""
+        typed = normalize_equipment(df)
+        for col in PARSED_COLUMNS:
+            assert isinstance(typed[col].dtype, pd.CategoricalDtype)
+        assert typed["quantity_qualifier"].iloc[0] == "approx"
+        assert typed["cost_unit"].iloc[1] == "/ton"
+
+    def test_totals_include_rates(self, df):
+        """Scorecard totals count per-ton priced items."""
+        metrics = compute_scorecard_metrics(df, df, df)
+        assert metrics["mechanical"]["cost"] == pytest.approx(37_500 + 800 + 60_000)
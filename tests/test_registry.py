@@ -0,0 +1,227 @@
+"""
+tests/test_registry.py
+======================
+Tests for the versioned data registry in src/data/registry.py.
+
+Verifies that:
+  - publish() validates, bumps the version and exposes a read-only mapping
+  - Invalid data is rejected and the previous snapshot is kept
+  - reload() keeps serving the old snapshot when the loader fails
+  - The watcher thread picks up a changed workbook and publishes it
+  - Listeners are notified after each successful publish; a failing
+    listener neither fails the publish nor marks the reload as failed
+  - load_async() reports "loading" until the background parse finishes,
+    then "ready" (or "error" when the parse fails)
+  - after_fork() replaces inherited locks and restarts an interrupted load
+  - Module-level locks held by a master thread at fork time are free in the
+    child (chart state lock, LRU caches, metrics store)
+
+Uses a temporary file and synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.data.registry import DataRegistry
+
+
+def _data(cost: float) -> dict:
+    """Minimal valid data dict."""
+    columns = ["name", "quantity", "cost_usd", "lifespan_years"]
+    lookup = pd.DataFrame({"x": [0, 1], "y": [0.0, 1.0]})
+    return {
+        "mechanical": pd.DataFrame([["Turbine", 1, cost, 25]], columns=columns),
+        "electrical": pd.DataFrame(columns=columns),
+        "hybrid": pd.DataFrame(columns=columns),
+        "battery_lookup": lookup,
+        "tds_lookup": lookup,
+        "depth_lookup": lookup,
+    }
+
+
+@pytest.fixture()
+def workbook(tmp_path):
+    path = tmp_path / "data.xlsx"
+    path.write_bytes(b"v1")
+    return path
+
+
+class TestPublish:
+    """Atomic, validated, versioned swaps."""
+
+    def test_versions_increase(self, workbook):
+        """Each publish produces a new, higher version."""
+        reg = DataRegistry(workbook)
+        assert reg.current() is None and reg.version == 0
+        first = reg.publish(_data(1.0))
+        second = reg.publish(_data(2.0))
+        assert (first.version, second.version) == (1, 2)
+        assert reg.current() is second
+
+    def test_snapshot_mapping_is_read_only(self, workbook):
+        """The published mapping cannot be reassigned."""
+        snapshot = DataRegistry(workbook).publish(_data(1.0))
+        with pytest.raises(TypeError):
+            snapshot.data["mechanical"] = None
+
+    def test_invalid_data_keeps_previous(self, workbook):
+        """Missing sections raise ValueError and leave the old snapshot current."""
+        reg = DataRegistry(workbook)
+        good = reg.publish(_data(1.0))
+        bad = _data(2.0)
+        del bad["tds_lookup"]
+        with pytest.raises(ValueError):
+            reg.publish(bad)
+        assert reg.current() is good
+
+    def test_listeners_notified(self, workbook):
+        """Listeners receive every published snapshot."""
+        reg = DataRegistry(workbook)
+        seen = []
+        reg.add_listener(lambda snap: seen.append(snap.version))
+        reg.publish(_data(1.0))
+        reg.publish(_data(2.0))
+        assert seen == [1, 2]
+
+    def test_failing_listener_isolated(self, workbook):
+        """A raising listener is logged; the reload still counts as published."""
+        reg = DataRegistry(workbook, loader=lambda: _data(2.0))
+        seen = []
+
+        def broken(snapshot):
+            raise RuntimeError("prewarm failed")
+
+        reg.add_listener(broken)
+        reg.add_listener(lambda snap: seen.append(snap.version))
+        assert reg.reload() is True
+        assert reg.version == 1 and seen == [1]
+        assert reg.last_error is None
+        assert reg._failed_stamp is None
+
+
+class TestReload:
+    """Background re-parse of the workbook."""
+
+    def test_failed_reload_keeps_snapshot(self, workbook):
+        """A loader exception is recorded and the old data keeps serving."""
+        def broken():
+            raise ValueError("Section 'Mechanical' not found")
+
+        reg = DataRegistry(workbook, loader=broken)
+        good = reg.publish(_data(1.0))
+        assert reg.reload() is False
+        assert reg.current() is good
+        assert "Mechanical" in reg.last_error[0]
+
+    def test_watcher_picks_up_changes(self, workbook):
+        """Touching the workbook triggers a reload in the watcher thread."""
+        costs = iter([2.0, 3.0])
+        reg = DataRegistry(workbook, loader=lambda: _data(next(costs)))
+        reg.publish(_data(1.0), reg.stamp())
+        reg.start_watching(0.01)
+        try:
+            workbook.write_bytes(b"version two")
+            os.utime(workbook, ns=(time.time_ns(), time.time_ns() + 10**9))
+            deadline = time.monotonic() + 5
+            while reg.version < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            reg.stop_watching()
+        assert reg.version == 2
+        assert reg.current().data["mechanical"]["cost_usd"].iloc[0] == 2.0
+
+
+class TestLoadAsync:
+    """Background startup load."""
+
+    def test_status_transitions_to_ready(self, workbook):
+        """status() is "loading" while the loader runs, then "ready"."""
+        release = threading.Event()
+
+        def slow_loader():
+            release.wait(5)
+            return _data(1.0)
+
+        reg = DataRegistry(workbook, loader=slow_loader)
+        assert reg.status() == "empty"
+        thread = reg.load_async()
+        assert reg.status() == "loading"
+        assert reg.current() is None
+        release.set()
+        thread.join(5)
+        assert reg.status() == "ready"
+        assert reg.version == 1
+
+    def test_status_error_on_failure(self, workbook):
+        """A failed background parse ends in "error" with the message recorded."""
+        def broken():
+            raise FileNotFoundError("data.xlsx not found")
+
+        reg = DataRegistry(workbook, loader=broken)
+        reg.load_async().join(5)
+        assert reg.status() == "error"
+        assert reg.last_error[0] == "data.xlsx not found"
+
+
+class TestAfterFork:
+    """Re-arming a registry inherited from a preloaded gunicorn master."""
+
+    def test_stale_locks_are_replaced(self, workbook):
+        """A reload lock left held (by a thread lost in fork) does not block reload()."""
+        reg = DataRegistry(workbook, loader=lambda: _data(2.0))
+        inherited = reg.publish(_data(1.0))
+        reg._reload_lock.acquire()
+        reg.after_fork(0)
+        assert reg.current() is inherited
+        assert reg.reload() is True
+        assert reg.version == 2
+
+    def test_interrupted_load_restarts(self, workbook):
+        """A worker forked mid load_async() parses the workbook itself."""
+        reg = DataRegistry(workbook, loader=lambda: _data(1.0))
+        reg._loading.set()  # the master's loader thread does not exist here
+        reg.after_fork(0)
+        deadline = time.monotonic() + 5
+        while reg.status() != "ready" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert reg.status() == "ready"
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork()")
+    def test_module_locks_rearmed_in_child(self):
+        """Locks held by a thread at fork time can be taken in the child."""
+        import src.layout.charts as charts
+        from src.data.cache import LRUCache
+        from src.metrics import metrics
+
+        cache = LRUCache(4)
+        locks = [charts._derived_lock, cache._lock, metrics._lock]
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            for lock in locks:
+                lock.acquire()
+            held.set()
+            release.wait()
+            for lock in locks:
+                lock.release()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait()
+        try:
+            pid = os.fork()
+            if pid == 0:  # child: the holding thread does not exist here
+                ok = all(
+                    lock.acquire(timeout=2)
+                    for lock in (charts._derived_lock, cache._lock, metrics._lock)
+                )
+                os._exit(0 if ok else 1)
+            _, status = os.waitpid(pid, 0)
+        finally:
+            release.set()
+            thread.join()
+        assert os.waitstatus_to_exitcode(status) == 0
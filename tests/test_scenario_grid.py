@@ -0,0 +1,155 @@
+"""
+tests/test_scenario_grid.py
+===========================
+Tests for the memory-mapped scenario grid in src/data/grid.py.
+
+Verifies that:
+  - Grid lookups equal compute_cost_chart_data() / compute_energy_chart_data()
+    at on-grid slider positions
+  - Off-grid positions (e.g. the 950 ppm TDS default) return None
+  - write_grid() / open_grid() round-trip through a read-only memory map
+  - A grid built from different data, a truncated file or a missing file is
+    rejected by open_grid()
+  - load_grid() writes the file on a miss and maps it on later calls
+  - The chart callbacks answer on-grid positions from the grid without
+    touching the live-computation caches
+
+Uses synthetic DataFrames and a temporary directory — does NOT read data.xlsx.
+"""
+
+import mmap
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.grid import build_grid, grid_digest, load_grid, open_grid, write_grid
+from src.data.processing import CostModel, compute_cost_chart_data, compute_energy_chart_data
+from src.data.registry import registry
+from src.layout import charts
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    """True when *array* is backed by an mmap rather than heap memory."""
+    while isinstance(array, np.ndarray):
+        array = array.base
+    return isinstance(array, mmap.mmap)
+
+
+def _data(turbine_cost: float = 1_000_000) -> dict:
+    """Minimal data dict with a battery row and two-point energy lookups."""
+    columns = ["name", "quantity", "cost_usd", "lifespan_years"]
+    fractions = [i * 0.1 for i in range(11)]
+    return {
+        "mechanical": pd.DataFrame([["Turbine", 1, turbine_cost, 25],
+                                    ["Pump", 2, 40_000, 10]], columns=columns),
+        "electrical": pd.DataFrame([["Turbine", 1, 2_000_000, 25],
+                                    ["Battery (Tesla Megapack 3.9MWh unit)", 1, "slider", 15]],
+                                   columns=columns),
+        "hybrid": pd.DataFrame([["Membrane", 4, 12_500, 7]], columns=columns),
+        "battery_lookup": pd.DataFrame({
+            "battery_fraction": fractions,
+            "total_cost": [f * 100_000 + 5 * f ** 2 for f in fractions],
+        }),
+        "tds_lookup": pd.DataFrame({"tds_ppm": [0, 500, 2000], "ro_energy_kw": [0.0, 40.0, 95.0]}),
+        "depth_lookup": pd.DataFrame({"depth_m": [0, 600, 1200], "pump_energy_kw": [0.0, 55.0, 130.0]}),
+    }
+
+
+@pytest.fixture(scope="module")
+def data():
+    return _data()
+
+
+@pytest.fixture(scope="module")
+def grid(data):
+    return build_grid(data, CostModel(data))
+
+
+class TestLookups:
+    """Grid lookups reproduce the live computation."""
+
+    @pytest.mark.parametrize("years,fraction", [(1, 0.0), (17, 0.123), (50, 0.5), (50, 1.0)])
+    def test_cost_matches_live(self, data, grid, years, fraction):
+        """Cost curves and electrical total equal compute_cost_chart_data()."""
+        live = compute_cost_chart_data(data, fraction, years)
+        hit = grid.cost_chart_data(years, fraction)
+        for sys_key, curve in live["cost_over_time"].items():
+            np.testing.assert_array_equal(hit["cost_over_time"][sys_key], curve)
+        assert hit["electrical_total_cost"] == live["electrical_total_cost"]
+
+    @pytest.mark.parametrize("tds,depth", [(0, 0), (300, 17), (2000, 1200), (10_000, 1900)])
+    def test_energy_matches_live(self, data, grid, tds, depth):
+        """Energy breakdowns equal compute_energy_chart_data(), beyond-table values included."""
+        assert grid.energy_chart_data(tds, depth) == compute_energy_chart_data(data, tds, depth)
+
+    @pytest.mark.parametrize("tds,depth", [(950, 950), (300, 17.5), (10_100, 0), (0, 1901)])
+    def test_energy_off_grid(self, grid, tds, depth):
+        """Positions between or beyond grid points are left to live computation."""
+        assert grid.energy_chart_data(tds, depth) is None
+
+    @pytest.mark.parametrize("years,fraction", [(51, 0.5), (10, 0.0005), (10, 1.001)])
+    def test_cost_off_grid(self, grid, years, fraction):
+        """Horizons past the grid and fractions between battery steps return None."""
+        assert grid.cost_chart_data(years, fraction) is None
+
+
+class TestFile:
+    """Grid file round trip and validation."""
+
+    def test_round_trip_is_read_only_map(self, grid, tmp_path):
+        """open_grid() maps the arrays written by write_grid() read-only."""
+        path = tmp_path / "data.xlsx.grid"
+        assert write_grid(path, grid)
+        mapped = open_grid(path, grid.digest)
+        for name, array in grid.arrays().items():
+            loaded = mapped.arrays()[name]
+            assert _is_mapped(loaded)
+            assert not loaded.flags.writeable
+            np.testing.assert_array_equal(loaded, array)
+
+    def test_stale_or_broken_file_rejected(self, grid, tmp_path):
+        """Digest mismatches, truncation and absence are all misses."""
+        path = tmp_path / "data.xlsx.grid"
+        assert open_grid(path, grid.digest) is None
+        write_grid(path, grid)
+        other = _data(turbine_cost=1_500_000)
+        assert open_grid(path, grid_digest(other, CostModel(other))) is None
+        path.write_bytes(path.read_bytes()[:-8])
+        assert open_grid(path, grid.digest) is None
+
+    def test_load_grid_builds_once(self, data, tmp_path):
+        """The first load_grid() writes the file; the next one maps it unchanged."""
+        path = tmp_path / "data.xlsx.grid"
+        model = CostModel(data)
+        first = load_grid(path, data, model)
+        stamp = path.stat().st_mtime_ns
+        second = load_grid(path, data, model)
+        assert path.stat().st_mtime_ns == stamp
+        assert _is_mapped(second.energy)
+        assert second.digest == first.digest
+
+
+class TestChartCallbacks:
+    """charts._cached_*_data() read on-grid positions from the grid."""
+
+    def test_on_grid_bypasses_caches(self, tmp_path, monkeypatch):
+        """Grid hits leave the LRU counters untouched; off-grid values still compute."""
+        monkeypatch.setattr(charts, "SCENARIO_GRID", True)
+        monkeypatch.setattr(charts, "CLIENTSIDE_SLIDERS", False)
+        monkeypatch.setattr(charts, "GRID_FILE", tmp_path / "data.xlsx.grid")
+        data = _data()
+        registry.publish(data)
+        before = charts.chart_cache_stats()
+
+        hit = charts._cached_energy_data(3000, 400)
+        cost = charts._cached_cost_data(20, 0.25)
+        assert charts.chart_cache_stats() == before
+        assert hit == compute_energy_chart_data(data, 3000, 400)
+        np.testing.assert_array_equal(
+            cost["cost_over_time"]["electrical"],
+            compute_cost_chart_data(data, 0.25, 20)["cost_over_time"]["electrical"],
+        )
+
+        charts._cached_energy_data(950, 400)
+        assert charts.chart_cache_stats()["energy"]["misses"] == before["energy"]["misses"] + 1
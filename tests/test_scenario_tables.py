@@ -0,0 +1,166 @@
+"""
+tests/test_scenario_tables.py
+=============================
+Tests for the clientside slider mode: build_scenario_tables() in
+src/data/processing.py and its consumer assets/scenario_sliders.js.
+
+Verifies that:
+  - The tables are JSON-serializable and reproduce compute_chart_data() in Python
+  - The run-length encoded electrical total labels match fmt_cost()
+  - scenario_tables() builds the tables of the current data once per data
+    version and builds any other data dict from scratch
+  - The JavaScript chart rebuilds match compute_chart_data() and the server
+    labels for random slider values (requires node; skipped otherwise)
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import plotly
+import pytest
+
+import src.layout.charts as charts
+from src.config import BATTERY_SLIDER_STEP, SUBSYSTEM_POWER
+from src.data.cache import LRUCache
+from src.data.processing import (
+    battery_ratio_label,
+    build_scenario_tables,
+    compute_chart_data,
+    fmt_cost,
+    interpolate_energy,
+)
+from src.data.registry import registry
+from src.layout.charts import _cost_skeleton, _power_skeleton
+from tests.sample_data import cycle_data
+
+ASSET = Path(__file__).resolve().parent.parent / "assets" / "scenario_sliders.js"
+
+
+@pytest.fixture()
+def data() -> dict:
+    """Data dict with replacement cycles and a battery row."""
+    return cycle_data((40_000, 2_500_000))
+
+
+def _label_at(entries, step):
+    """Decode the run-length encoded label list at *step*."""
+    return [text for start, text in entries if start <= step][-1]
+
+
+class TestBuildScenarioTables:
+    """Python-side checks of the table contents."""
+
+    def test_json_serializable(self, data):
+        """Tables survive a JSON round trip unchanged."""
+        tables = build_scenario_tables(data)
+        assert json.loads(json.dumps(tables)) == tables
+
+    def test_reproduces_cost_over_time(self, data):
+        """cumulative + battery cost * battery_counts equals compute_chart_data()."""
+        tables = build_scenario_tables(data)
+        for fraction in (0.0, 0.37, 1.0):
+            ref = compute_chart_data(data, fraction, 50)["cost_over_time"]
+            battery = np.interp(fraction, tables["battery_lookup"]["x"], tables["battery_lookup"]["y"])
+            electrical = np.array(tables["cumulative"]["electrical"]) + battery * np.array(tables["battery_counts"])
+            np.testing.assert_allclose(electrical, ref["electrical"])
+            np.testing.assert_allclose(tables["cumulative"]["mechanical"], ref["mechanical"])
+
+    def test_cost_labels_match_fmt_cost(self, data):
+        """Every battery step decodes to the server-side label."""
+        tables = build_scenario_tables(data)
+        for step in range(0, 1001, 7):
+            total = compute_chart_data(data, step / 1000, 1)["electrical_total_cost"]
+            assert _label_at(tables["elec_cost_labels"], step) == fmt_cost(total)
+
+
+class TestScenarioTablesPerVersion:
+    """Reuse of the tables between page loads."""
+
+    def test_built_once_per_version(self, data, monkeypatch):
+        """Page loads of one version share the tables; a new version rebuilds them."""
+        monkeypatch.setattr(charts, "_tables_cache", LRUCache(2))
+        registry.publish(data)
+        first = charts.scenario_tables(registry.current().data)
+        assert charts.scenario_tables(registry.current().data) is first
+        assert first == build_scenario_tables(data, BATTERY_SLIDER_STEP)
+        registry.publish(dict(data))
+        assert charts.scenario_tables(registry.current().data) is not first
+
+    def test_other_data_not_cached(self, data, monkeypatch):
+        """A dict that is not the current registry data is built from scratch."""
+        monkeypatch.setattr(charts, "_tables_cache", LRUCache(2))
+        registry.publish(data)
+        other = dict(data)
+        assert charts.scenario_tables(other) == build_scenario_tables(other, BATTERY_SLIDER_STEP)
+        assert charts.scenario_tables(other) is not charts.scenario_tables(other)
+        assert len(charts._tables_cache) == 0
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+class TestScenarioSlidersJs:
+    """assets/scenario_sliders.js reproduces the server callbacks."""
+
+    def _run(self, tables, cases):
+        """Evaluate costChart/powerChart in node for each case."""
+        encode = lambda obj: json.dumps(obj, cls=plotly.utils.PlotlyJSONEncoder)  # noqa: E731
+        script = f"""
+            var window = {{dash_clientside: {{}}}};
+            {ASSET.read_text()}
+            var ns = window.dash_clientside.scenario;
+            var tables = {encode(tables)};
+            var costFig = {encode(_cost_skeleton())}, powerFig = {encode(_power_skeleton())};
+            var out = {encode(cases)}.map(function(c) {{
+                return {{
+                    cost: ns.costChart(c.years, c.fraction, tables, costFig),
+                    power: ns.powerChart(c.tds, c.depth, tables, powerFig),
+                }};
+            }});
+            console.log(JSON.stringify(out));
+        """
+        result = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+        return json.loads(result.stdout)
+
+    def test_matches_compute_chart_data(self, data):
+        """Figures and labels agree with the Python path for random sliders."""
+        rng = np.random.default_rng(3)
+        cases = [
+            {
+                "years": int(rng.integers(1, 51)),
+                "fraction": int(rng.integers(0, 1001)) / 1000,
+                "tds": float(rng.choice([950, *range(0, 10001, 100)])),
+                "depth": float(rng.integers(0, 1901)),
+            }
+            for _ in range(25)
+        ]
+        tables = build_scenario_tables(data)
+        for case, out in zip(cases, self._run(tables, cases)):
+            ref = compute_chart_data(data, case["fraction"], case["years"], case["tds"], case["depth"])
+            cost_fig, label_years, label_ratio, label_cost = out["cost"]
+            for trace, key in zip(cost_fig["data"], ("mechanical", "electrical", "hybrid")):
+                assert trace["x"] == list(range(case["years"] + 1))
+                np.testing.assert_allclose(trace["y"], ref["cost_over_time"][key])
+            assert cost_fig["layout"]["uirevision"] == f"cost-{case['years']}"
+            assert label_years == f"{case['years']} year{'s' if case['years'] != 1 else ''}"
+            assert label_ratio == battery_ratio_label(case["fraction"])
+            assert label_cost == f"Electrical total: {fmt_cost(ref['electrical_total_cost'])}"
+
+            power_fig, label_tds, label_depth = out["power"]
+            for trace in power_fig["data"]:
+                expected = ref["energy_breakdown"]["mechanical"][trace["name"]]
+                np.testing.assert_allclose(trace["y"], [expected] * 3)
+                assert trace["meta"]["values"] == trace["y"]
+            assert label_tds == f"{int(round(case['tds']))} PPM"
+            assert label_depth == f"{int(round(case['depth']))} m"
+
+    def test_tds_extrapolates_above_table(self, data):
+        """TDS beyond the lookup table uses the last slope, as interpolate_energy()."""
+        tables = build_scenario_tables(data)
+        out = self._run(tables, [{"years": 5, "fraction": 0.5, "tds": 9000.0, "depth": 0.0}])
+        ro_trace = next(t for t in out[0]["power"][0]["data"] if t["name"] == "RO Desalination")
+        expected = interpolate_energy(9000.0, data["tds_lookup"], "tds_ppm", "ro_energy_kw")
+        assert ro_trace["y"][0] == pytest.approx(SUBSYSTEM_POWER["RO Desalination"] + expected)
@@ -0,0 +1,191 @@
+"""
+tests/test_shared_cache.py
+==========================
+Tests for the cross-worker figure cache in src/data/shared_cache.py and its
+use by the chart callbacks in src/layout/charts.py.
+
+Verifies that:
+  - The disk and SQLite backends round-trip values, and a second backend
+    opened on the same location (another worker) sees them
+  - Disk writes are atomic: no temporary files are left behind
+  - Both backends evict the oldest-written entries once over their bound
+  - Backend errors are counted and served as misses, never raised
+  - open_shared_cache() rejects unknown schemes
+  - A backend missing part of the CacheBackend interface cannot be created
+  - A chart callback served from another worker's entry returns the same
+    outputs without computing, and new data is never served old figures
+
+Uses a temporary directory and synthetic data only — does NOT read data.xlsx.
+"""
+
+import os
+from unittest import mock
+
+import pytest
+from dash._utils import to_json
+
+import src.layout.charts as charts
+from src.data.registry import registry
+from src.data.shared_cache import (
+    BACKENDS,
+    CacheBackend,
+    DiskBackend,
+    SharedCache,
+    SQLiteBackend,
+    open_shared_cache,
+)
+from tests.sample_data import minimal_data
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def location(request, tmp_path):
+    """(scheme, location) of a fresh store for each backend."""
+    return request.param, str(tmp_path / ("figures" if request.param == "disk" else "figures.db"))
+
+
+def _backend(location, max_bytes=1 << 20):
+    scheme, path = location
+    return BACKENDS[scheme](path, max_bytes)
+
+
+class TestBackends:
+    """Storage, sharing and eviction."""
+
+    def test_round_trip_shared(self, location):
+        """A value written by one backend instance is read by another."""
+        writer, reader = _backend(location), _backend(location)
+        assert reader.get("a" * 64) is None
+        writer.put("a" * 64, b'{"x": 1}')
+        assert reader.get("a" * 64) == b'{"x": 1}'
+        writer.put("a" * 64, b"[2]")
+        assert reader.get("a" * 64) == b"[2]"
+        reader.clear()
+        assert writer.get("a" * 64) is None
+
+    def test_atomic_disk_write(self, tmp_path):
+        """Entries appear by rename; no temporary files remain."""
+        backend = DiskBackend(tmp_path / "figures", 1 << 20)
+        backend.put("b" * 64, b"payload")
+        assert [p.name for p in (tmp_path / "figures").iterdir()] == ["b" * 64 + ".json"]
+
+    def test_disk_eviction(self, tmp_path):
+        """Over the bound, the oldest files go first down to the low-water mark."""
+        backend = DiskBackend(tmp_path / "figures", 1 << 20)
+        for i in range(5):
+            backend.put(f"{i:064d}", b"x" * 300)
+            os.utime(backend._path(f"{i:064d}"), ns=(i * 10**9, i * 10**9))
+        backend.max_bytes = 1000
+        assert backend._evict() == 2
+        assert [backend.get(f"{i:064d}") is not None for i in range(5)] == [False, False, True, True, True]
+
+    def test_sqlite_eviction(self, tmp_path):
+        """Each write keeps the stored total within the bound."""
+        backend = SQLiteBackend(tmp_path / "figures.db", 1000)
+        evicted = sum(backend.put(f"{i:064d}", b"x" * 300) for i in range(5))
+        assert evicted == 2
+        assert [backend.get(f"{i:064d}") is not None for i in range(5)] == [False, False, True, True, True]
+
+
+class _Broken(CacheBackend):
+    name = "broken"
+
+    def get(self, key):
+        raise OSError("disk gone")
+
+    def put(self, key, value):
+        raise OSError("disk gone")
+
+    def clear(self):
+        raise OSError("disk gone")
+
+
+class TestSharedCache:
+    """Front end: keys, counters, error handling and specs."""
+
+    def test_counters(self, location):
+        """Hits, misses and writes are counted per process."""
+        cache = SharedCache(_backend(location))
+        assert cache.get(("v", 1)) is None
+        assert cache.put(("v", 1), b"1")
+        assert cache.get(("v", 1)) == b"1"
+        assert cache.get(["v", 1]) == b"1"  # same JSON key
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["writes"], stats["errors"]) == (2, 1, 1, 0)
+
+    def test_errors_are_misses(self):
+        """A failing backend never raises into the caller."""
+        cache = SharedCache(_Broken())
+        assert cache.get("k") is None
+        assert cache.put("k", b"1") is False
+        assert cache.stats()["errors"] == 2
+
+    def test_incomplete_backend(self):
+        """A backend without clear() fails when instantiated, not on first use."""
+
+        class _NoClear(CacheBackend):
+            def get(self, key):
+                return None
+
+            def put(self, key, value):
+                return 0
+
+        with pytest.raises(TypeError, match="clear"):
+            _NoClear()
+
+    def test_open_spec(self, tmp_path):
+        """Specs select the backend by scheme; unknown ones are rejected."""
+        assert isinstance(open_shared_cache(f"sqlite:{tmp_path}/f.db", 1).backend, SQLiteBackend)
+        assert isinstance(open_shared_cache(f"disk:{tmp_path}", 1).backend, DiskBackend)
+        for spec in ("redis://localhost", "disk:", str(tmp_path)):
+            with pytest.raises(ValueError):
+                open_shared_cache(spec, 1)
+
+
+# Stand-in for the figure already held by store-*-figure.
+_FIGURE = {"data": [], "layout": {}}
+
+
+class TestChartCallbacks:
+    """update_cost_chart / update_power_chart through the shared cache."""
+
+    @pytest.fixture(autouse=True)
+    def _shared(self, monkeypatch, tmp_path):
+        """A disk cache in tmp_path; every call is a slider move (Patch output)."""
+        monkeypatch.setattr(charts, "SCENARIO_GRID", False)
+        monkeypatch.setattr(charts, "_shared_cache", open_shared_cache(f"disk:{tmp_path}", 1 << 20))
+        monkeypatch.setattr(charts, "ctx", mock.Mock(triggered_id="slider-battery"))
+
+    def _other_worker(self, monkeypatch):
+        """Drop this process's caches and forbid computing, as in a cold worker."""
+        charts._cost_cache.clear()
+        charts._energy_cache.clear()
+        for name in ("compute_cost_chart_data", "compute_energy_chart_data"):
+            monkeypatch.setattr(charts, name, mock.Mock(side_effect=AssertionError(name)))
+
+    def test_hit_in_other_worker(self, monkeypatch):
+        """Stored outputs serialize exactly like freshly computed ones."""
+        registry.publish(minimal_data(1_000_000))
+        cost = to_json(charts.update_cost_chart(20, 0.3, _FIGURE))
+        power = to_json(charts.update_power_chart(950, 433, _FIGURE))
+        self._other_worker(monkeypatch)
+        assert to_json(charts.update_cost_chart(20, 0.30000000004, _FIGURE)) == cost
+        assert to_json(charts.update_power_chart(950, 433, _FIGURE)) == power
+        assert charts.chart_cache_stats()["shared"]["hits"] == 2
+
+    def test_labels_follow_raw_inputs(self, monkeypatch):
+        """Only data-dependent outputs are stored; input labels are rebuilt."""
+        registry.publish(minimal_data(1_000_000))
+        charts.update_cost_chart(20, 0.3, _FIGURE)
+        self._other_worker(monkeypatch)
+        _, label_years, label_ratio, label_cost = charts.update_cost_chart(20, 0.3, _FIGURE)
+        assert (label_years, label_ratio) == ("20 years", "30% Battery / 70% Tank")
+        assert label_cost.startswith("Electrical total: ")
+
+    def test_new_data_misses(self):
+        """Figures of replaced data are never served."""
+        registry.publish(minimal_data(1_000_000))
+        old = charts.update_cost_chart(10, 0.5, _FIGURE)[0]
+        registry.publish(minimal_data(3_000_000))
+        new = charts.update_cost_chart(10, 0.5, _FIGURE)[0]
+        assert to_json(old) != to_json(new)
+        assert charts.chart_cache_stats()["shared"]["hits"] == 0
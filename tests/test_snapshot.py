@@ -0,0 +1,100 @@
+"""
+tests/test_snapshot.py
+======================
+Tests for the versioned binary snapshot cache in src/data/snapshot.py.
+
+Verifies that:
+  - A written snapshot round-trips the data dict (DataFrames and plain dicts)
+  - A stale key (size / mtime / hash / format change) is a cache miss
+  - Missing and corrupt snapshot files are cache misses, never errors
+  - workbook_key() changes when the workbook contents change
+
+Uses a temporary directory and synthetic data only — does NOT read data.xlsx.
+"""
+
+import pandas as pd
+import pytest
+
+from src.data.snapshot import (
+    SNAPSHOT_FORMAT_VERSION,
+    read_snapshot,
+    workbook_key,
+    write_snapshot,
+)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+
+@pytest.fixture()
+def workbook(tmp_path):
+    """A stand-in workbook file — the snapshot only hashes its bytes."""
+    path = tmp_path / "data.xlsx"
+    path.write_bytes(b"fake workbook contents")
+    return path
+
+
+@pytest.fixture()
+def data() -> dict:
+    """Minimal data dict shaped like load_data() output."""
+    return {
+        "mechanical": pd.DataFrame(
+            [{"name": "Gate valve", "quantity": 2, "cost_usd": 8000, "lifespan_years": 15}],
+            columns=["name", "quantity", "cost_usd", "lifespan_years"],
+        ),
+        "tds_lookup": pd.DataFrame({"tds_ppm": [0, 100], "ro_energy_kw": [1.0, 2.0]}),
+        "energy": None,
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Round trip and invalidation
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestSnapshotRoundTrip:
+    """Snapshots are reused only when the key matches exactly."""
+
+    def test_round_trip(self, tmp_path, workbook, data):
+        """A freshly written snapshot reproduces the original dict."""
+        snap = tmp_path / "data.xlsx.snapshot"
+        key = workbook_key(workbook)
+        assert write_snapshot(snap, key, data)
+
+        loaded = read_snapshot(snap, key)
+        assert loaded is not None
+        pd.testing.assert_frame_equal(loaded["mechanical"], data["mechanical"])
+        pd.testing.assert_frame_equal(loaded["tds_lookup"], data["tds_lookup"])
+        assert loaded["energy"] is None
+
+    def test_key_fields(self, workbook):
+        """Key carries the format version, size, mtime and content hash."""
+        key = workbook_key(workbook)
+        assert key["format"] == SNAPSHOT_FORMAT_VERSION
+        assert key["size"] == len(b"fake workbook contents")
+        assert set(key) == {"format", "size", "mtime_ns", "sha256"}
+
+    def test_changed_workbook_is_miss(self, tmp_path, workbook, data):
+        """Rewriting the workbook invalidates the snapshot."""
+        snap = tmp_path / "data.xlsx.snapshot"
+        write_snapshot(snap, workbook_key(workbook), data)
+
+        workbook.write_bytes(b"edited workbook contents!")
+        assert read_snapshot(snap, workbook_key(workbook)) is None
+
+    def test_format_version_mismatch_is_miss(self, tmp_path, workbook, data):
+        """A snapshot from an older format version is ignored."""
+        snap = tmp_path / "data.xlsx.snapshot"
+        key = workbook_key(workbook)
+        write_snapshot(snap, {**key, "format": SNAPSHOT_FORMAT_VERSION - 1}, data)
+        assert read_snapshot(snap, key) is None
+
+    def test_missing_file_is_miss(self, tmp_path, workbook):
+        """No snapshot on disk returns None."""
+        assert read_snapshot(tmp_path / "absent.snapshot", workbook_key(workbook)) is None
+
+    def test_corrupt_file_is_miss(self, tmp_path, workbook):
+        """Garbage or truncated snapshot files return None instead of raising."""
+        snap = tmp_path / "data.xlsx.snapshot"
+        snap.write_bytes(b"DESALSNAP\x80\x05 truncated")
+        assert read_snapshot(snap, workbook_key(workbook)) is None
@@ -0,0 +1,118 @@
+"""
+tests/test_stage_index.py
+=========================
+Tests for the process-stage index in src/data/stages.py.
+
+Verifies that:
+  - get_equipment_stage() agrees with a linear scan of PROCESS_STAGES for
+    every configured name, and unknown names map to "Other"
+  - build_stage_index() groups rows by (stage, system) with their typed
+    cost / lifespan columns and records each name's first row
+  - stage_index() builds once per data dict
+  - The cross-system comparison reads same-stage rows from the index,
+    including the "Other" stage
+
+Uses synthetic DataFrames only — does NOT read data.xlsx.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from plotly.io.json import to_json_plotly
+
+from src.config import PROCESS_STAGES
+from src.data.processing import fmt_cost, get_equipment_stage
+from src.data.stages import OTHER_STAGE, build_stage_index, stage_index
+from src.layout.equipment_grid import make_equipment_body
+
+_COLUMNS = ["name", "quantity", "cost_usd", "lifespan_years"]
+_MECH_PUMP = PROCESS_STAGES["mechanical"]["Water Extraction"][0]
+_ELEC_PUMP = PROCESS_STAGES["electrical"]["Water Extraction"][0]
+_MECH_TURBINE = PROCESS_STAGES["mechanical"]["Power & Drive"][0]
+
+
+def _linear_stage(name: str, system: str) -> str:
+    for stage, items in PROCESS_STAGES.get(system, {}).items():
+        if name in items:
+            return stage
+    return "Other"
+
+
+@pytest.fixture()
+def data() -> dict:
+    return {
+        "mechanical": pd.DataFrame([
+            [_MECH_TURBINE, 1, 500_000, 25],
+            [_MECH_PUMP, 2, 40_000, 15],
+            ["Mystery widget", 1, 900, "indefinite"],
+            [_MECH_PUMP, 1, 41_000, 12],
+        ], columns=_COLUMNS),
+        "electrical": pd.DataFrame([
+            [_ELEC_PUMP, 1, 35_000, 20],
+            ["Another widget", 3, "$ 100 per unit", 5],
+        ], columns=_COLUMNS),
+        "hybrid": pd.DataFrame(columns=_COLUMNS),
+    }
+
+
+class TestStageLookup:
+    """Name → stage per system."""
+
+    def test_matches_linear_scan(self):
+        """Every configured name resolves as the former linear scan did."""
+        for system, stages in PROCESS_STAGES.items():
+            for items in stages.values():
+                for name in items:
+                    assert get_equipment_stage(name, system) == _linear_stage(name, system)
+
+    def test_unknown(self):
+        """Unlisted names and systems map to "Other"."""
+        assert get_equipment_stage("Mystery widget", "mechanical") == OTHER_STAGE == "Other"
+        assert get_equipment_stage(_MECH_PUMP, "no-such-system") == "Other"
+
+
+class TestStageIndex:
+    """Rows grouped by stage for one data version."""
+
+    def test_groups_and_columns(self, data):
+        """Each (stage, system) holds its rows' names and typed columns in order."""
+        index = build_stage_index(data)
+        pumps = index.stage_items("Water Extraction", "mechanical")
+        assert pumps.names == (_MECH_PUMP, _MECH_PUMP)
+        np.testing.assert_array_equal(pumps.cost, [40_000.0, 41_000.0])
+        np.testing.assert_array_equal(pumps.years, [15, 12])
+        assert pumps.lifespan == (15, 12)
+        other = index.stage_items(OTHER_STAGE, "electrical")
+        assert other.names == ("Another widget",)
+        assert other.cost[0] == 300.0
+        assert index.stage_items(OTHER_STAGE, "mechanical").lifespan == ("indefinite",)
+        assert index.stage_items("Desalination", "mechanical").names == ()
+        assert "hybrid" not in index.offsets
+
+    def test_first_row_offsets(self, data):
+        """A repeated name points at its first row within the stage."""
+        index = build_stage_index(data)
+        assert index.offset("mechanical", _MECH_PUMP) == 0
+        assert index.offset("mechanical", _MECH_TURBINE) == 0
+        assert index.offset("mechanical", "Not there") is None
+
+    def test_memoized_per_data(self, data):
+        """stage_index() returns the same index for the same dict only."""
+        index = stage_index(data)
+        assert stage_index(data) is index
+        assert stage_index(dict(data)) is not index
+
+
+class TestComparison:
+    """The cross-system comparison reads from the index."""
+
+    def test_same_stage_rows(self, data):
+        """A repeated name compares its first row with the electrical pump."""
+        body = to_json_plotly(make_equipment_body(data["mechanical"].iloc[3], "mechanical", data))
+        assert body.count('"Mechanical"') == 1 and body.count('"Electrical"') == 1
+        assert fmt_cost(40_000) in body and fmt_cost(35_000) in body
+
+    def test_other_stage(self, data):
+        """Unlisted names are compared with the other systems' unlisted names."""
+        body = to_json_plotly(make_equipment_body(data["mechanical"].iloc[2], "mechanical", data))
+        assert "Another widget" in body and "(Other)" in body